@@ -1,5 +1,6 @@
 """pyear package."""
 
 from .pipeline import extract_features
+from .utils.blink_table import BlinkTable
 
-__all__ = ["extract_features"]
+__all__ = ["extract_features", "BlinkTable"]
@@ -2,12 +2,14 @@
 
 from .blink_dataframe import (
     extract_blink_events_dataframe,
+    extract_continuous_blink_events,
     generate_blink_dataframe,
 )
 from .event_features import aggregate_blink_event_features
 
 __all__ = [
     "extract_blink_events_dataframe",
+    "extract_continuous_blink_events",
     "generate_blink_dataframe",
     "aggregate_blink_event_features",
 ]
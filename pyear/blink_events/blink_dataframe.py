@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import logging
-from typing import Iterable, List, Optional, Sequence, Tuple, Dict
+from typing import List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
 import mne
 from tqdm import tqdm
 
+from ..pyblinkers.zero_crossing import left_right_zero_crossings, negative_sample_index
+from ..utils.ragged import ragged_indices, segment_argmax
+
 logger = logging.getLogger(__name__)
 
 
@@ -208,7 +211,7 @@ def _get_channel_type(
 
 def _detect_peaks(
     signal: np.ndarray, starts: np.ndarray, ends: np.ndarray, ch_type: str
-) -> List[int]:
+) -> np.ndarray:
     """Detect the peak sample within each blink interval.
 
     Parameters
@@ -222,22 +225,94 @@ def _detect_peaks(
 
     Returns
     -------
-    list of int
+    numpy.ndarray
         Peak index for every blink interval.
     """
 
-    peaks: List[int] = []
-    for start, end in zip(starts, ends):
-        segment = signal[start : end + 1]
-        if ch_type == "eeg":
-            peak = int(np.argmax(segment) + start)
-        else:
-            logger.warning(
-                "Peak detection tuned for EEG; using absolute max for %s", ch_type
-            )
-            peak = int(np.argmax(np.abs(segment)) + start)
-        peaks.append(peak)
-    return peaks
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.minimum(np.asarray(ends, dtype=np.int64), len(signal) - 1)
+    if starts.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    lengths = ends - starts + 1
+    if np.any(lengths <= 0) or np.any(starts < 0):
+        raise ValueError("Blink interval is empty or starts before the segment")
+
+    if ch_type == "eeg":
+        values = signal
+    else:
+        logger.warning(
+            "Peak detection tuned for EEG; using absolute max for %s", ch_type
+        )
+        values = np.abs(signal)
+    flat_idx, offsets = ragged_indices(starts, lengths)
+    return starts + segment_argmax(values[flat_idx], offsets)
+
+
+def _outer_bounds_array(peaks: np.ndarray, n_samples: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Array form of :func:`compute_outer_bounds`."""
+    peaks = np.asarray(peaks, dtype=np.int64)
+    if peaks.size == 0:
+        return peaks.copy(), peaks.copy()
+    outer_start = np.concatenate(([0], peaks[:-1]))
+    outer_end = np.concatenate((peaks[1:], [n_samples - 1]))
+    return outer_start, outer_end
+
+
+def _blink_event_frame(
+    signal: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    ch_type: str,
+    context: str,
+) -> pd.DataFrame:
+    """Locate peaks, outer bounds and zero crossings of blinks in ``signal``.
+
+    Parameters
+    ----------
+    signal : np.ndarray
+        One-dimensional blink signal.
+    starts, ends : np.ndarray
+        Start and end sample indices for each blink annotation.
+    ch_type : str
+        Type of the underlying channel (e.g., ``"eeg"``).
+    context : str
+        Description of ``signal`` used in error messages.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per blink with columns ``blink_id``, ``start_blink``,
+        ``max_blink``, ``end_blink``, ``outer_start``, ``outer_end``,
+        ``left_zero`` and ``right_zero``.
+    """
+
+    peaks = _detect_peaks(signal, starts, ends, ch_type)
+    outer_start, outer_end = _outer_bounds_array(peaks, len(signal))
+    left_zero, right_zero = left_right_zero_crossings(
+        signal, peaks, negative_index=negative_sample_index(signal)
+    )
+    if np.any(left_zero < 0):
+        raise IndexError(
+            f"{context}: no negative sample before blink peak(s) "
+            f"{peaks[left_zero < 0].tolist()}"
+        )
+
+    right_col: np.ndarray = right_zero
+    if np.any(right_zero < 0):
+        right_col = np.where(right_zero < 0, np.nan, right_zero.astype(float))
+
+    return pd.DataFrame(
+        {
+            "blink_id": np.arange(peaks.size, dtype=np.int64),
+            "start_blink": np.asarray(starts, dtype=np.int64),
+            "max_blink": peaks,
+            "end_blink": np.asarray(ends, dtype=np.int64),
+            "outer_start": outer_start,
+            "outer_end": outer_end,
+            "left_zero": left_zero,
+            "right_zero": right_col,
+        }
+    )
 
 
 def _process_segment_blinks(
@@ -246,9 +321,13 @@ def _process_segment_blinks(
     channel: str,
     blink_label: str | None,
     channel_type: str | None,
-) -> List[Dict[str, int | None]]:
+) -> pd.DataFrame:
     """Extract blink information from one raw segment.
 
+    Peaks, outer bounds and zero crossings of all blinks in the segment are
+    computed with array operations; zero crossings are looked up in the
+    segment's negative-sample index.
+
     Parameters
     ----------
     seg_id : int
@@ -265,44 +344,72 @@ def _process_segment_blinks(
 
     Returns
     -------
-    list of dict
-        Rows describing each detected blink with sample indices.
+    pandas.DataFrame
+        One row per detected blink with sample indices. ``right_zero`` is
+        ``NaN`` when no negative sample follows the peak.
     """
 
     signal = raw.get_data(picks=channel)[0]
     ch_type = _get_channel_type(raw, channel, channel_type)
+    if ch_type.lower() != "eeg":
+        logger.warning(
+            "left_right_zero_crossing tuned for EEG signals; results may be inaccurate for %s",
+            ch_type,
+        )
 
     starts, ends = _filter_blink_annotations(raw, blink_label)
-    peaks = _detect_peaks(signal, starts, ends, ch_type)
-    bounds = compute_outer_bounds(peaks, len(signal))
-
-    rows: List[Dict[str, int | None]] = []
-    for blink_id, (start, end, peak), (outer_start, outer_end) in tqdm(
-        zip(range(len(peaks)), zip(starts, ends, peaks), bounds),
-        desc=f"Seg {seg_id} blinks",
-        leave=False,
-    ):
-        left_zero, right_zero = left_right_zero_crossing(
-            signal,
-            peak,
-            outer_start,
-            outer_end,
-            signal_type=ch_type,
+    frame = _blink_event_frame(signal, starts, ends, ch_type, f"Segment {seg_id}")
+    frame.insert(0, "seg_id", np.full(len(frame), seg_id, dtype=np.int64))
+    return frame
+
+
+def extract_continuous_blink_events(
+    raw: mne.io.BaseRaw,
+    signal: np.ndarray,
+    *,
+    channel: str = "EEG-E8",
+    blink_label: str | None = "blink",
+    channel_type: str | None = None,
+) -> pd.DataFrame:
+    """Create a blink event summary for a whole recording without segmenting.
+
+    Parameters
+    ----------
+    raw : mne.io.BaseRaw
+        Continuous recording holding the blink annotations.
+    signal : numpy.ndarray
+        Data of ``channel`` for the whole recording, e.g. as returned by
+        :func:`pyear.utils.epoch_views.load_channels`.
+    channel : str, optional
+        Channel the signal was read from. Defaults to ``"EEG-E8"``.
+    blink_label : str | None, optional
+        Annotation label that denotes blinks. ``None`` uses all annotations.
+    channel_type : str | None, optional
+        Explicit channel type. When ``None`` the type is obtained from ``raw``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per blink with sample indices relative to the first sample of
+        ``raw``. Columns match :func:`extract_blink_events_dataframe` without
+        ``seg_id``.
+    """
+
+    signal = np.asarray(signal, dtype=float).reshape(-1)
+    if signal.size != raw.n_times:
+        raise ValueError(
+            f"signal has {signal.size} samples, the recording has {raw.n_times}"
         )
-        rows.append(
-            {
-                "seg_id": seg_id,
-                "blink_id": blink_id,
-                "start_blink": int(start),
-                "max_blink": int(peak),
-                "end_blink": int(end),
-                "outer_start": int(outer_start),
-                "outer_end": int(outer_end),
-                "left_zero": int(left_zero),
-                "right_zero": None if right_zero is None else int(right_zero),
-            }
+    ch_type = _get_channel_type(raw, channel, channel_type)
+    if ch_type.lower() != "eeg":
+        logger.warning(
+            "left_right_zero_crossing tuned for EEG signals; results may be inaccurate for %s",
+            ch_type,
         )
-    return rows
+    starts, ends = _filter_blink_annotations(raw, blink_label)
+    df = _blink_event_frame(signal, starts, ends, ch_type, "Recording")
+    logger.info("Extracted %d blink events from the continuous recording", len(df))
+    return df
 
 
 def extract_blink_events_dataframe(
@@ -333,14 +440,12 @@ def extract_blink_events_dataframe(
     """
 
     logger.info("Extracting blink events from %d segments", len(segments))
-    rows: List[Dict[str, int | None]] = []
-
-    for seg_id, raw in enumerate(tqdm(segments, desc="Processing segments")):
-        rows.extend(
-            _process_segment_blinks(seg_id, raw, channel, blink_label, channel_type)
-        )
+    frames = [
+        _process_segment_blinks(seg_id, raw, channel, blink_label, channel_type)
+        for seg_id, raw in enumerate(tqdm(segments, desc="Processing segments"))
+    ]
 
-    df = pd.DataFrame(rows)
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
     logger.info("Extracted %d blink events", len(df))
     logger.debug("Blink events preview:\n%s", df.head())
     return df
@@ -2,17 +2,19 @@
 
 from __future__ import annotations
 
-from typing import Iterable, Dict, Any, List
 import logging
+
+import numpy as np
 import pandas as pd
 
-from .features import classify_blinks_epoch
+from ...morphology.blink_waveforms import blink_amplitudes
+from ...utils.blink_table import BlinkInput, group_blinks_by_epoch
 
 logger = logging.getLogger(__name__)
 
 
 def aggregate_classification_features(
-    blinks: Iterable[Dict[str, Any]],
+    blinks: BlinkInput,
     sfreq: float,
     epoch_len: float,
     n_epochs: int,
@@ -22,7 +24,7 @@ def aggregate_classification_features(
 
     Parameters
     ----------
-    blinks : Iterable[dict]
+    blinks : Iterable[dict] | BlinkTable
         Blink annotations with ``epoch_index`` field.
     sfreq : float
         Sampling frequency in Hertz.
@@ -40,22 +42,23 @@ def aggregate_classification_features(
     """
     logger.info("Aggregating blink classification features over %d epochs", n_epochs)
 
-    per_epoch: List[List[Dict[str, Any]]] = [list() for _ in range(n_epochs)]
-    for blink in blinks:
-        idx = blink["epoch_index"]
-        if 0 <= idx < n_epochs:
-            per_epoch[idx].append(blink)
-
-    records = []
-    for idx, epoch_blinks in enumerate(per_epoch):
-        feats = classify_blinks_epoch(epoch_blinks, sfreq, epoch_len, threshold)
-        record = {
-            "epoch": idx,
-            "Partial_Blink_threshold": threshold,
-        }
-        record.update(feats)
-        records.append(record)
-
-    df = pd.DataFrame.from_records(records).set_index("epoch")
+    table = group_blinks_by_epoch(blinks, n_epochs)
+    # classify every blink at once and count per epoch
+    in_range = (table.epoch_index >= 0) & (table.epoch_index < n_epochs)
+    epochs = table.epoch_index[in_range]
+    partial_mask = blink_amplitudes(table.take(in_range)) < threshold
+    partial = np.bincount(epochs[partial_mask], minlength=n_epochs)
+    complete = np.bincount(epochs[~partial_mask], minlength=n_epochs)
+
+    df = pd.DataFrame(
+        {
+            "Partial_Blink_threshold": np.full(n_epochs, threshold, dtype=float),
+            "Partial_Blink_Total": partial,
+            "Complete_Blink_Total": complete,
+            "Partial_Frequency_bpm": partial / epoch_len * 60.0,
+            "Complete_Frequency_bpm": complete / epoch_len * 60.0,
+        },
+        index=pd.RangeIndex(n_epochs, name="epoch"),
+    )
     logger.debug("Aggregated blink classification DataFrame shape: %s", df.shape)
     return df
@@ -9,25 +9,29 @@ fatigue or ocular discomfort.
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Dict, Optional
 import logging
 
-from ...morphology.per_blink import compute_single_blink_features
+import numpy as np
+
+from ...morphology.blink_waveforms import blink_amplitudes
+from ...utils.blink_table import BlinkInput
 
 logger = logging.getLogger(__name__)
 
 
 def classify_blinks_epoch(
-    blinks: List[Dict[str, Any]],
+    blinks: BlinkInput,
     sfreq: float,
     epoch_len: float,
     threshold: float,
+    amplitudes: Optional[np.ndarray] = None,
 ) -> Dict[str, float]:
     """Classify blinks within one epoch as partial or complete.
 
     Parameters
     ----------
-    blinks : list of dict
+    blinks : list of dict | BlinkTable
         Blink annotations for a single epoch.
     sfreq : float
         Sampling frequency in Hertz.
@@ -35,21 +39,19 @@ def classify_blinks_epoch(
         Length of the epoch in seconds.
     threshold : float
         Amplitude threshold below which a blink is considered partial.
+    amplitudes : numpy.ndarray | None, optional
+        Precomputed amplitude of every blink, see
+        :func:`~pyear.morphology.blink_waveforms.blink_amplitudes`.
 
     Returns
     -------
     dict
         Counts and frequencies of partial and complete blinks.
     """
-    partial = 0
-    complete = 0
-    for blink in blinks:
-        feats = compute_single_blink_features(blink, sfreq)
-        amp = feats["amplitude"]
-        if amp < threshold:
-            partial += 1
-        else:
-            complete += 1
+    if amplitudes is None:
+        amplitudes = blink_amplitudes(blinks)
+    partial = int(np.count_nonzero(amplitudes < threshold))
+    complete = int(amplitudes.size - partial)
     freq_partial = partial / epoch_len * 60.0
     freq_complete = complete / epoch_len * 60.0
     logger.debug(
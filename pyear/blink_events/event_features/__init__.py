@@ -3,6 +3,12 @@ from .aggregate import aggregate_blink_event_features
 from .blink_count import blink_count_epoch
 from .blink_rate import blink_rate_epoch
 from .inter_blink_interval import compute_ibi_features
+from .ibi_complexity import (
+    dfa_exponent,
+    ibi_complexity_windows,
+    permutation_entropy,
+)
+from .recording_ibi import RecordingIBI, epoch_ibi_features
 from .blink_interval_distribution import (
     blink_interval_distribution_segment,
     aggregate_blink_interval_distribution,
@@ -14,6 +20,11 @@ __all__ = [
     "blink_count_epoch",
     "blink_rate_epoch",
     "compute_ibi_features",
+    "dfa_exponent",
+    "ibi_complexity_windows",
+    "permutation_entropy",
+    "RecordingIBI",
+    "epoch_ibi_features",
     "blink_interval_distribution_segment",
     "aggregate_blink_interval_distribution",
     "blink_count_epochs",
@@ -1,20 +1,21 @@
 """Aggregate blink event features."""
 from __future__ import annotations
 
-from typing import Dict, Iterable, List, Sequence, Set
+from typing import Sequence, Set
 
 import logging
 import pandas as pd
 
 from .blink_count import blink_count_epoch
 from .blink_rate import blink_rate_epoch
-from .inter_blink_interval import compute_ibi_features
+from .recording_ibi import epoch_ibi_features
+from ...utils.blink_table import BlinkInput, group_blinks_by_epoch
 
 logger = logging.getLogger(__name__)
 
 
 def aggregate_blink_event_features(
-    blinks: Iterable[Dict[str, int]],
+    blinks: BlinkInput,
     sfreq: float,
     epoch_len: float,
     n_epochs: int,
@@ -24,8 +25,9 @@ def aggregate_blink_event_features(
 
     Parameters
     ----------
-    blinks : Iterable[dict]
-        Iterable of blink annotations containing an ``epoch_index`` field.
+    blinks : Iterable[dict] | BlinkTable
+        Iterable of blink annotations containing an ``epoch_index`` field,
+        or an equivalent :class:`~pyear.utils.blink_table.BlinkTable`.
     sfreq : float
         Sampling frequency of the recording in Hertz.
     epoch_len : float
@@ -56,13 +58,10 @@ def aggregate_blink_event_features(
         if invalid:
             raise ValueError(f"Unknown feature keys: {sorted(invalid)}")
 
-    per_epoch: List[List[Dict[str, int]]] = [list() for _ in range(n_epochs)]
-    for blink in blinks:
-        idx = blink["epoch_index"]
-        if 0 <= idx < n_epochs:
-            per_epoch[idx].append(blink)
+    table = group_blinks_by_epoch(blinks, n_epochs)
     records = []
-    for epoch_idx, epoch_blinks in enumerate(per_epoch):
+    for epoch_idx in range(n_epochs):
+        epoch_blinks = table.epoch(epoch_idx)
         record = {"epoch": epoch_idx}
 
         if "blink_count" in selected:
@@ -71,9 +70,10 @@ def aggregate_blink_event_features(
         if "blink_rate" in selected:
             record["blink_rate"] = blink_rate_epoch(epoch_blinks, epoch_len)
 
-        if "ibi" in selected:
-            record.update(compute_ibi_features(epoch_blinks, sfreq))
-
         records.append(record)
     df = pd.DataFrame.from_records(records).set_index("epoch")
+
+    if "ibi" in selected:
+        # all epochs share one sort of the blinks and one pass over the IBIs
+        df = df.join(epoch_ibi_features(table, sfreq, n_epochs))
     return df
@@ -5,20 +5,23 @@ import logging
 import numpy as np
 import mne
 
+from ...utils.blink_table import BlinkTable
+
 
 logger = logging.getLogger(__name__)
 
 
 def blink_count_epoch(
-        blinks: Union[List[Dict[str, int]], 'mne.io.BaseRaw', 'mne.Epochs'],
+        blinks: Union[List[Dict[str, int]], BlinkTable, 'mne.io.BaseRaw', 'mne.Epochs'],
         label: Optional[str] = None
 ) -> int:
     """Return the number of blinks for a single epoch or from an MNE object.
 
     Parameters
     ----------
-    blinks : list of dict or mne.io.Raw or mne.Epochs
-        Blink annotations for one epoch (as a list of dicts) or an MNE Raw object.
+    blinks : list of dict or BlinkTable or mne.io.Raw or mne.Epochs
+        Blink annotations for one epoch (as a list of dicts or a
+        :class:`~pyear.utils.blink_table.BlinkTable`) or an MNE Raw object.
     label : str, optional
         If using an MNE Raw object, count only annotations matching this label.
 
@@ -49,6 +52,10 @@ def blink_count_epoch(
         logger.warning("Blink count from MNE Epochs not implemented")
         raise NotImplementedError("blink_count_epoch does not support MNE Epochs input.")
 
+    elif isinstance(blinks, BlinkTable):
+        logger.debug("Counting %s blinks from BlinkTable", len(blinks))
+        return len(blinks)
+
     elif isinstance(blinks, list):
         logger.debug("Counting %s blinks from list of dicts", len(blinks))
         return len(blinks)
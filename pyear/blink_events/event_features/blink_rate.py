@@ -1,21 +1,20 @@
 """Blink rate feature."""
 from __future__ import annotations
 
-from typing import List, Dict
-
 import logging
 
 from .blink_count import blink_count_epoch
+from ...utils.blink_table import BlinkInput
 
 logger = logging.getLogger(__name__)
 
 
-def blink_rate_epoch(blinks: List[Dict[str, int]], epoch_len: float) -> float:
+def blink_rate_epoch(blinks: BlinkInput, epoch_len: float) -> float:
     """Compute the blink rate for a single epoch.
 
     Parameters
     ----------
-    blinks : list of dict
+    blinks : list of dict | BlinkTable
         Blink annotations belonging to one epoch.
     epoch_len : float
         Epoch length in seconds.
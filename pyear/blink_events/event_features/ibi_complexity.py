@@ -0,0 +1,304 @@
+"""Complexity measures of many inter-blink interval sequences at once.
+
+The sequences are passed as one flat array with ``offsets`` marking where
+each sequence starts, as in :mod:`pyear.utils.ragged`, so the IBIs of all
+epochs, of sliding windows or of a whole recording go through the same
+vectorised code:
+
+* :func:`permutation_entropy` encodes every delay embedding as an integer
+  ordinal-pattern code and counts the codes of each sequence with one
+  :func:`numpy.unique` call.
+* :func:`rescaled_range_hurst` is the single-scale R/S estimate used by
+  :func:`~pyear.blink_events.event_features.inter_blink_interval.compute_ibi_features`.
+* :func:`dfa_exponent` is a multi-scale detrended fluctuation analysis
+  whose scaling exponent estimates the Hurst exponent of the sequence.
+"""
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import logging
+
+import numpy as np
+
+from ...utils.ragged import ragged_indices, segment_ids
+
+logger = logging.getLogger(__name__)
+
+# shortest sequence and window size used by the fluctuation analysis
+DFA_MIN_SCALE = 4
+# every scale must fit this many windows into a sequence
+DFA_MIN_WINDOWS = 4
+
+
+def _as_segments(
+    values: Sequence[float], offsets: Optional[np.ndarray]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``values`` as floats and the offsets, one segment if ``None``."""
+    values = np.asarray(values, dtype=float).reshape(-1)
+    if offsets is None:
+        offsets = np.array([0, values.size], dtype=np.int64)
+    return values, np.asarray(offsets, dtype=np.int64)
+
+
+def _segment_sums(ids: np.ndarray, weights: np.ndarray, n_segments: int) -> np.ndarray:
+    """Sum ``weights`` per segment, zero for empty segments."""
+    return np.bincount(ids, weights=weights, minlength=n_segments).astype(float, copy=False)
+
+
+def _centred_profile(
+    values: np.ndarray, offsets: np.ndarray, ids: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Deviations from each sequence mean and their running sum per sequence."""
+    n_segments = offsets.size - 1
+    lengths = np.diff(offsets)
+    mean = _segment_sums(ids, values, n_segments) / np.maximum(lengths, 1)
+    dev = values - mean[ids]
+    total = np.cumsum(dev)
+    before = np.concatenate(([0.0], total))[offsets[:-1]]
+    return dev, total - np.repeat(before, lengths)
+
+
+def ordinal_pattern_codes(
+    values: Sequence[float],
+    offsets: Optional[np.ndarray] = None,
+    *,
+    order: int = 3,
+    delay: int = 1,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Ordinal-pattern code of every delay embedding within each sequence.
+
+    Parameters
+    ----------
+    values : Sequence[float]
+        Concatenated sequences.
+    offsets : numpy.ndarray | None, optional
+        Sequence boundaries as returned by
+        :func:`~pyear.utils.ragged.ragged_indices`. ``None`` treats
+        ``values`` as one sequence.
+    order : int, optional
+        Embedding dimension, by default ``3``.
+    delay : int, optional
+        Sample delay between the points of a pattern, by default ``1``.
+
+    Returns
+    -------
+    numpy.ndarray
+        Pattern code of every embedding. The code reads the stable
+        ``argsort`` of the embedding as base-``order`` digits, most
+        significant first, so codes sort like the permutation tuples.
+    numpy.ndarray
+        Sequence number of every embedding.
+    """
+    values, offsets = _as_segments(values, offsets)
+    span = delay * (order - 1)
+    n_embeddings = np.maximum(np.diff(offsets) - span, 0)
+    first, emb_offsets = ragged_indices(offsets[:-1], n_embeddings)
+    windows = values[first[:, None] + delay * np.arange(order)]
+    ranks = np.argsort(windows, axis=1, kind="stable")
+    codes = ranks @ (order ** np.arange(order - 1, -1, -1, dtype=np.int64))
+    return codes, segment_ids(emb_offsets)
+
+
+def permutation_entropy(
+    values: Sequence[float],
+    offsets: Optional[np.ndarray] = None,
+    *,
+    order: int = 3,
+    delay: int = 1,
+) -> np.ndarray:
+    """Permutation entropy of every sequence.
+
+    Parameters
+    ----------
+    values, offsets, order, delay
+        See :func:`ordinal_pattern_codes`.
+
+    Returns
+    -------
+    numpy.ndarray
+        Shannon entropy (natural log) of the ordinal-pattern distribution of
+        every sequence. ``NaN`` for sequences shorter than ``order * delay``.
+    """
+    values, offsets = _as_segments(values, offsets)
+    n_segments = offsets.size - 1
+    codes, ids = ordinal_pattern_codes(values, offsets, order=order, delay=delay)
+    # one key per (sequence, pattern); unique sorts them by sequence, then code
+    n_codes = order**order
+    keys, counts = np.unique(ids * n_codes + codes, return_counts=True)
+    owner = keys // n_codes
+    totals = _segment_sums(owner, counts, n_segments)
+    probs = counts / totals[owner]
+    entropy = -_segment_sums(owner, probs * np.log(probs), n_segments)
+    entropy[np.diff(offsets) < order * delay] = np.nan
+    return entropy
+
+
+def rescaled_range_hurst(
+    values: Sequence[float], offsets: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Single-scale rescaled-range Hurst estimate of every sequence.
+
+    ``log(R / S) / log(n)`` where ``R`` is the range of the cumulative
+    deviations from the mean and ``S`` the sample standard deviation.
+
+    Parameters
+    ----------
+    values, offsets
+        See :func:`ordinal_pattern_codes`.
+
+    Returns
+    -------
+    numpy.ndarray
+        Estimate per sequence, ``NaN`` for sequences shorter than 20 values
+        or without variation.
+    """
+    values, offsets = _as_segments(values, offsets)
+    n_segments = offsets.size - 1
+    lengths = np.diff(offsets)
+    ids = segment_ids(offsets)
+    result = np.full(n_segments, np.nan)
+    long_enough = lengths >= 20
+    if not np.any(long_enough):
+        return result
+    dev, cumdev = _centred_profile(values, offsets, ids)
+    # reduceat runs up to the next listed start, so list every non-empty sequence
+    nonempty = lengths > 0
+    bounds = offsets[:-1][nonempty]
+    r = np.full(n_segments, np.nan)
+    r[nonempty] = np.maximum.reduceat(cumdev, bounds) - np.minimum.reduceat(cumdev, bounds)
+    r = r[long_enough]
+    s = np.sqrt(_segment_sums(ids, dev**2, n_segments)[long_enough] / (lengths[long_enough] - 1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        hurst = np.log(r / s) / np.log(lengths[long_enough])
+    hurst[(s == 0) | (r == 0)] = np.nan
+    result[long_enough] = hurst
+    return result
+
+
+def _default_scales(max_length: int) -> np.ndarray:
+    """Window sizes ``DFA_MIN_SCALE * sqrt(2) ** k`` up to a quarter of ``max_length``.
+
+    The grid does not depend on the other sequences of a batch, so a
+    sequence gets the same exponent alone or batched with longer ones.
+    """
+    largest = max_length // DFA_MIN_WINDOWS
+    if largest < DFA_MIN_SCALE:
+        return np.zeros(0, dtype=np.int64)
+    n_scales = int(np.floor(2 * np.log2(largest / DFA_MIN_SCALE))) + 1
+    grid = np.round(DFA_MIN_SCALE * np.sqrt(2.0) ** np.arange(n_scales)).astype(np.int64)
+    return np.unique(grid[grid <= largest])
+
+
+def dfa_exponent(
+    values: Sequence[float],
+    offsets: Optional[np.ndarray] = None,
+    *,
+    scales: Optional[Sequence[int]] = None,
+) -> np.ndarray:
+    """Detrended fluctuation analysis scaling exponent of every sequence.
+
+    The mean-removed cumulative sum of each sequence is cut into
+    non-overlapping windows of every scale, a straight line is removed from
+    each window, and the root-mean-square residual ``F(s)`` is averaged over
+    the windows. The exponent is the least-squares slope of ``log F(s)``
+    against ``log s``; about ``0.5`` for uncorrelated intervals and larger
+    for persistent, long-range correlated blinking.
+
+    Parameters
+    ----------
+    values, offsets
+        See :func:`ordinal_pattern_codes`.
+    scales : Sequence[int] | None, optional
+        Window sizes. By default :data:`DFA_MIN_SCALE` times powers of
+        ``sqrt(2)`` up to a quarter of the longest sequence. Each sequence
+        only uses scales that fit :data:`DFA_MIN_WINDOWS` windows.
+
+    Returns
+    -------
+    numpy.ndarray
+        Exponent per sequence, ``NaN`` when fewer than two scales are usable
+        or the sequence has no variation.
+    """
+    values, offsets = _as_segments(values, offsets)
+    n_segments = offsets.size - 1
+    lengths = np.diff(offsets)
+    ids = segment_ids(offsets)
+    if scales is None:
+        scales = _default_scales(int(lengths.max(initial=0)))
+    scales = np.asarray(scales, dtype=np.int64)
+
+    if values.size == 0:
+        return np.full(n_segments, np.nan)
+    _, profile = _centred_profile(values, offsets, ids)
+
+    log_f = np.full((n_segments, scales.size), np.nan)
+    for j, scale in enumerate(scales):
+        n_windows = np.where(lengths >= DFA_MIN_WINDOWS * scale, lengths // scale, 0)
+        if not np.any(n_windows):
+            continue
+        starts, win_offsets = ragged_indices(np.zeros(n_segments), n_windows)
+        owner = segment_ids(win_offsets)
+        windows = profile[(offsets[owner] + starts * scale)[:, None] + np.arange(scale)]
+        x = np.arange(scale) - (scale - 1) / 2.0
+        slope = windows @ x / np.dot(x, x)
+        resid = windows - windows.mean(axis=1, keepdims=True) - slope[:, None] * x
+        f2 = _segment_sums(owner, np.mean(resid**2, axis=1), n_segments)
+        used = n_windows > 0
+        with np.errstate(divide="ignore"):
+            log_f[used, j] = 0.5 * np.log(f2[used] / n_windows[used])
+
+    # per-sequence least-squares slope over the usable, finite scales
+    usable = np.isfinite(log_f)
+    log_s = np.where(usable, np.log(np.maximum(scales, 1)), 0.0)
+    log_f = np.where(usable, log_f, 0.0)
+    count = usable.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_s = log_s.sum(axis=1) / count
+        mean_f = log_f.sum(axis=1) / count
+        ds = np.where(usable, log_s - mean_s[:, None], 0.0)
+        alpha = np.sum(ds * (log_f - mean_f[:, None]), axis=1) / np.sum(ds**2, axis=1)
+    alpha[count < 2] = np.nan
+    return alpha
+
+
+def ibi_complexity_windows(
+    ibis: Sequence[float],
+    starts: np.ndarray,
+    stops: np.ndarray,
+    *,
+    order: int = 3,
+    delay: int = 1,
+    scales: Optional[Sequence[int]] = None,
+) -> Dict[str, np.ndarray]:
+    """Complexity measures of index windows of one long IBI sequence.
+
+    Parameters
+    ----------
+    ibis : Sequence[float]
+        Inter-blink intervals of a whole recording, in blink order.
+    starts, stops : numpy.ndarray
+        Window bounds ``[start, stop)`` as indices into ``ibis``. Windows may
+        overlap.
+    order, delay : int, optional
+        Permutation entropy parameters, see :func:`permutation_entropy`.
+    scales : Sequence[int] | None, optional
+        DFA window sizes, see :func:`dfa_exponent`.
+
+    Returns
+    -------
+    dict of numpy.ndarray
+        ``ibi_permutation_entropy``, ``ibi_hurst_exponent`` (R/S) and
+        ``ibi_dfa_alpha`` for every window.
+    """
+    ibis = np.asarray(ibis, dtype=float).reshape(-1)
+    starts = np.clip(np.asarray(starts, dtype=np.int64), 0, ibis.size)
+    stops = np.clip(np.asarray(stops, dtype=np.int64), starts, ibis.size)
+    flat, offsets = ragged_indices(starts, stops - starts)
+    values = ibis[flat]
+    logger.debug("IBI complexity for %d windows", starts.size)
+    return {
+        "ibi_permutation_entropy": permutation_entropy(values, offsets, order=order, delay=delay),
+        "ibi_hurst_exponent": rescaled_range_hurst(values, offsets),
+        "ibi_dfa_alpha": dfa_exponent(values, offsets, scales=scales),
+    }
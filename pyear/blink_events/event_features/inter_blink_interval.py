@@ -1,11 +1,14 @@
 """Inter-blink interval based features."""
 from __future__ import annotations
 
-from typing import Dict, List, Sequence
+from typing import Dict, Sequence
 
 import logging
 import numpy as np
 
+from .ibi_complexity import dfa_exponent, permutation_entropy, rescaled_range_hurst
+from ...utils.blink_table import BlinkInput, blink_frame_arrays
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,18 +30,7 @@ def _permutation_entropy(series: Sequence[float], *, order: int = 3, delay: int
         Estimated permutation entropy. Returns ``NaN`` if the sequence is too
         short for the specified parameters.
     """
-    data = np.asarray(series)
-    n = len(data)
-    if n < order * delay:
-        return float("nan")
-    patterns: List[tuple[int, ...]] = []
-    for i in range(n - delay * (order - 1)):
-        subseq = data[i : i + order * delay : delay]
-        patterns.append(tuple(np.argsort(subseq)))
-    _, counts = np.unique(patterns, axis=0, return_counts=True)
-    probs = counts / counts.sum()
-    pe = -np.sum(probs * np.log(probs))
-    return float(pe)
+    return float(permutation_entropy(series, order=order, delay=delay)[0])
 
 
 def _hurst_exponent(series: Sequence[float]) -> float:
@@ -55,26 +47,32 @@ def _hurst_exponent(series: Sequence[float]) -> float:
         Hurst exponent estimating long-range dependence. ``NaN`` is returned for
         very short or constant sequences.
     """
-    data = np.asarray(series, dtype=float)
-    n = len(data)
-    if n < 20:
-        return float("nan")
-    mean = np.mean(data)
-    dev = data - mean
-    cumdev = np.cumsum(dev)
-    r = np.max(cumdev) - np.min(cumdev)
-    s = np.std(data, ddof=1)
-    if s == 0 or r == 0:
-        return float("nan")
-    return float(np.log(r / s) / np.log(n))
-
-
-def compute_ibi_features(blinks: List[Dict[str, int]], sfreq: float) -> Dict[str, float]:
+    return float(rescaled_range_hurst(series)[0])
+
+
+def _dfa_alpha(series: Sequence[float]) -> float:
+    """Estimate the multi-scale DFA exponent of a sequence.
+
+    Parameters
+    ----------
+    series : Sequence[float]
+        Sequence of inter-blink intervals.
+
+    Returns
+    -------
+    float
+        Detrended fluctuation scaling exponent, ``NaN`` for sequences too
+        short to cover two window sizes.
+    """
+    return float(dfa_exponent(series)[0])
+
+
+def compute_ibi_features(blinks: BlinkInput, sfreq: float) -> Dict[str, float]:
     """Compute inter-blink interval statistics for a given epoch.
 
     Parameters
     ----------
-    blinks : list of dict
+    blinks : list of dict | BlinkTable
         Blink annotations belonging to one epoch.
     sfreq : float
         Sampling frequency of the original recording in Hertz.
@@ -85,8 +83,9 @@ def compute_ibi_features(blinks: List[Dict[str, int]], sfreq: float) -> Dict[str
         Dictionary with summary metrics of inter-blink intervals including mean,
         standard deviation and complexity measures.
     """
-    starts = np.array([b["refined_start_frame"] for b in blinks], dtype=float)
-    ends = np.array([b["refined_end_frame"] for b in blinks], dtype=float)
+    start_frames, _, end_frames = blink_frame_arrays(blinks)
+    starts = start_frames.astype(float)
+    ends = end_frames.astype(float)
     order = np.argsort(starts)
     starts = starts[order]
     ends = ends[order]
@@ -107,6 +106,7 @@ def compute_ibi_features(blinks: List[Dict[str, int]], sfreq: float) -> Dict[str
             "poincare_ratio": float("nan"),
             "ibi_permutation_entropy": float("nan"),
             "ibi_hurst_exponent": float("nan"),
+            "ibi_dfa_alpha": float("nan"),
         }
 
     ibi_mean = float(np.mean(ibis))
@@ -127,6 +127,7 @@ def compute_ibi_features(blinks: List[Dict[str, int]], sfreq: float) -> Dict[str
         sd1 = sd2 = sd_ratio = float("nan")
     pe = _permutation_entropy(ibis)
     hurst = _hurst_exponent(ibis)
+    dfa_alpha = _dfa_alpha(ibis)
     return {
         "ibi_mean": ibi_mean,
         "ibi_std": ibi_std,
@@ -140,4 +141,5 @@ def compute_ibi_features(blinks: List[Dict[str, int]], sfreq: float) -> Dict[str
         "poincare_ratio": sd_ratio,
         "ibi_permutation_entropy": pe,
         "ibi_hurst_exponent": hurst,
+        "ibi_dfa_alpha": dfa_alpha,
     }
@@ -0,0 +1,255 @@
+"""Inter-blink interval features over epochs and sliding windows.
+
+:func:`~pyear.blink_events.event_features.inter_blink_interval.compute_ibi_features`
+sorts the blinks of one epoch and derives its IBI statistics on every call.
+Here the blinks are sorted once, their IBI series is built once, and every
+epoch or window becomes an index range ``[lo, hi)`` into that series:
+
+* :func:`ibi_window_features` computes the statistics of many ranges at
+  once. Ranges of equal length are stacked into one matrix and reduced row
+  by row, which reproduces the per-epoch values exactly, including the
+  zero-variance cases that decide whether Poincaré ratios and coefficients
+  of variation are defined.
+* :func:`epoch_ibi_features` applies it to the IBIs within each epoch.
+* :class:`RecordingIBI` places the blinks on the recording timeline so
+  windows of any length and hop, e.g. 30 s windows every second, can also
+  use the IBIs that span an epoch boundary.
+"""
+from __future__ import annotations
+
+from typing import Dict, Optional, Tuple
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from .ibi_complexity import ibi_complexity_windows
+from ...utils.blink_table import BlinkInput, as_blink_table
+
+logger = logging.getLogger(__name__)
+
+IBI_COLUMNS = (
+    "ibi_mean",
+    "ibi_std",
+    "ibi_median",
+    "ibi_min",
+    "ibi_max",
+    "ibi_cv",
+    "ibi_rmssd",
+    "poincare_sd1",
+    "poincare_sd2",
+    "poincare_ratio",
+    "ibi_permutation_entropy",
+    "ibi_hurst_exponent",
+    "ibi_dfa_alpha",
+)
+
+
+def _equal_length_stats(rows: np.ndarray) -> Dict[str, np.ndarray]:
+    """Summary statistics of every row of an ``(n_windows, n_ibis)`` matrix."""
+    n_rows, n = rows.shape
+    nan = np.full(n_rows, np.nan)
+    mean = np.mean(rows, axis=1)
+    std = np.std(rows, ddof=1, axis=1) if n > 1 else nan
+    cv = nan.copy()
+    nonzero = mean != 0
+    cv[nonzero] = std[nonzero] / mean[nonzero]
+    stats = {
+        "ibi_mean": mean,
+        "ibi_std": std,
+        "ibi_median": np.median(rows, axis=1),
+        "ibi_min": np.min(rows, axis=1),
+        "ibi_max": np.max(rows, axis=1),
+        "ibi_cv": cv,
+        "ibi_rmssd": nan,
+        "poincare_sd1": nan,
+        "poincare_sd2": nan,
+        "poincare_ratio": nan,
+    }
+    if n < 2:
+        return stats
+    diff = np.diff(rows, axis=1)
+    stats["ibi_rmssd"] = np.sqrt(np.mean(diff**2, axis=1))
+    if n < 3:
+        # a single successive pair has no sample variance
+        return stats
+    sd1 = np.sqrt(np.var(rows[:, 1:] - rows[:, :-1], ddof=1, axis=1) / 2.0)
+    sd2 = np.sqrt(np.var(rows[:, :-1] + rows[:, 1:], ddof=1, axis=1) / 2.0)
+    ratio = nan.copy()
+    ratio[sd2 != 0] = sd1[sd2 != 0] / sd2[sd2 != 0]
+    stats.update(poincare_sd1=sd1, poincare_sd2=sd2, poincare_ratio=ratio)
+    return stats
+
+
+def ibi_window_features(
+    ibis: np.ndarray, lo: np.ndarray, hi: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """IBI statistics of many index ranges of one IBI series.
+
+    Parameters
+    ----------
+    ibis : numpy.ndarray
+        Inter-blink intervals in seconds.
+    lo, hi : numpy.ndarray
+        Range ``[lo, hi)`` of ``ibis`` covered by every window. Ranges may
+        overlap.
+
+    Returns
+    -------
+    dict of numpy.ndarray
+        Per-window values of :data:`IBI_COLUMNS`, equal to
+        :func:`~pyear.blink_events.event_features.inter_blink_interval.compute_ibi_features`
+        on the same intervals. Windows without intervals are ``NaN``.
+    """
+    ibis = np.asarray(ibis, dtype=float).reshape(-1)
+    lo = np.asarray(lo, dtype=np.int64).reshape(-1)
+    hi = np.maximum(np.asarray(hi, dtype=np.int64).reshape(-1), lo)
+    feats = {col: np.full(lo.size, np.nan) for col in IBI_COLUMNS}
+    lengths = hi - lo
+    for length in np.unique(lengths[lengths > 0]):
+        windows = np.flatnonzero(lengths == length)
+        stats = _equal_length_stats(ibis[lo[windows, None] + np.arange(length)])
+        for col, values in stats.items():
+            feats[col][windows] = values
+    feats.update(ibi_complexity_windows(ibis, lo, hi))
+    return feats
+
+
+def _sorted_ibis(
+    group: np.ndarray, starts: np.ndarray, ends: np.ndarray, sfreq: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Sort blinks by ``(group, start)`` and return the order and the IBIs in seconds."""
+    order = np.lexsort((starts, group))
+    starts = starts[order].astype(float)
+    ends = ends[order].astype(float)
+    return order, (starts[1:] - ends[:-1]) / sfreq
+
+
+def epoch_ibi_features(blinks: BlinkInput, sfreq: float, n_epochs: int) -> pd.DataFrame:
+    """IBI features of every epoch from one sort of all blinks.
+
+    Parameters
+    ----------
+    blinks : Iterable[dict] | BlinkTable
+        Blink annotations with ``epoch_index`` and refined frames.
+    sfreq : float
+        Sampling frequency in Hertz.
+    n_epochs : int
+        Number of epochs.
+
+    Returns
+    -------
+    pandas.DataFrame
+        DataFrame indexed by epoch with the columns of :data:`IBI_COLUMNS`.
+        Only intervals between blinks of the same epoch are used.
+    """
+    table = as_blink_table(blinks)
+    keep = (table.epoch_index >= 0) & (table.epoch_index < n_epochs)
+    epochs = table.epoch_index[keep]
+    order, ibis = _sorted_ibis(
+        epochs, table.refined_start_frame[keep], table.refined_end_frame[keep], sfreq
+    )
+    # the IBIs of epoch e follow its first blink up to its last one
+    sorted_epochs = epochs[order]
+    first = np.searchsorted(sorted_epochs, np.arange(n_epochs), side="left")
+    last = np.searchsorted(sorted_epochs, np.arange(n_epochs), side="right") - 1
+    feats = ibi_window_features(ibis, first, np.maximum(last, first))
+    return pd.DataFrame(feats, index=pd.RangeIndex(n_epochs, name="epoch"))
+
+
+class RecordingIBI:
+    """Inter-blink intervals of a whole recording.
+
+    Parameters
+    ----------
+    starts, ends : numpy.ndarray
+        Blink start and end samples on the recording timeline, in any order.
+    sfreq : float
+        Sampling frequency in Hertz.
+    """
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray, sfreq: float) -> None:
+        starts = np.asarray(starts, dtype=np.int64).reshape(-1)
+        ends = np.asarray(ends, dtype=np.int64).reshape(-1)
+        self.sfreq = float(sfreq)
+        order, self.ibis = _sorted_ibis(np.zeros(starts.size), starts, ends, self.sfreq)
+        self.blink_starts = starts[order]
+        self.blink_ends = ends[order]
+
+    @classmethod
+    def from_blinks(cls, blinks: BlinkInput, sfreq: float, epoch_len: float) -> "RecordingIBI":
+        """Place epoch-relative blinks on the recording timeline.
+
+        Epoch ``e`` is assumed to start ``e * epoch_len`` seconds into the
+        recording, as produced by
+        :func:`~pyear.utils.epochs.slice_raw_into_epochs`.
+        """
+        table = as_blink_table(blinks)
+        shift = np.round(table.epoch_index * epoch_len * sfreq).astype(np.int64)
+        return cls(table.refined_start_frame + shift, table.refined_end_frame + shift, sfreq)
+
+    def window_ranges(
+        self, t_starts: np.ndarray, t_stops: np.ndarray, *, keep_boundary: bool = True
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Index ranges of the IBIs in every time window.
+
+        An IBI belongs to ``[t_start, t_stop)`` when the blink that ends it
+        starts inside the window. With ``keep_boundary=False`` the blink that
+        opens it must start inside the window as well, which drops the
+        interval leading into the window like per-epoch features do.
+        """
+        onsets = self.blink_starts / self.sfreq
+        t_starts = np.asarray(t_starts, dtype=float).reshape(-1)
+        t_stops = np.asarray(t_stops, dtype=float).reshape(-1)
+        # IBI i runs from blink i to blink i + 1
+        opened, closed = onsets[:-1], onsets[1:]
+        lo = np.searchsorted(closed if keep_boundary else opened, t_starts, side="left")
+        hi = np.searchsorted(closed, t_stops, side="left")
+        return lo, np.maximum(hi, lo)
+
+    def window_features(
+        self, t_starts: np.ndarray, t_stops: np.ndarray, *, keep_boundary: bool = True
+    ) -> pd.DataFrame:
+        """IBI features of arbitrary time windows in seconds.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per window with ``start`` and ``stop`` and the columns of
+            :data:`IBI_COLUMNS`.
+        """
+        lo, hi = self.window_ranges(t_starts, t_stops, keep_boundary=keep_boundary)
+        feats = ibi_window_features(self.ibis, lo, hi)
+        return pd.DataFrame({"start": t_starts, "stop": t_stops, **feats})
+
+    def rolling_features(
+        self,
+        window: float = 30.0,
+        step: float = 1.0,
+        *,
+        duration: Optional[float] = None,
+        keep_boundary: bool = True,
+    ) -> pd.DataFrame:
+        """IBI features of sliding windows.
+
+        Parameters
+        ----------
+        window : float, optional
+            Window length in seconds, by default ``30.0``.
+        step : float, optional
+            Hop between window starts in seconds, by default ``1.0``.
+        duration : float | None, optional
+            Recording length in seconds; by default the end of the last
+            blink. Windows extending past it are dropped.
+        keep_boundary : bool, optional
+            See :meth:`window_ranges`.
+        """
+        if window <= 0 or step <= 0:
+            raise ValueError("window and step must be positive")
+        if duration is None:
+            duration = self.blink_ends.max(initial=0) / self.sfreq
+        n_windows = int(np.floor((duration - window) / step + 1e-9)) + 1
+        t_starts = np.arange(max(n_windows, 0)) * step
+        logger.debug("Rolling IBI features over %d windows", t_starts.size)
+        return self.window_features(t_starts, t_starts + window, keep_boundary=keep_boundary)
@@ -2,18 +2,17 @@
 
 from __future__ import annotations
 
-from typing import Iterable, Dict, Any, List
 import logging
 import pandas as pd
-import numpy as np
 
 from .features import ear_before_blink_avg_epoch, ear_extrema_epoch
+from ..utils.blink_table import BlinkInput, group_blinks_by_epoch
 
 logger = logging.getLogger(__name__)
 
 
 def aggregate_ear_features(
-    blinks: Iterable[Dict[str, Any]],
+    blinks: BlinkInput,
     sfreq: float,
     n_epochs: int,
     lookback: float = 3.0,
@@ -22,8 +21,9 @@ def aggregate_ear_features(
 
     Parameters
     ----------
-    blinks : Iterable[dict]
-        Blink annotations with ``epoch_index`` and ``epoch_signal``.
+    blinks : Iterable[dict] | BlinkTable
+        Blink annotations with ``epoch_index`` and ``epoch_signal``. Epochs
+        without a signal yield ``NaN`` features.
     sfreq : float
         Sampling frequency in Hertz.
     n_epochs : int
@@ -38,20 +38,12 @@ def aggregate_ear_features(
     """
     logger.info("Aggregating EAR features over %d epochs", n_epochs)
 
-    per_epoch_signal: List[np.ndarray | None] = [None for _ in range(n_epochs)]
-    per_epoch_blinks: List[List[Dict[str, Any]]] = [list() for _ in range(n_epochs)]
-
-    for blink in blinks:
-        idx = blink["epoch_index"]
-        if 0 <= idx < n_epochs:
-            per_epoch_blinks[idx].append(blink)
-            if per_epoch_signal[idx] is None:
-                per_epoch_signal[idx] = np.asarray(blink["epoch_signal"], dtype=float)
+    table = group_blinks_by_epoch(blinks, n_epochs)
 
     records = []
     for idx in range(n_epochs):
-        signal = per_epoch_signal[idx]
-        blink_list = per_epoch_blinks[idx]
+        signal = table.epoch_signal(idx)
+        blink_list = table.epoch(idx)
         record = {"epoch": idx}
         if signal is None:
             record.update({
@@ -9,16 +9,17 @@ implemented in the `Jena Facial Palsy Tool <https://github.com/cvjena/JeFaPaTo>`
 
 from __future__ import annotations
 
-from typing import List, Dict
 import logging
 import numpy as np
 
+from ...utils.blink_table import BlinkInput, blink_frame_arrays
+
 logger = logging.getLogger(__name__)
 
 
 def ear_before_blink_avg_epoch(
     epoch_signal: np.ndarray,
-    blinks: List[Dict[str, int]],
+    blinks: BlinkInput,
     sfreq: float,
     lookback: float = 3.0,
 ) -> float:
@@ -28,7 +29,7 @@ def ear_before_blink_avg_epoch(
     ----------
     epoch_signal : numpy.ndarray
         Sequence of EAR samples for the epoch.
-    blinks : list of dict
+    blinks : list of dict | BlinkTable
         Blink annotations containing ``refined_start_frame``.
     sfreq : float
         Sampling frequency in Hertz.
@@ -43,9 +44,10 @@ def ear_before_blink_avg_epoch(
         contains no blinks the mean of the entire epoch is returned.
     """
     logger.debug("Calculating pre-blink EAR average")
-    if not blinks:
+    starts, _, _ = blink_frame_arrays(blinks)
+    if starts.size == 0:
         return float(np.mean(epoch_signal))
-    start = int(blinks[0]["refined_start_frame"])
+    start = int(starts[0])
     start_idx = max(0, start - int(lookback * sfreq))
     mean_val = float(np.mean(epoch_signal[start_idx:start]))
     logger.debug("EAR before blink average: %s", mean_val)
@@ -1,30 +1,37 @@
 """Aggregate blink energy and complexity features."""
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List
 import logging
 import pandas as pd
 
 from .energy_complexity_features import compute_energy_complexity_features
+from ..utils.blink_table import BlinkInput, group_blinks_by_epoch
 
 logger = logging.getLogger(__name__)
 
 
 def aggregate_energy_complexity_features(
-    blinks: Iterable[Dict[str, Any]],
+    blinks: BlinkInput,
     sfreq: float,
     n_epochs: int,
+    *,
+    edge_consistent: bool = True,
 ) -> pd.DataFrame:
     """Aggregate energy and complexity metrics across epochs.
 
     Parameters
     ----------
-    blinks : Iterable[dict]
+    blinks : Iterable[dict] | BlinkTable
         Blink annotations with an ``epoch_index`` field.
     sfreq : float
         Sampling frequency in Hertz.
     n_epochs : int
         Number of epochs to aggregate.
+    edge_consistent : bool, optional
+        Forwarded to :func:`compute_energy_complexity_features`. Table input
+        shares one derivative cache over the whole recording, but only
+        ``False`` skips the per-blink differentiation; ``True`` (default)
+        reproduces the per-segment numbers at the same cost.
 
     Returns
     -------
@@ -32,15 +39,13 @@ def aggregate_energy_complexity_features(
         DataFrame indexed by epoch with energy and complexity features.
     """
     logger.info("Aggregating energy and complexity features over %d epochs", n_epochs)
-    per_epoch: List[List[Dict[str, Any]]] = [list() for _ in range(n_epochs)]
-    for blink in blinks:
-        idx = blink["epoch_index"]
-        if 0 <= idx < n_epochs:
-            per_epoch[idx].append(blink)
+    table = group_blinks_by_epoch(blinks, n_epochs)
 
     records = []
-    for epoch_idx, epoch_blinks in enumerate(per_epoch):
-        feats = compute_energy_complexity_features(epoch_blinks, sfreq)
+    for epoch_idx in range(n_epochs):
+        feats = compute_energy_complexity_features(
+            table.epoch(epoch_idx), sfreq, edge_consistent=edge_consistent
+        )
         record = {"epoch": epoch_idx}
         record.update(feats)
         records.append(record)
@@ -1,16 +1,19 @@
 """Blink energy and complexity feature calculations."""
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Dict, List
 import logging
 
-from .per_blink import compute_blink_energy_complexity
+from .per_blink import _blink_energy_complexity
 from ..morphology.morphology_features import _safe_stats
+from ..utils.blink_table import BlinkInput, iter_blink_derivatives
 
 logger = logging.getLogger(__name__)
 
 
-def compute_energy_complexity_features(blinks: List[Dict[str, Any]], sfreq: float) -> Dict[str, float]:
+def compute_energy_complexity_features(
+    blinks: BlinkInput, sfreq: float, *, edge_consistent: bool = True
+) -> Dict[str, float]:
     """Compute aggregated energy and complexity metrics for an epoch.
 
     Signal energy and line length reflect how forcefully and how far the
@@ -21,10 +24,16 @@ def compute_energy_complexity_features(blinks: List[Dict[str, Any]], sfreq: floa
 
     Parameters
     ----------
-    blinks : list of dict
+    blinks : list of dict | BlinkTable
         Blink annotations belonging to one epoch.
     sfreq : float
         Sampling frequency in Hertz.
+    edge_consistent : bool, optional
+        Differentiate every blink segment as if isolated, with one-sided
+        differences at its ends (default). This only reproduces the numbers
+        of per-segment differentiation and is not faster. ``False`` uses the
+        velocity of the whole epoch signal for table input, which is the fast
+        path. See :class:`~pyear.utils.derivatives.DerivativeCache`.
 
     Returns
     -------
@@ -38,8 +47,9 @@ def compute_energy_complexity_features(blinks: List[Dict[str, Any]], sfreq: floa
     lengths: List[float] = []
     vel_ints: List[float] = []
 
-    for blink in blinks:
-        single = compute_blink_energy_complexity(blink, sfreq)
+    frames = iter_blink_derivatives(blinks, sfreq, order=1, edge_consistent=edge_consistent)
+    for signal, start, _, end, (velocity,) in frames:
+        single = _blink_energy_complexity(signal, start, end, sfreq, velocity)
         energies.append(single["blink_signal_energy"])
         tkeo_vals.append(single["teager_kaiser_energy"])
         lengths.append(single["blink_line_length"])
@@ -1,7 +1,7 @@
 """Per-blink energy and complexity feature calculations."""
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 import logging
 import numpy as np
 
@@ -30,10 +30,25 @@ def compute_blink_energy_complexity(blink: Dict[str, Any], sfreq: float) -> Dict
         Dictionary with signal energy, Teager–Kaiser energy, line length
         and the integral of absolute velocity for the blink.
     """
-    start = int(blink["refined_start_frame"])
-    end = int(blink["refined_end_frame"])
-    signal = np.asarray(blink["epoch_signal"], dtype=float)
+    return _blink_energy_complexity(
+        np.asarray(blink["epoch_signal"], dtype=float),
+        int(blink["refined_start_frame"]),
+        int(blink["refined_end_frame"]),
+        sfreq,
+    )
+
 
+def _blink_energy_complexity(
+    signal: np.ndarray,
+    start: int,
+    end: int,
+    sfreq: float,
+    velocity: Optional[np.ndarray] = None,
+) -> Dict[str, float]:
+    """Array-level implementation of :func:`compute_blink_energy_complexity`.
+
+    ``velocity`` may hold the precomputed derivative of the segment.
+    """
     segment = signal[start : end + 1]
     dt = 1.0 / sfreq
 
@@ -47,7 +62,8 @@ def compute_blink_energy_complexity(blink: Dict[str, Any], sfreq: float) -> Dict
 
     line_length = float(np.sum(np.abs(np.diff(segment))))
 
-    velocity = np.gradient(segment, dt)
+    if velocity is None:
+        velocity = np.gradient(segment, dt)
     vel_integral = float(np.trapz(np.abs(velocity), dx=dt))
 
     logger.debug(
@@ -1,8 +1,15 @@
 """Frequency-domain feature extraction package."""
 from .aggregate import aggregate_frequency_domain_features
+from .blink_rate_spectrum import blink_rate_spectrum, recording_blink_rate_peaks
+from .recording_spectrogram import RecordingSpectrogram
 from .segment_features import compute_frequency_domain_features
+from .spectral_engine import frequency_domain_features_batch
 
 __all__ = [
+    "RecordingSpectrogram",
     "aggregate_frequency_domain_features",
+    "blink_rate_spectrum",
     "compute_frequency_domain_features",
+    "frequency_domain_features_batch",
+    "recording_blink_rate_peaks",
 ]
@@ -1,18 +1,19 @@
 """Aggregate frequency-domain features across epochs."""
 from __future__ import annotations
 
-from typing import Iterable, Dict, Any, List
 import logging
-import pandas as pd
+
 import numpy as np
+import pandas as pd
 
-from .features import compute_frequency_domain_features
+from .spectral_engine import FREQUENCY_DOMAIN_COLUMNS, frequency_domain_features_batch
+from ..utils.blink_table import BlinkInput, group_blinks_by_epoch
 
 logger = logging.getLogger(__name__)
 
 
 def aggregate_frequency_domain_features(
-    blinks: Iterable[Dict[str, Any]],
+    blinks: BlinkInput,
     sfreq: float,
     n_epochs: int,
 ) -> pd.DataFrame:
@@ -20,8 +21,9 @@ def aggregate_frequency_domain_features(
 
     Parameters
     ----------
-    blinks : Iterable[dict]
-        Blink annotations with ``epoch_index`` and ``epoch_signal``.
+    blinks : Iterable[dict] | BlinkTable
+        Blink annotations with ``epoch_index`` and ``epoch_signal``. Epochs
+        without a signal yield ``NaN`` features.
     sfreq : float
         Sampling frequency in Hertz.
     n_epochs : int
@@ -33,40 +35,30 @@ def aggregate_frequency_domain_features(
         DataFrame indexed by epoch with frequency-domain features.
     """
     logger.info("Aggregating frequency-domain features over %d epochs", n_epochs)
-    per_epoch_signal: List[np.ndarray | None] = [None for _ in range(n_epochs)]
-    per_epoch_blinks: List[List[Dict[str, Any]]] = [list() for _ in range(n_epochs)]
-
-    for blink in blinks:
-        idx = blink["epoch_index"]
-        if 0 <= idx < n_epochs:
-            per_epoch_blinks[idx].append(blink)
-            if per_epoch_signal[idx] is None:
-                per_epoch_signal[idx] = np.asarray(blink["epoch_signal"], dtype=float)
+    table = group_blinks_by_epoch(blinks, n_epochs)
 
-    records = []
-    for idx in range(n_epochs):
-        signal = per_epoch_signal[idx]
-        blinks_epoch = per_epoch_blinks[idx]
-        if signal is None:
-            feats = {
-                "blink_rate_peak_freq": float("nan"),
-                "blink_rate_peak_power": float("nan"),
-                "broadband_power_0_5_2": float("nan"),
-                "broadband_com_0_5_2": float("nan"),
-                "high_freq_entropy_2_13": float("nan"),
-                "one_over_f_slope": float("nan"),
-                "band_power_ratio": float("nan"),
-                "wavelet_energy_d1": float("nan"),
-                "wavelet_energy_d2": float("nan"),
-                "wavelet_energy_d3": float("nan"),
-                "wavelet_energy_d4": float("nan"),
-            }
-        else:
-            feats = compute_frequency_domain_features(blinks_epoch, signal, sfreq)
-        record = {"epoch": idx}
-        record.update(feats)
-        records.append(record)
+    df = pd.DataFrame(
+        {col: np.full(n_epochs, np.nan) for col in FREQUENCY_DOMAIN_COLUMNS},
+        index=pd.RangeIndex(n_epochs, name="epoch"),
+    )
+    n_rows = min(table.n_signal_epochs, n_epochs)
+    lengths = table.signal_lengths[:n_rows]
+    in_rows = (table.epoch_index >= 0) & (table.epoch_index < n_rows)
+    # epochs of equal length share one batch; in practice all but the last
+    for length in np.unique(lengths[lengths > 0]):
+        rows = np.flatnonzero(lengths == length)
+        batch_row = np.full(n_rows, -1, dtype=np.int64)
+        batch_row[rows] = np.arange(rows.size)
+        in_batch = in_rows.copy()
+        in_batch[in_rows] = batch_row[table.epoch_index[in_rows]] >= 0
+        feats = frequency_domain_features_batch(
+            table.epoch_signals[rows, :length],
+            batch_row[table.epoch_index[in_batch]],
+            table.refined_start_frame[in_batch],
+            sfreq,
+        )
+        for col in FREQUENCY_DOMAIN_COLUMNS:
+            df.iloc[rows, df.columns.get_loc(col)] = feats[col]
 
-    df = pd.DataFrame.from_records(records).set_index("epoch")
     logger.debug("Aggregated frequency-domain DataFrame shape: %s", df.shape)
     return df
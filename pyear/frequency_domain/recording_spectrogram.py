@@ -0,0 +1,238 @@
+"""Welch spectra of arbitrary windows from one short-time Fourier transform.
+
+The epoch features of :mod:`pyear.frequency_domain.spectral_engine` use one
+periodogram per epoch. :class:`RecordingSpectrogram` instead transforms the
+continuous channel once into overlapping tapered frames and keeps the power
+of every frame. The Welch estimate of any span is then the mean power of the
+frames lying inside it, so epochs and sliding windows of any length or hop
+are served by slicing the frame axis of the cached spectrogram.
+
+Power follows the periodogram scaling of the epoch features,
+``|rfft(w * x)|**2 / sum(w**2)``, on the frequency grid of one frame. With a
+boxcar window and one frame per epoch the features therefore equal those of
+:func:`~pyear.frequency_domain.spectral_engine.frequency_domain_features_batch`;
+shorter, overlapping frames trade frequency resolution for smoother
+estimates.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Optional, Tuple
+
+import mne
+import numpy as np
+import pandas as pd
+
+from .spectral_engine import (
+    APERTURE_SPECTRAL_COLUMNS,
+    SpectralBands,
+    aperture_spectral_features,
+    spectral_bands,
+)
+
+logger = logging.getLogger(__name__)
+
+# frames transformed per rfft call, bounding the temporary frame matrix
+_FRAME_CHUNK = 2048
+
+
+def _frame_window(name: str, n: int) -> np.ndarray:
+    """Periodic taper of ``n`` samples (``"hann"`` or ``"boxcar"``)."""
+    if name == "hann":
+        return 0.5 - 0.5 * np.cos(2.0 * np.pi * np.arange(n) / n)
+    if name == "boxcar":
+        return np.ones(n)
+    raise ValueError(f"window must be 'hann' or 'boxcar', got {name!r}")
+
+
+class RecordingSpectrogram:
+    """Short-time power spectra of a continuous channel, computed on first use.
+
+    Parameters
+    ----------
+    signal : numpy.ndarray
+        Continuous eyelid aperture samples of the whole recording.
+    sfreq : float
+        Sampling frequency in Hertz.
+    frame_length : float, optional
+        Length of each STFT frame in seconds, by default ``4.0``.
+    overlap : float, optional
+        Fraction of a frame shared with the next one, in ``[0, 1)``, by
+        default ``0.5``.
+    window : {"hann", "boxcar"}, optional
+        Taper applied to every frame, by default ``"hann"``.
+
+    Notes
+    -----
+    Frames containing non-finite samples are excluded from every average.
+    """
+
+    def __init__(
+        self,
+        signal: np.ndarray,
+        sfreq: float,
+        *,
+        frame_length: float = 4.0,
+        overlap: float = 0.5,
+        window: str = "hann",
+    ) -> None:
+        self.signal = np.asarray(signal, dtype=float).reshape(-1)
+        self.sfreq = float(sfreq)
+        self.nperseg = int(round(frame_length * self.sfreq))
+        if not 0 < self.nperseg <= self.signal.size:
+            raise ValueError("frame_length must span between one sample and the recording")
+        if not 0 <= overlap < 1:
+            raise ValueError(f"overlap must be in [0, 1), got {overlap}")
+        self.hop = max(1, int(round(self.nperseg * (1 - overlap))))
+        self.taper = _frame_window(window, self.nperseg)
+        self.n_frames = (self.signal.size - self.nperseg) // self.hop + 1
+        self._power: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_raw(cls, raw: mne.io.BaseRaw, picks: str, **kwargs) -> "RecordingSpectrogram":
+        """Build the spectrogram of one channel of ``raw``.
+
+        Parameters
+        ----------
+        raw : mne.io.BaseRaw
+            Continuous recording.
+        picks : str
+            Channel to transform.
+        **kwargs
+            Forwarded to :class:`RecordingSpectrogram`.
+        """
+        return cls(raw.get_data(picks=picks)[0], raw.info["sfreq"], **kwargs)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def bands(self) -> SpectralBands:
+        """Frequency grid of one frame and the feature bands."""
+        return spectral_bands(self.nperseg, self.sfreq)
+
+    @property
+    def frame_starts(self) -> np.ndarray:
+        """First sample of every frame."""
+        return np.arange(self.n_frames) * self.hop
+
+    def _frame_power(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Power of every frame and its validity, computed once."""
+        with self._lock:
+            if self._power is None:
+                frames = np.lib.stride_tricks.sliding_window_view(self.signal, self.nperseg)
+                frames = frames[:: self.hop][: self.n_frames]
+                scale = np.sum(self.taper**2)
+                # one zero row past the last frame keeps reduceat indices in range
+                power = np.zeros((self.n_frames + 1, self.nperseg // 2 + 1))
+                for lo in range(0, self.n_frames, _FRAME_CHUNK):
+                    hi = min(lo + _FRAME_CHUNK, self.n_frames)
+                    chunk = frames[lo:hi] * self.taper
+                    power[lo:hi] = np.abs(np.fft.rfft(chunk, axis=1)) ** 2 / scale
+                valid = np.isfinite(power).all(axis=1)
+                power[~valid] = 0.0
+                valid[-1] = False
+                self._power = (power, valid)
+                logger.debug(
+                    "Spectrogram of %d frames of %d samples", self.n_frames, self.nperseg
+                )
+            return self._power
+
+    def welch(self, starts: np.ndarray, stops: np.ndarray) -> np.ndarray:
+        """Mean frame power of sample spans ``[start, stop)``.
+
+        Parameters
+        ----------
+        starts, stops : numpy.ndarray
+            Span bounds in samples from the start of the recording.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(n_spans, n_freqs)`` power on :attr:`bands`, ``NaN`` for spans
+            that hold no complete valid frame.
+        """
+        starts = np.asarray(starts, dtype=np.int64).reshape(-1)
+        stops = np.asarray(stops, dtype=np.int64).reshape(-1)
+        power, valid = self._frame_power()
+        first = np.clip(-(-starts // self.hop), 0, self.n_frames)
+        last = np.clip((stops - self.nperseg) // self.hop + 1, 0, self.n_frames)
+        last = np.maximum(last, first)
+        if starts.size == 0:
+            return np.empty((0, power.shape[1]))
+        # even reduceat slots sum frames[first:last]; odd slots are discarded
+        bounds = np.column_stack([first, last]).reshape(-1)
+        totals = np.add.reduceat(power, bounds, axis=0)[::2]
+        n_valid = np.add.reduceat(valid.astype(np.int64), bounds)[::2]
+        n_valid[last == first] = 0
+        psd = np.full(totals.shape, np.nan)
+        has = n_valid > 0
+        psd[has] = totals[has] / n_valid[has, None]
+        return psd
+
+    def window_features(self, starts: np.ndarray, stops: np.ndarray) -> pd.DataFrame:
+        """Aperture band features of sample spans ``[start, stop)``.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per span with ``start`` and ``stop`` in seconds and the
+            columns of
+            :data:`~pyear.frequency_domain.spectral_engine.APERTURE_SPECTRAL_COLUMNS`.
+        """
+        starts = np.asarray(starts, dtype=np.int64).reshape(-1)
+        stops = np.asarray(stops, dtype=np.int64).reshape(-1)
+        psd = self.welch(starts, stops)
+        feats = {col: np.full(starts.size, np.nan) for col in APERTURE_SPECTRAL_COLUMNS}
+        covered = ~np.isnan(psd).any(axis=1)
+        if np.any(covered):
+            for col, values in aperture_spectral_features(psd[covered], self.bands).items():
+                feats[col][covered] = values
+        return pd.DataFrame({"start": starts / self.sfreq, "stop": stops / self.sfreq, **feats})
+
+    def epoch_features(self, epoch_len: float = 30.0) -> pd.DataFrame:
+        """Aperture band features of consecutive epochs.
+
+        Epochs follow :func:`~pyear.utils.epochs.slice_raw_into_epochs`: they
+        start every ``epoch_len`` seconds and the last one is truncated at the
+        end of the recording.
+
+        Returns
+        -------
+        pandas.DataFrame
+            DataFrame indexed by epoch.
+        """
+        total_time = (self.signal.size - 1) / self.sfreq
+        n_epochs = int(np.ceil(total_time / epoch_len))
+        starts = np.round(np.arange(n_epochs) * epoch_len * self.sfreq).astype(np.int64)
+        stops = np.minimum(starts + int(round(epoch_len * self.sfreq)), self.signal.size)
+        df = self.window_features(starts, stops)
+        df.index = pd.RangeIndex(n_epochs, name="epoch")
+        return df
+
+    def sliding_features(self, window: float, step: Optional[float] = None) -> pd.DataFrame:
+        """Aperture band features of sliding windows.
+
+        Parameters
+        ----------
+        window : float
+            Window length in seconds.
+        step : float | None, optional
+            Hop between window starts in seconds, by default ``window``.
+            Windows extending past the recording are dropped.
+        """
+        size = int(round(window * self.sfreq))
+        hop = size if step is None else int(round(step * self.sfreq))
+        if size <= 0 or hop <= 0:
+            raise ValueError("window and step must span at least one sample")
+        starts = np.arange(0, self.signal.size - size + 1, hop)
+        return self.window_features(starts, starts + size)
+
@@ -5,8 +5,10 @@ from typing import Any, Dict, List
 import logging
 
 import numpy as np
+import pandas as pd
 
 from .features import compute_frequency_domain_features as _compute_fd_features
+from .recording_spectrogram import RecordingSpectrogram
 
 logger = logging.getLogger(__name__)
 
@@ -38,3 +40,36 @@ def compute_frequency_domain_features(
     """
     logger.info("Computing frequency-domain features for %d blinks", len(blinks))
     return _compute_fd_features(blinks, segment_signal, sfreq)
+
+
+def compute_segment_spectrogram_features(
+    spectrogram: RecordingSpectrogram,
+    epoch_len: float = 30.0,
+) -> pd.DataFrame:
+    """Compute aperture band features of every segment from one spectrogram.
+
+    Segments follow :func:`~pyear.utils.segments.slice_raw_to_segments`:
+    consecutive, complete ``epoch_len`` windows from the start of the
+    recording. The spectrogram is computed once, so calling this again with
+    another ``epoch_len`` only slices the cached frames.
+
+    Parameters
+    ----------
+    spectrogram : RecordingSpectrogram
+        Spectrogram of the continuous channel.
+    epoch_len : float, optional
+        Segment length in seconds, by default ``30.0``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Welch-based band features indexed by segment.
+    """
+    size = int(round(epoch_len * spectrogram.sfreq))
+    total_time = (spectrogram.signal.size - 1) / spectrogram.sfreq
+    n_segments = int(total_time // epoch_len)
+    starts = np.round(np.arange(n_segments) * epoch_len * spectrogram.sfreq).astype(np.int64)
+    df = spectrogram.window_features(starts, starts + size)
+    df.index = pd.RangeIndex(len(df), name="segment")
+    logger.info("Computed spectrogram features for %d segments", len(df))
+    return df
@@ -0,0 +1,177 @@
+"""Frequency-domain features of many equal-length epochs at once.
+
+:func:`~pyear.frequency_domain.features.compute_frequency_domain_features`
+handles one epoch per call. :func:`frequency_domain_features_batch` stacks
+epochs of the same length into a ``(n_epochs, n_times)`` matrix and obtains
+every feature from a few calls along the time axis: one ``rfft`` for the
+aperture spectra, a single ``np.polyfit`` with one column per epoch for the
+1/f slope and one ``pywt.wavedec`` for the wavelet energies. The blink-rate
+peak is evaluated from the blink onsets by
+:func:`~pyear.frequency_domain.blink_rate_spectrum.blink_rate_peaks`. The frequency grid and band masks
+only depend on the epoch length and sampling rate and are cached.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Dict, NamedTuple
+
+import logging
+
+import numpy as np
+import pywt
+
+from .blink_rate_spectrum import blink_rate_peaks
+
+logger = logging.getLogger(__name__)
+
+FREQUENCY_DOMAIN_COLUMNS = (
+    "blink_rate_peak_freq",
+    "blink_rate_peak_power",
+    "broadband_power_0_5_2",
+    "broadband_com_0_5_2",
+    "high_freq_entropy_2_13",
+    "one_over_f_slope",
+    "band_power_ratio",
+    "wavelet_energy_d1",
+    "wavelet_energy_d2",
+    "wavelet_energy_d3",
+    "wavelet_energy_d4",
+)
+
+# features of the aperture spectrum alone, without blinks or wavelets
+APERTURE_SPECTRAL_COLUMNS = FREQUENCY_DOMAIN_COLUMNS[2:7]
+
+
+class SpectralBands(NamedTuple):
+    """Frequency grid of an ``n``-sample epoch and its feature bands."""
+
+    freqs: np.ndarray
+    band: np.ndarray
+    high: np.ndarray
+    fit: np.ndarray
+    blink_rate: np.ndarray
+
+
+@lru_cache(maxsize=32)
+def spectral_bands(n: int, sfreq: float) -> SpectralBands:
+    """Return the cached ``rfft`` frequencies and band masks for ``(n, sfreq)``.
+
+    The bands are 0.5–2 Hz (broadband power), 2–13 Hz (high-frequency
+    entropy), 0.5–13 Hz (1/f fit) and 0.1–0.5 Hz (blink-rate peak). The
+    arrays are shared between callers and marked read-only.
+    """
+    freqs = np.fft.rfftfreq(n, 1.0 / sfreq)
+    bands = SpectralBands(
+        freqs,
+        (freqs >= 0.5) & (freqs <= 2.0),
+        (freqs >= 2.0) & (freqs <= 13.0),
+        (freqs >= 0.5) & (freqs <= 13.0),
+        (freqs >= 0.1) & (freqs <= 0.5),
+    )
+    for array in bands:
+        array.setflags(write=False)
+    return bands
+
+
+def aperture_spectral_features(psd: np.ndarray, bands: SpectralBands) -> Dict[str, np.ndarray]:
+    """Band features of aperture power spectra.
+
+    Parameters
+    ----------
+    psd : numpy.ndarray
+        ``(n_rows, n_freqs)`` power spectra on the grid of ``bands``.
+    bands : SpectralBands
+        Frequency grid and band masks, see :func:`spectral_bands`.
+
+    Returns
+    -------
+    dict of numpy.ndarray
+        Per-row values of :data:`APERTURE_SPECTRAL_COLUMNS`.
+    """
+    n_rows = psd.shape[0]
+    freqs = bands.freqs
+    band_psd = psd[:, bands.band]
+    band_power = np.sum(band_psd, axis=1)
+    band_com = np.full(n_rows, np.nan)
+    has_band = band_power > 0
+    band_com[has_band] = (
+        np.sum(freqs[bands.band] * band_psd[has_band], axis=1) / band_power[has_band]
+    )
+
+    high_psd = psd[:, bands.high]
+    high_power = np.sum(high_psd, axis=1)
+    high_entropy = np.full(n_rows, np.nan)
+    has_high = high_power > 0
+    probs = high_psd[has_high] / high_power[has_high, None]
+    high_entropy[has_high] = -np.sum(probs * np.log2(probs + 1e-12), axis=1)
+
+    if np.any(bands.fit):
+        log_power = np.log(psd[:, bands.fit] + 1e-12)
+        slope = np.polyfit(np.log(freqs[bands.fit]), log_power.T, 1)[0]
+        one_over_f = -slope.reshape(n_rows)
+    else:
+        one_over_f = np.full(n_rows, np.nan)
+
+    band_ratio = np.full(n_rows, np.nan)
+    band_ratio[has_high] = band_power[has_high] / high_power[has_high]
+
+    return {
+        "broadband_power_0_5_2": band_power,
+        "broadband_com_0_5_2": band_com,
+        "high_freq_entropy_2_13": high_entropy,
+        "one_over_f_slope": one_over_f,
+        "band_power_ratio": band_ratio,
+    }
+
+
+def frequency_domain_features_batch(
+    epoch_signals: np.ndarray,
+    blink_rows: np.ndarray,
+    blink_starts: np.ndarray,
+    sfreq: float,
+) -> Dict[str, np.ndarray]:
+    """Frequency-domain features of equal-length epochs.
+
+    Parameters
+    ----------
+    epoch_signals : numpy.ndarray
+        ``(n_epochs, n_times)`` eyelid aperture matrix with finite samples.
+    blink_rows : numpy.ndarray
+        Row of ``epoch_signals`` holding each blink.
+    blink_starts : numpy.ndarray
+        Start sample of each blink within its row. Starts outside the row
+        are ignored.
+    sfreq : float
+        Sampling frequency in Hertz.
+
+    Returns
+    -------
+    dict of numpy.ndarray
+        Per-row values of :data:`FREQUENCY_DOMAIN_COLUMNS`, equal to
+        :func:`~pyear.frequency_domain.features.compute_frequency_domain_features`
+        applied to every row up to floating point rounding.
+    """
+    signals = np.asarray(epoch_signals, dtype=float)
+    n_rows, n = signals.shape
+    if n == 0:
+        return {col: np.full(n_rows, np.nan) for col in FREQUENCY_DOMAIN_COLUMNS}
+    bands = spectral_bands(n, float(sfreq))
+    psd = np.abs(np.fft.rfft(signals, axis=1)) ** 2 / n
+
+    aperture = aperture_spectral_features(psd, bands)
+
+    coeffs = pywt.wavedec(signals, "db4", level=4, axis=1)
+    energies = [np.sum(c ** 2, axis=1) for c in coeffs[1:5]]
+
+    peak_freq, peak_power = blink_rate_peaks(blink_rows, blink_starts, n_rows, n, sfreq)
+
+    logger.debug("Frequency-domain features for %d epochs of %d samples", n_rows, n)
+    return {
+        "blink_rate_peak_freq": peak_freq,
+        "blink_rate_peak_power": peak_power,
+        **aperture,
+        "wavelet_energy_d1": energies[0],
+        "wavelet_energy_d2": energies[1],
+        "wavelet_energy_d3": energies[2],
+        "wavelet_energy_d4": energies[3],
+    }
@@ -1,17 +1,20 @@
 """Blink kinematic feature calculations."""
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Dict, List
 
 import logging
 
-from .per_blink import compute_blink_kinematics
+from .per_blink import _blink_kinematics
 from ..morphology.morphology_features import _safe_stats
+from ..utils.blink_table import BlinkInput, iter_blink_derivatives
 
 logger = logging.getLogger(__name__)
 
 
-def compute_kinematic_features(blinks: List[Dict[str, Any]], sfreq: float) -> Dict[str, float]:
+def compute_kinematic_features(
+    blinks: BlinkInput, sfreq: float, *, edge_consistent: bool = True
+) -> Dict[str, float]:
     """Compute aggregated kinematic metrics for a single epoch.
 
     Blink kinematics describe how quickly and smoothly the eyelids move.
@@ -21,10 +24,16 @@ def compute_kinematic_features(blinks: List[Dict[str, Any]], sfreq: float) -> Di
 
     Parameters
     ----------
-    blinks : list of dict
+    blinks : list of dict | BlinkTable
         Blink annotations belonging to one epoch.
     sfreq : float
         Sampling frequency of the recording in Hertz.
+    edge_consistent : bool, optional
+        Differentiate every blink segment as if isolated, with one-sided
+        differences at its ends (default). This only reproduces the numbers
+        of per-segment differentiation and is not faster. ``False`` uses the
+        derivatives of the whole epoch signal for table input, which is the fast
+        path. See :class:`~pyear.utils.derivatives.DerivativeCache`.
 
     Returns
     -------
@@ -37,8 +46,9 @@ def compute_kinematic_features(blinks: List[Dict[str, Any]], sfreq: float) -> Di
     j_maxs: List[float] = []
     avrs: List[float] = []
 
-    for blink in blinks:
-        single = compute_blink_kinematics(blink, sfreq)
+    frames = iter_blink_derivatives(blinks, sfreq, order=3, edge_consistent=edge_consistent)
+    for signal, start, _, end, derivatives in frames:
+        single = _blink_kinematics(signal, start, end, sfreq, derivatives)
         v_maxs.append(single["v_max"])
         a_maxs.append(single["a_max"])
         j_maxs.append(single["j_max"])
@@ -1,11 +1,13 @@
 """Per-blink kinematic metrics."""
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Sequence
 
 import logging
 import numpy as np
 
+from ..utils.derivatives import segment_gradients
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,16 +32,30 @@ def compute_blink_kinematics(blink: Dict[str, Any], sfreq: float) -> Dict[str, f
     dict
         Dictionary with peak velocity, acceleration, jerk and AVR for the blink.
     """
-    start = int(blink["refined_start_frame"])
-    end = int(blink["refined_end_frame"])
-    signal = np.asarray(blink["epoch_signal"], dtype=float)
+    return _blink_kinematics(
+        np.asarray(blink["epoch_signal"], dtype=float),
+        int(blink["refined_start_frame"]),
+        int(blink["refined_end_frame"]),
+        sfreq,
+    )
 
-    segment = signal[start : end + 1]
-    dt = 1.0 / sfreq
 
-    velocity = np.gradient(segment, dt)
-    acceleration = np.gradient(velocity, dt)
-    jerk = np.gradient(acceleration, dt)
+def _blink_kinematics(
+    signal: np.ndarray,
+    start: int,
+    end: int,
+    sfreq: float,
+    derivatives: Optional[Sequence[np.ndarray]] = None,
+) -> Dict[str, float]:
+    """Array-level implementation of :func:`compute_blink_kinematics`.
+
+    ``derivatives`` may hold the velocity, acceleration and jerk of the
+    segment, e.g. from :class:`~pyear.utils.derivatives.DerivativeCache`.
+    """
+    segment = signal[start : end + 1]
+    if derivatives is None:
+        derivatives = segment_gradients(segment, sfreq, 3)
+    velocity, acceleration, jerk = derivatives
 
     abs_velocity = np.abs(velocity)
     abs_acceleration = np.abs(acceleration)
@@ -3,6 +3,7 @@ import numpy as np
 
 from pyear.matlab_fork.matlab_forking import corrMatlab, polyvalMatlab, polyfitMatlab, get_intersection
 from pyear.pyblinkers.zero_crossing import get_line_intersection_slope
+from pyear.utils.ragged import ragged_indices
 
 
 def lines_intersection_matlabx(signal=None,xRight=None, xLeft=None):
@@ -36,3 +37,104 @@ def lines_intersection_matlabx(signal=None,xRight=None, xLeft=None):
     return leftSlope, rightSlope, averLeftVelocity, averRightVelocity, \
         rightR2[0][0], leftR2[0][0], xIntersect, yIntersect, leftXIntercept, rightXIntercept, \
         xLineCross_l, yLineCross_l, xLineCross_r, yLineCross_r
+
+
+def _line_fits(signal, start, stop):
+    """Least-squares lines through ``signal`` over the ranges ``[start, stop]``.
+
+    Closed form of ``polyfitMatlab(x, signal[x], 1)`` followed by
+    ``corrMatlab(signal[x], polyvalMatlab(...))`` for ``x = start..stop``.
+    Because ``x`` is a run of consecutive integers its mean and standard
+    deviation are known exactly, and only three segmented sums of the
+    signal are needed per range.
+    """
+    start = np.asarray(start, dtype=np.int64)
+    lengths = np.asarray(stop, dtype=np.int64) - start + 1
+    if np.any(lengths <= 0):
+        raise ValueError("Fit ranges must contain at least one sample")
+    flat, offsets = ragged_indices(start, lengths)
+    y = np.asarray(signal, dtype=float)[flat]
+    n = lengths.astype(float)
+
+    # x - mean(x) for every sample; sums to zero within each range
+    x_centered = (flat - np.repeat(start, lengths)) - np.repeat((n - 1) / 2, lengths)
+    y_mean = np.add.reduceat(y, offsets[:-1]) / n
+    y_centered = y - np.repeat(y_mean, lengths)
+    s_xy = np.add.reduceat(x_centered * y_centered, offsets[:-1])
+    s_yy = np.add.reduceat(y_centered * y_centered, offsets[:-1])
+    s_xx = n * (n * n - 1) / 12
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_std = np.where(lengths > 1, np.sqrt(s_xx / (n - 1)), np.nan)
+        slope = s_xy / (x_std * (n - 1))
+        # correlation of the data with the fitted line is |corr(x, y)|
+        r = np.minimum(np.abs(s_xy) / np.sqrt(s_xx * s_yy), 1.0)
+    r = np.where((lengths > 1) & (slope != 0), r, np.nan)
+    x_mean = start + (n - 1) / 2
+    return slope, y_mean, x_mean, x_std, r
+
+
+def lines_intersection_batch(signal, left_start, left_stop, right_start, right_stop):
+    """Fit the blink tent of many blinks at once.
+
+    Batched equivalent of :func:`lines_intersection_matlabx` for fit ranges
+    given as inclusive sample bounds, i.e. ``xLeft = left_start..left_stop``
+    and ``xRight = right_start..right_stop``. Each line is fitted in closed
+    form from segmented sums over its range instead of a least-squares solve,
+    a QR decomposition and a Pearson correlation per blink. Results match
+    :func:`lines_intersection_matlabx` to floating-point tolerance.
+
+    Parameters
+    ----------
+    signal : numpy.ndarray
+        1D blink signal.
+    left_start, left_stop : numpy.ndarray
+        Bounds of the left (closing) fit range of every blink.
+    right_start, right_stop : numpy.ndarray
+        Bounds of the right (reopening) fit range of every blink.
+
+    Returns
+    -------
+    dict of numpy.ndarray
+        Columns ``left_slope``, ``right_slope``, ``aver_left_velocity``,
+        ``aver_right_velocity``, ``right_r2``, ``left_r2``, ``x_intersect``,
+        ``y_intersect``, ``left_x_intercept``, ``right_x_intercept`` and the
+        unused ``x_line_cross_l``, ``y_line_cross_l``, ``x_line_cross_r`` and
+        ``y_line_cross_r`` (all ``NaN``), in the order returned by
+        :func:`lines_intersection_matlabx`.
+    """
+    p0, p1, u0, u1, left_r = _line_fits(signal, left_start, left_stop)
+    q0, q1, v0, v1, right_r = _line_fits(signal, right_start, right_stop)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # get_intersection() for every pair of lines
+        left_x_intercept = np.where(p0 == 0, np.nan, (p0 * u0 - p1 * u1) / p0)
+        right_x_intercept = np.where(q0 == 0, np.nan, (q0 * v0 - q1 * v1) / q0)
+        denom = p0 * v1 - q0 * u1
+        numer = u0 * p0 * v1 - v0 * q0 * u1 + q1 * v1 * u1 - p1 * u1 * v1
+        x_intersect = np.where(denom == 0, np.nan, numer / denom)
+        y_intersect = np.where(denom == 0, np.nan, p0 * (x_intersect - u0) / u1 + p1)
+
+        left_slope, right_slope = get_line_intersection_slope(
+            x_intersect, y_intersect, left_x_intercept, right_x_intercept
+        )
+        aver_left_velocity = p0 / u1
+        aver_right_velocity = q0 / v1
+
+    unused = np.full(p0.shape, np.nan)
+    return {
+        "left_slope": left_slope,
+        "right_slope": right_slope,
+        "aver_left_velocity": aver_left_velocity,
+        "aver_right_velocity": aver_right_velocity,
+        "right_r2": right_r,
+        "left_r2": left_r,
+        "x_intersect": x_intersect,
+        "y_intersect": y_intersect,
+        "left_x_intercept": left_x_intercept,
+        "right_x_intercept": right_x_intercept,
+        "x_line_cross_l": unused,
+        "y_line_cross_l": unused.copy(),
+        "x_line_cross_r": unused.copy(),
+        "y_line_cross_r": unused.copy(),
+    }
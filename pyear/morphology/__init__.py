@@ -1,11 +1,13 @@
 """Morphology feature module."""
 
 from .aggregate import aggregate_morphology_features
+from .blink_waveforms import blink_feature_arrays
 from .morphology_features import compute_morphology_features
 from .per_blink import compute_single_blink_features
 
 __all__ = [
     "aggregate_morphology_features",
+    "blink_feature_arrays",
     "compute_morphology_features",
     "compute_single_blink_features",
 ]
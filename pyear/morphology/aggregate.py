@@ -1,17 +1,18 @@
 """Aggregate blink morphology features."""
 from __future__ import annotations
 
-from typing import Dict, Iterable, List
 import logging
 import pandas as pd
 
-from .morphology_features import compute_morphology_features
+from .blink_waveforms import blink_feature_arrays
+from .morphology_features import summarize_blink_features
+from ..utils.blink_table import BlinkInput, group_blinks_by_epoch
 
 logger = logging.getLogger(__name__)
 
 
 def aggregate_morphology_features(
-    blinks: Iterable[Dict[str, int]],
+    blinks: BlinkInput,
     sfreq: float,
     n_epochs: int,
 ) -> pd.DataFrame:
@@ -19,7 +20,7 @@ def aggregate_morphology_features(
 
     Parameters
     ----------
-    blinks : Iterable[dict]
+    blinks : Iterable[dict] | BlinkTable
         Blink annotations with an ``epoch_index`` field.
     sfreq : float
         Sampling frequency in Hertz.
@@ -32,15 +33,14 @@ def aggregate_morphology_features(
         DataFrame indexed by epoch with morphology features.
     """
     logger.info("Aggregating morphology features over %d epochs", n_epochs)
-    per_epoch: List[List[Dict[str, int]]] = [list() for _ in range(n_epochs)]
-    for blink in blinks:
-        idx = blink["epoch_index"]
-        if 0 <= idx < n_epochs:
-            per_epoch[idx].append(blink)
+    table = group_blinks_by_epoch(blinks, n_epochs)
 
+    # per-blink metrics of the whole recording, split by epoch afterwards
+    single = blink_feature_arrays(table, sfreq)
     records = []
-    for epoch_idx, epoch_blinks in enumerate(per_epoch):
-        feats = compute_morphology_features(epoch_blinks, sfreq)
+    for epoch_idx in range(n_epochs):
+        idx = table.grouping.indices(epoch_idx)
+        feats = summarize_blink_features({name: values[idx] for name, values in single.items()})
         record = {"epoch": epoch_idx}
         record.update(feats)
         records.append(record)
@@ -9,17 +9,18 @@ in blinking and are also available in the Jena Facial Palsy Toolbox.
 """
 from __future__ import annotations
 
-from typing import Dict, List, Any
+from typing import Dict, Mapping, Sequence
 
 import logging
 import numpy as np
 
-from .per_blink import compute_single_blink_features
+from .blink_waveforms import blink_feature_arrays
+from ..utils.blink_table import BlinkInput
 
 logger = logging.getLogger(__name__)
 
 
-def _safe_stats(values: List[float]) -> Dict[str, float]:
+def _safe_stats(values: Sequence[float]) -> Dict[str, float]:
     arr = np.asarray(values, dtype=float)
     if arr.size == 0:
         return {
@@ -50,12 +51,12 @@ def _safe_stats(values: List[float]) -> Dict[str, float]:
     }
 
 
-def compute_morphology_features(blinks: List[Dict[str, Any]], sfreq: float) -> Dict[str, float]:
+def compute_morphology_features(blinks: BlinkInput, sfreq: float) -> Dict[str, float]:
     """Compute blink morphology metrics for a single epoch.
 
     Parameters
     ----------
-    blinks : list of dict
+    blinks : list of dict | BlinkTable
         Blink annotations containing ``refined_start_frame``, ``refined_peak_frame``,
         ``refined_end_frame`` and ``epoch_signal``.
     sfreq : float
@@ -67,35 +68,38 @@ def compute_morphology_features(blinks: List[Dict[str, Any]], sfreq: float) -> D
         Dictionary with aggregated morphology features for the epoch.
     """
     logger.info("Computing morphology features for %d blinks", len(blinks))
-    durations: List[float] = []
-    ttp: List[float] = []
-    tfe: List[float] = []
-    rise_25_75: List[float] = []
-    fall_75_25: List[float] = []
-    fwhm: List[float] = []
-    amplitudes: List[float] = []
-    areas: List[float] = []
-    half_area_times: List[float] = []
-    asymmetry: List[float] = []
-    wave_skews: List[float] = []
-    wave_kurts: List[float] = []
-    inflections: List[int] = []
-
-    for blink in blinks:
-        single = compute_single_blink_features(blink, sfreq)
-        durations.append(single["duration"])
-        ttp.append(single["time_to_peak"])
-        tfe.append(single["time_from_peak_to_end"])
-        rise_25_75.append(single["rise_time_25_75"])
-        fall_75_25.append(single["fall_time_75_25"])
-        fwhm.append(single["fwhm"])
-        amplitudes.append(single["amplitude"])
-        areas.append(single["area"])
-        half_area_times.append(single["half_area_time"])
-        asymmetry.append(single["asymmetry"])
-        wave_skews.append(single["waveform_skewness"])
-        wave_kurts.append(single["waveform_kurtosis"])
-        inflections.append(single["inflection_count"])
+    features = summarize_blink_features(blink_feature_arrays(blinks, sfreq))
+    logger.info("Computed morphology features")
+    return features
+
+
+def summarize_blink_features(single: Mapping[str, np.ndarray]) -> Dict[str, float]:
+    """Aggregate per-blink morphology arrays into epoch features.
+
+    Parameters
+    ----------
+    single : mapping of str to numpy.ndarray
+        Per-blink metrics as returned by
+        :func:`~pyear.morphology.blink_waveforms.blink_feature_arrays`.
+
+    Returns
+    -------
+    dict
+        Dictionary with aggregated morphology features.
+    """
+    durations = single["duration"]
+    ttp = single["time_to_peak"]
+    tfe = single["time_from_peak_to_end"]
+    rise_25_75 = single["rise_time_25_75"]
+    fall_75_25 = single["fall_time_75_25"]
+    fwhm = single["fwhm"]
+    amplitudes = single["amplitude"]
+    areas = single["area"]
+    half_area_times = single["half_area_time"]
+    asymmetry = single["asymmetry"]
+    wave_skews = single["waveform_skewness"]
+    wave_kurts = single["waveform_kurtosis"]
+    inflections = single["inflection_count"]
 
     stats_duration = _safe_stats(durations)
     stats_ttp = _safe_stats(ttp)
@@ -157,6 +161,5 @@ def compute_morphology_features(blinks: List[Dict[str, Any]], sfreq: float) -> D
         "blink_inflection_count_std": float(np.nanstd(arr_inflect, ddof=1)) if arr_inflect.size > 1 else float("nan"),
     }
 
-    logger.info("Computed morphology features")
     logger.debug("Morphology feature values: %s", features)
     return features
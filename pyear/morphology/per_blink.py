@@ -25,10 +25,19 @@ def compute_single_blink_features(blink: Dict[str, Any], sfreq: float) -> Dict[s
     dict
         Dictionary with morphology metrics for the blink.
     """
-    start = int(blink["refined_start_frame"])
-    peak = int(blink["refined_peak_frame"])
-    end = int(blink["refined_end_frame"])
-    signal = np.asarray(blink["epoch_signal"], dtype=float)
+    return _single_blink_features(
+        np.asarray(blink["epoch_signal"], dtype=float),
+        int(blink["refined_start_frame"]),
+        int(blink["refined_peak_frame"]),
+        int(blink["refined_end_frame"]),
+        sfreq,
+    )
+
+
+def _single_blink_features(
+    signal: np.ndarray, start: int, peak: int, end: int, sfreq: float
+) -> Dict[str, float]:
+    """Array-level implementation of :func:`compute_single_blink_features`."""
     baseline = signal[start]
     segment = signal[start : end + 1]
 
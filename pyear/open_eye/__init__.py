@@ -8,6 +8,9 @@ from .features import (
     perclos_epoch,
     eye_opening_rms_epoch,
     micropause_count_epoch,
+    closure_events_epoch,
+    aggregate_closure_events,
+    open_eye_summary,
     zero_crossing_rate_epoch,
 )
 
@@ -20,5 +23,8 @@ __all__ = [
     "perclos_epoch",
     "eye_opening_rms_epoch",
     "micropause_count_epoch",
+    "closure_events_epoch",
+    "aggregate_closure_events",
+    "open_eye_summary",
     "zero_crossing_rate_epoch",
 ]
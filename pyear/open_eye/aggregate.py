@@ -1,27 +1,21 @@
 """Aggregate open-eye features across epochs."""
 from __future__ import annotations
 
-from typing import Iterable, Dict, List, Any
 import logging
-import pandas as pd
+
 import numpy as np
+import pandas as pd
 
-from .features import (
-    baseline_mean_epoch,
-    baseline_drift_epoch,
-    baseline_std_epoch,
-    baseline_mad_epoch,
-    perclos_epoch,
-    eye_opening_rms_epoch,
-    micropause_count_epoch,
-    zero_crossing_rate_epoch,
-)
+from .features import aggregate_closure_events
+from .features.closure_events import CLOSURE_EVENT_COLUMNS
+from .features.open_eye_stats import OPEN_EYE_COLUMNS, open_eye_summary
+from ..utils.blink_table import BlinkInput, group_blinks_by_epoch
 
 logger = logging.getLogger(__name__)
 
 
 def aggregate_open_eye_features(
-    blinks: Iterable[Dict[str, Any]],
+    blinks: BlinkInput,
     sfreq: float,
     n_epochs: int,
 ) -> pd.DataFrame:
@@ -29,8 +23,9 @@ def aggregate_open_eye_features(
 
     Parameters
     ----------
-    blinks : Iterable[dict]
-        Blink annotations with ``epoch_index`` and ``epoch_signal``.
+    blinks : Iterable[dict] | BlinkTable
+        Blink annotations with ``epoch_index`` and ``epoch_signal``. Epochs
+        without a signal yield ``NaN`` features.
     sfreq : float
         Sampling frequency in Hertz.
     n_epochs : int
@@ -43,43 +38,31 @@ def aggregate_open_eye_features(
     """
     logger.info("Aggregating open-eye features over %d epochs", n_epochs)
 
-    per_epoch_signals: List[np.ndarray | None] = [None for _ in range(n_epochs)]
-    per_epoch_blinks: List[List[Dict[str, Any]]] = [list() for _ in range(n_epochs)]
-
-    for blink in blinks:
-        idx = blink["epoch_index"]
-        if 0 <= idx < n_epochs:
-            per_epoch_blinks[idx].append(blink)
-            if per_epoch_signals[idx] is None:
-                per_epoch_signals[idx] = np.asarray(blink["epoch_signal"], dtype=float)
+    table = group_blinks_by_epoch(blinks, n_epochs)
 
-    records = []
-    for idx in range(n_epochs):
-        signal = per_epoch_signals[idx]
-        blinks_epoch = per_epoch_blinks[idx]
-        record = {"epoch": idx}
-        if signal is None:
-            record.update({
-                "baseline_mean": float("nan"),
-                "baseline_drift": float("nan"),
-                "baseline_std": float("nan"),
-                "baseline_mad": float("nan"),
-                "perclos": float("nan"),
-                "eye_opening_rms": float("nan"),
-                "micropause_count": 0,
-                "zero_crossing_rate": float("nan"),
-            })
-        else:
-            record["baseline_mean"] = baseline_mean_epoch(signal, blinks_epoch)
-            record["baseline_drift"] = baseline_drift_epoch(signal, blinks_epoch, sfreq)
-            record["baseline_std"] = baseline_std_epoch(signal, blinks_epoch)
-            record["baseline_mad"] = baseline_mad_epoch(signal, blinks_epoch)
-            record["perclos"] = perclos_epoch(signal, blinks_epoch)
-            record["eye_opening_rms"] = eye_opening_rms_epoch(signal, blinks_epoch)
-            record["micropause_count"] = micropause_count_epoch(signal, blinks_epoch, sfreq)
-            record["zero_crossing_rate"] = zero_crossing_rate_epoch(signal, blinks_epoch)
-        records.append(record)
+    # one mask and one pass over the epochs x samples matrix
+    n_rows = min(table.n_signal_epochs, n_epochs)
+    summary = open_eye_summary(
+        table.epoch_signals[:n_rows],
+        table.signal_lengths[:n_rows],
+        table.epoch_index,
+        table.refined_start_frame,
+        table.refined_end_frame,
+        sfreq,
+    )
+    df = pd.DataFrame(
+        {col: np.full(n_epochs, np.nan) for col in OPEN_EYE_COLUMNS},
+        index=pd.RangeIndex(n_epochs, name="epoch"),
+    )
+    for col in OPEN_EYE_COLUMNS:
+        df.iloc[:n_rows, df.columns.get_loc(col)] = summary[col]
 
-    df = pd.DataFrame.from_records(records).set_index("epoch")
+    # micropauses, prolonged blinks and closure durations in one pass
+    closures = aggregate_closure_events(
+        table, sfreq, n_epochs, baselines=df["baseline_mean"].to_numpy()
+    )
+    position = df.columns.get_loc("zero_crossing_rate")
+    for offset, col in enumerate(CLOSURE_EVENT_COLUMNS):
+        df.insert(position + offset, col, closures[col].to_numpy())
     logger.debug("Aggregated open-eye DataFrame shape: %s", df.shape)
     return df
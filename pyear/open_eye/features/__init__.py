@@ -6,6 +6,8 @@ from .baseline_mad import baseline_mad_epoch
 from .perclos import perclos_epoch
 from .eye_opening_rms import eye_opening_rms_epoch
 from .micropause_count import micropause_count_epoch
+from .closure_events import aggregate_closure_events, closure_events_epoch
+from .open_eye_stats import open_eye_summary
 from .zero_crossing_rate import zero_crossing_rate_epoch
 
 __all__ = [
@@ -16,5 +18,8 @@ __all__ = [
     "perclos_epoch",
     "eye_opening_rms_epoch",
     "micropause_count_epoch",
+    "closure_events_epoch",
+    "aggregate_closure_events",
+    "open_eye_summary",
     "zero_crossing_rate_epoch",
 ]
@@ -6,21 +6,23 @@ closures observed in drowsiness.
 """
 from __future__ import annotations
 
-from typing import List, Dict
 import logging
 import numpy as np
 
+from .open_eye_mask import open_eye_mask
+from ...utils.blink_table import BlinkInput
+
 logger = logging.getLogger(__name__)
 
 
-def baseline_drift_epoch(epoch_signal: np.ndarray, blinks: List[Dict[str, int]], sfreq: float) -> float:
+def baseline_drift_epoch(epoch_signal: np.ndarray, blinks: BlinkInput, sfreq: float) -> float:
     """Estimate baseline drift for a single epoch.
 
     Parameters
     ----------
     epoch_signal : numpy.ndarray
         Eyelid aperture samples for the epoch.
-    blinks : list of dict
+    blinks : list of dict | BlinkTable
         Blink annotations with ``refined_start_frame`` and ``refined_end_frame``.
     sfreq : float
         Sampling frequency in Hertz.
@@ -31,11 +33,7 @@ def baseline_drift_epoch(epoch_signal: np.ndarray, blinks: List[Dict[str, int]],
         Slope of the linear regression line fitted to open-eye samples
         expressed in units per second. ``NaN`` if insufficient data.
     """
-    mask = np.ones(len(epoch_signal), dtype=bool)
-    for blink in blinks:
-        start = int(blink["refined_start_frame"])
-        end = int(blink["refined_end_frame"])
-        mask[start : end + 1] = False
+    mask = open_eye_mask(len(epoch_signal), blinks)
     open_signal = epoch_signal[mask]
     if open_signal.size < 2:
         return float("nan")
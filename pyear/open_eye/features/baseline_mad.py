@@ -1,18 +1,18 @@
 """Median absolute deviation of open-eye baseline."""
 from __future__ import annotations
 
-from typing import List, Dict
 import logging
 import numpy as np
 
+from .open_eye_mask import open_eye_mask
+from ...utils.blink_table import BlinkInput
+
 logger = logging.getLogger(__name__)
 
 
-def baseline_mad_epoch(epoch_signal: np.ndarray, blinks: List[Dict[str, int]]) -> float:
+def baseline_mad_epoch(epoch_signal: np.ndarray, blinks: BlinkInput) -> float:
     """Compute baseline median absolute deviation for an epoch."""
-    mask = np.ones(len(epoch_signal), dtype=bool)
-    for blink in blinks:
-        mask[int(blink["refined_start_frame"]): int(blink["refined_end_frame"])+1] = False
+    mask = open_eye_mask(len(epoch_signal), blinks)
     open_signal = epoch_signal[mask]
     if open_signal.size == 0:
         return float("nan")
@@ -7,21 +7,23 @@ which are common signs of drowsiness.
 """
 from __future__ import annotations
 
-from typing import List, Dict
 import logging
 import numpy as np
 
+from .open_eye_mask import open_eye_mask
+from ...utils.blink_table import BlinkInput
+
 logger = logging.getLogger(__name__)
 
 
-def baseline_mean_epoch(epoch_signal: np.ndarray, blinks: List[Dict[str, int]]) -> float:
+def baseline_mean_epoch(epoch_signal: np.ndarray, blinks: BlinkInput) -> float:
     """Compute baseline mean for one epoch.
 
     Parameters
     ----------
     epoch_signal : numpy.ndarray
         Eyelid aperture samples for the epoch.
-    blinks : list of dict
+    blinks : list of dict | BlinkTable
         Blink annotations with ``refined_start_frame`` and ``refined_end_frame``.
 
     Returns
@@ -30,11 +32,7 @@ def baseline_mean_epoch(epoch_signal: np.ndarray, blinks: List[Dict[str, int]])
         Mean eyelid aperture outside blink periods. ``NaN`` if no open segments
         are available.
     """
-    mask = np.ones(len(epoch_signal), dtype=bool)
-    for blink in blinks:
-        start = int(blink["refined_start_frame"])
-        end = int(blink["refined_end_frame"])
-        mask[start : end + 1] = False
+    mask = open_eye_mask(len(epoch_signal), blinks)
     open_signal = epoch_signal[mask]
     if open_signal.size == 0:
         return float("nan")
@@ -6,18 +6,18 @@ oculomotor control due to fatigue.
 """
 from __future__ import annotations
 
-from typing import List, Dict
 import logging
 import numpy as np
 
+from .open_eye_mask import open_eye_mask
+from ...utils.blink_table import BlinkInput
+
 logger = logging.getLogger(__name__)
 
 
-def baseline_std_epoch(epoch_signal: np.ndarray, blinks: List[Dict[str, int]]) -> float:
+def baseline_std_epoch(epoch_signal: np.ndarray, blinks: BlinkInput) -> float:
     """Compute baseline standard deviation for an epoch."""
-    mask = np.ones(len(epoch_signal), dtype=bool)
-    for blink in blinks:
-        mask[int(blink["refined_start_frame"]): int(blink["refined_end_frame"])+1] = False
+    mask = open_eye_mask(len(epoch_signal), blinks)
     open_signal = epoch_signal[mask]
     if open_signal.size < 2:
         return float("nan")
@@ -0,0 +1,284 @@
+"""Eyelid closure events: micropauses, prolonged blinks and closure duration.
+
+Samples at or below ``threshold_ratio`` times the open-eye baseline count as
+closed. Each sample is labelled open, closed, or closed during a blink, and
+the labels of all epochs are run-length encoded in a single pass:
+
+* a **micropause** is a run of closed samples outside every blink lasting
+  between ``min_dur`` and ``max_dur`` seconds;
+* a **closure** is a maximal run of closed samples, with or without blinks;
+  closures that overlap a blink and last longer than ``prolonged_dur``
+  seconds are **prolonged blinks**, a marker of microsleep onset.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .baseline_mean import baseline_mean_epoch
+from ...utils.blink_table import (
+    BlinkInput,
+    BlinkTable,
+    blink_frame_arrays,
+    group_blinks_by_epoch,
+)
+from ...utils.ragged import run_length_encode
+
+logger = logging.getLogger(__name__)
+
+_OPEN, _CLOSED, _CLOSED_IN_BLINK = 0, 1, 2
+
+CLOSURE_EVENT_COLUMNS = ("micropause_count", "prolonged_blink_count", "max_closure_duration")
+
+
+def _closure_states(
+    signals: np.ndarray,
+    lengths: np.ndarray,
+    thresholds: np.ndarray,
+    blink_rows: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+) -> np.ndarray:
+    """Label every sample of every row as open, closed or closed in a blink.
+
+    The returned matrix has one extra open column so that runs never continue
+    from one row into the next once flattened.
+    """
+    n_rows, width = signals.shape
+    # inclusive blink spans clipped to their row
+    row_len = lengths[blink_rows]
+    lo = np.maximum(starts, 0)
+    hi = np.minimum(ends, row_len - 1)
+    keep = lo <= hi
+    delta = np.zeros((n_rows, width + 1), dtype=np.int64)
+    np.add.at(delta, (blink_rows[keep], lo[keep]), 1)
+    np.add.at(delta, (blink_rows[keep], hi[keep] + 1), -1)
+    in_blink = np.cumsum(delta, axis=1) > 0
+
+    closed = np.zeros((n_rows, width + 1), dtype=bool)
+    valid = np.arange(width) < lengths[:, None]
+    with np.errstate(invalid="ignore"):
+        closed[:, :width] = (signals <= thresholds[:, None]) & valid
+    return closed.astype(np.int8) * (1 + in_blink.astype(np.int8))
+
+
+def closure_event_summary(
+    epoch_signals: np.ndarray,
+    signal_lengths: np.ndarray,
+    baselines: np.ndarray,
+    blink_epochs: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    sfreq: float,
+    *,
+    threshold_ratio: float = 0.5,
+    min_dur: float = 0.1,
+    max_dur: float = 0.3,
+    prolonged_dur: float = 0.4,
+) -> Dict[str, np.ndarray]:
+    """Closure events of all epochs from one run-length encoding.
+
+    Parameters
+    ----------
+    epoch_signals : numpy.ndarray
+        ``(n_epochs, n_times)`` eyelid aperture matrix, as stored in
+        :attr:`pyear.utils.blink_table.BlinkTable.epoch_signals`.
+    signal_lengths : numpy.ndarray
+        Number of valid samples in every row.
+    baselines : numpy.ndarray
+        Open-eye baseline of every row; ``NaN`` disables detection.
+    blink_epochs, starts, ends : numpy.ndarray
+        Row and inclusive ``[start, end]`` span of every blink.
+    sfreq : float
+        Sampling frequency in Hertz.
+    threshold_ratio : float, optional
+        Fraction of the baseline at or below which the eye counts as closed,
+        by default ``0.5``.
+    min_dur, max_dur : float, optional
+        Micropause duration range in seconds, by default ``0.1`` to ``0.3``.
+    prolonged_dur : float, optional
+        Closures overlapping a blink and lasting longer than this many
+        seconds are prolonged blinks, by default ``0.4``.
+
+    Returns
+    -------
+    dict of numpy.ndarray
+        Per-row ``micropause_count``, ``prolonged_blink_count`` and
+        ``max_closure_duration`` (seconds, ``0`` without closure and ``NaN``
+        when the baseline is undefined).
+    """
+    signals = np.asarray(epoch_signals, dtype=float)
+    n_rows, width = signals.shape
+    lengths = np.asarray(signal_lengths, dtype=np.int64)
+    baselines = np.asarray(baselines, dtype=float)
+    blink_epochs = np.asarray(blink_epochs, dtype=np.int64)
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    in_rows = (blink_epochs >= 0) & (blink_epochs < n_rows)
+
+    states = _closure_states(
+        signals,
+        lengths,
+        baselines * threshold_ratio,
+        blink_epochs[in_rows],
+        starts[in_rows],
+        ends[in_rows],
+    )
+    run_start, run_len, run_state = run_length_encode(states.ravel())
+    run_row = run_start // (width + 1)
+    run_dur = run_len / sfreq
+
+    pause = run_state == _CLOSED
+    pause &= (run_dur >= min_dur) & (run_dur <= max_dur)
+    micropause_count = np.bincount(run_row[pause], minlength=n_rows)
+
+    # consecutive closed runs (inside and outside blinks) form one closure
+    closed_runs = np.flatnonzero(run_state != _OPEN)
+    first = np.ones(closed_runs.size, dtype=bool)
+    first[1:] = np.diff(closed_runs) > 1
+    bounds = np.flatnonzero(first)
+    prolonged_blink_count = np.zeros(n_rows, dtype=np.int64)
+    max_closure_duration = np.zeros(n_rows)
+    if bounds.size:
+        closure_len = np.add.reduceat(run_len[closed_runs], bounds)
+        closure_blink = np.logical_or.reduceat(
+            run_state[closed_runs] == _CLOSED_IN_BLINK, bounds
+        )
+        closure_row = run_row[closed_runs[bounds]]
+        closure_dur = closure_len / sfreq
+        prolonged = closure_blink & (closure_dur > prolonged_dur)
+        prolonged_blink_count = np.bincount(closure_row[prolonged], minlength=n_rows)
+        np.maximum.at(max_closure_duration, closure_row, closure_dur)
+
+    undefined = np.isnan(baselines) | (lengths == 0)
+    max_closure_duration[undefined] = np.nan
+    return {
+        "micropause_count": micropause_count,
+        "prolonged_blink_count": prolonged_blink_count,
+        "max_closure_duration": max_closure_duration,
+    }
+
+
+def closure_events_epoch(
+    epoch_signal: np.ndarray,
+    blinks: BlinkInput,
+    sfreq: float,
+    threshold_ratio: float = 0.5,
+    min_dur: float = 0.1,
+    max_dur: float = 0.3,
+    prolonged_dur: float = 0.4,
+) -> Dict[str, float]:
+    """Closure events of a single epoch.
+
+    Parameters
+    ----------
+    epoch_signal : numpy.ndarray
+        Eyelid aperture samples for the epoch.
+    blinks : list of dict | BlinkTable
+        Blink annotations with ``refined_start_frame`` and ``refined_end_frame``.
+    sfreq : float
+        Sampling frequency in Hertz.
+    threshold_ratio, min_dur, max_dur, prolonged_dur : float, optional
+        See :func:`closure_event_summary`.
+
+    Returns
+    -------
+    dict
+        ``micropause_count``, ``prolonged_blink_count`` and
+        ``max_closure_duration`` of the epoch.
+    """
+    epoch_signal = np.asarray(epoch_signal, dtype=float).reshape(-1)
+    if not isinstance(blinks, BlinkTable):
+        blinks = list(blinks)
+    starts, _, ends = blink_frame_arrays(blinks)
+    summary = closure_event_summary(
+        epoch_signal[None, :],
+        np.array([epoch_signal.size]),
+        np.array([baseline_mean_epoch(epoch_signal, blinks)]),
+        np.zeros(starts.size, dtype=np.int64),
+        starts,
+        ends,
+        sfreq,
+        threshold_ratio=threshold_ratio,
+        min_dur=min_dur,
+        max_dur=max_dur,
+        prolonged_dur=prolonged_dur,
+    )
+    return {
+        "micropause_count": int(summary["micropause_count"][0]),
+        "prolonged_blink_count": int(summary["prolonged_blink_count"][0]),
+        "max_closure_duration": float(summary["max_closure_duration"][0]),
+    }
+
+
+def aggregate_closure_events(
+    blinks: BlinkInput,
+    sfreq: float,
+    n_epochs: int,
+    *,
+    baselines: Optional[Sequence[float]] = None,
+    threshold_ratio: float = 0.5,
+    min_dur: float = 0.1,
+    max_dur: float = 0.3,
+    prolonged_dur: float = 0.4,
+) -> pd.DataFrame:
+    """Closure events of every epoch in one pass over the recording.
+
+    Parameters
+    ----------
+    blinks : Iterable[dict] | BlinkTable
+        Blink annotations with ``epoch_index`` and ``epoch_signal``.
+    sfreq : float
+        Sampling frequency in Hertz.
+    n_epochs : int
+        Number of epochs to report.
+    baselines : sequence of float, optional
+        Precomputed open-eye baseline of each epoch, e.g. the
+        ``baseline_mean`` feature. Computed with
+        :func:`~pyear.open_eye.features.baseline_mean_epoch` when omitted.
+    threshold_ratio, min_dur, max_dur, prolonged_dur : float, optional
+        See :func:`closure_event_summary`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        DataFrame indexed by epoch with :data:`CLOSURE_EVENT_COLUMNS`. Epochs
+        without a signal have no events and a ``NaN`` closure duration.
+    """
+    table: BlinkTable = group_blinks_by_epoch(blinks, n_epochs)
+    n_rows = min(table.n_signal_epochs, n_epochs)
+    if baselines is None:
+        baselines = [
+            float("nan")
+            if table.epoch_signal(idx) is None
+            else baseline_mean_epoch(table.epoch_signal(idx), table.epoch(idx))
+            for idx in range(n_rows)
+        ]
+    summary = closure_event_summary(
+        table.epoch_signals[:n_rows],
+        table.signal_lengths[:n_rows],
+        np.asarray(baselines, dtype=float)[:n_rows],
+        table.epoch_index,
+        table.refined_start_frame,
+        table.refined_end_frame,
+        sfreq,
+        threshold_ratio=threshold_ratio,
+        min_dur=min_dur,
+        max_dur=max_dur,
+        prolonged_dur=prolonged_dur,
+    )
+    df = pd.DataFrame(
+        {
+            "micropause_count": np.zeros(n_epochs, dtype=np.int64),
+            "prolonged_blink_count": np.zeros(n_epochs, dtype=np.int64),
+            "max_closure_duration": np.full(n_epochs, np.nan),
+        },
+        index=pd.RangeIndex(n_epochs, name="epoch"),
+    )
+    for col in CLOSURE_EVENT_COLUMNS:
+        df.iloc[:n_rows, df.columns.get_loc(col)] = summary[col]
+    logger.debug("Closure events: %d micropauses", int(df["micropause_count"].sum()))
+    return df
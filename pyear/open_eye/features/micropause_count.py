@@ -1,16 +1,18 @@
 """Count of brief partial closures between blinks."""
 from __future__ import annotations
 
-from typing import List, Dict
 import logging
 import numpy as np
 
+from .closure_events import closure_events_epoch
+from ...utils.blink_table import BlinkInput
+
 logger = logging.getLogger(__name__)
 
 
 def micropause_count_epoch(
     epoch_signal: np.ndarray,
-    blinks: List[Dict[str, int]],
+    blinks: BlinkInput,
     sfreq: float,
     threshold_ratio: float = 0.5,
     min_dur: float = 0.1,
@@ -18,11 +20,15 @@ def micropause_count_epoch(
 ) -> int:
     """Count micropause events within an epoch.
 
+    A micropause is a run of samples outside every blink at or below
+    ``threshold_ratio`` times the open-eye baseline. Runs are found with the
+    run-length encoding of :mod:`~pyear.open_eye.features.closure_events`.
+
     Parameters
     ----------
     epoch_signal : numpy.ndarray
         Eyelid aperture samples for the epoch.
-    blinks : list of dict
+    blinks : list of dict | BlinkTable
         Blink annotations with ``refined_start_frame`` and ``refined_end_frame``.
     sfreq : float
         Sampling frequency in Hertz.
@@ -38,37 +44,13 @@ def micropause_count_epoch(
     int
         Number of micropause events detected in the epoch.
     """
-    mask = np.ones(len(epoch_signal), dtype=bool)
-    for blink in blinks:
-        mask[int(blink["refined_start_frame"]): int(blink["refined_end_frame"])+1] = False
-    open_signal = epoch_signal[mask]
-    if open_signal.size == 0:
-        return 0
-    baseline = np.mean(open_signal)
-    threshold = baseline * threshold_ratio
-
-    in_event = False
-    count = 0
-    event_len = 0
-    for i, val in enumerate(epoch_signal):
-        if val <= threshold and not any(
-            blink["refined_start_frame"] <= i <= blink["refined_end_frame"] for blink in blinks
-        ):
-            if not in_event:
-                in_event = True
-                event_len = 1
-            else:
-                event_len += 1
-        else:
-            if in_event:
-                duration = event_len / sfreq
-                if min_dur <= duration <= max_dur:
-                    count += 1
-                in_event = False
-                event_len = 0
-    if in_event:
-        duration = event_len / sfreq
-        if min_dur <= duration <= max_dur:
-            count += 1
+    count = closure_events_epoch(
+        epoch_signal,
+        blinks,
+        sfreq,
+        threshold_ratio=threshold_ratio,
+        min_dur=min_dur,
+        max_dur=max_dur,
+    )["micropause_count"]
     logger.debug("Micropause count: %s", count)
     return count
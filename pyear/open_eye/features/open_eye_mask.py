@@ -0,0 +1,91 @@
+"""Boolean mask of open-eye samples shared by the open-eye features."""
+from __future__ import annotations
+
+import numpy as np
+
+from ...utils.blink_table import BlinkInput, blink_frame_arrays
+
+
+def _slice_bounds(index: np.ndarray, length: np.ndarray) -> np.ndarray:
+    """Normalise slice bounds like :meth:`slice.indices` does."""
+    return np.where(index < 0, np.maximum(index + length, 0), np.minimum(index, length))
+
+
+def open_eye_masks(
+    signal_lengths: np.ndarray,
+    n_times: int,
+    blink_epochs: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+) -> np.ndarray:
+    """Return the open-eye masks of many epochs at once.
+
+    Blink intervals are marked with a difference array and a cumulative sum
+    along each row, so the cost does not depend on the number of blinks per
+    epoch.
+
+    Parameters
+    ----------
+    signal_lengths : numpy.ndarray
+        Number of valid samples in every epoch.
+    n_times : int
+        Width of the returned matrix.
+    blink_epochs : numpy.ndarray
+        Epoch (row) of every blink. Blinks outside ``[0, n_epochs)`` are
+        ignored.
+    starts, ends : numpy.ndarray
+        Inclusive ``[start, end]`` sample span of every blink. Spans are
+        interpreted like the slice ``mask[start : end + 1]``, so negative
+        indices count from the end of the epoch.
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean ``(n_epochs, n_times)`` matrix that is ``True`` for valid
+        samples outside every blink.
+    """
+    lengths = np.asarray(signal_lengths, dtype=np.int64).reshape(-1)
+    n_rows = lengths.size
+    blink_epochs = np.asarray(blink_epochs, dtype=np.int64)
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+
+    in_rows = (blink_epochs >= 0) & (blink_epochs < n_rows)
+    rows = blink_epochs[in_rows]
+    row_len = lengths[rows]
+    lo = _slice_bounds(starts[in_rows], row_len)
+    hi = _slice_bounds(ends[in_rows] + 1, row_len)
+    keep = lo < hi
+
+    delta = np.zeros((n_rows, n_times + 1), dtype=np.int64)
+    np.add.at(delta, (rows[keep], lo[keep]), 1)
+    np.add.at(delta, (rows[keep], hi[keep]), -1)
+    in_blink = np.cumsum(delta[:, :n_times], axis=1) > 0
+    valid = np.arange(n_times) < lengths[:, None]
+    return valid & ~in_blink
+
+
+def open_eye_mask(n_samples: int, blinks: BlinkInput) -> np.ndarray:
+    """Return a mask that is ``True`` outside every blink interval.
+
+    Parameters
+    ----------
+    n_samples : int
+        Number of samples in the epoch signal.
+    blinks : list of dict | BlinkTable
+        Blink annotations with ``refined_start_frame`` and ``refined_end_frame``.
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean array of length ``n_samples``; blink samples
+        ``[start, end]`` (inclusive) are ``False``.
+    """
+    starts, _, ends = blink_frame_arrays(blinks)
+    return open_eye_masks(
+        np.array([n_samples]),
+        n_samples,
+        np.zeros(starts.size, dtype=np.int64),
+        starts,
+        ends,
+    )[0]
@@ -0,0 +1,141 @@
+"""All open-eye statistics of a recording in one pass.
+
+The per-epoch feature functions each rebuild the open-eye mask and extract
+the open samples again. :func:`open_eye_summary` instead marks the blink
+intervals of every epoch at once with :func:`~.open_eye_mask.open_eye_masks`,
+packs the open samples of each epoch to the left of a 2-D
+``(n_epochs, n_times)`` matrix and reduces that matrix along its rows. The
+results equal those of :func:`~.baseline_mean.baseline_mean_epoch`,
+:func:`~.baseline_drift.baseline_drift_epoch`,
+:func:`~.baseline_std.baseline_std_epoch`,
+:func:`~.baseline_mad.baseline_mad_epoch`, :func:`~.perclos.perclos_epoch`,
+:func:`~.eye_opening_rms.eye_opening_rms_epoch` and
+:func:`~.zero_crossing_rate.zero_crossing_rate_epoch` up to floating point
+rounding.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Dict
+
+import numpy as np
+
+from .open_eye_mask import open_eye_masks
+
+logger = logging.getLogger(__name__)
+
+OPEN_EYE_COLUMNS = (
+    "baseline_mean",
+    "baseline_drift",
+    "baseline_std",
+    "baseline_mad",
+    "perclos",
+    "eye_opening_rms",
+    "zero_crossing_rate",
+)
+
+
+def _row_median(packed: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Median of the first ``counts[i]`` values of every row."""
+    ordered = np.sort(packed, axis=1)
+    rows = np.arange(packed.shape[0])
+    lo = np.maximum((counts - 1) // 2, 0)
+    hi = np.maximum(counts // 2, 0)
+    with np.errstate(invalid="ignore"):
+        return (ordered[rows, lo] + ordered[rows, hi]) / 2
+
+
+def open_eye_summary(
+    epoch_signals: np.ndarray,
+    signal_lengths: np.ndarray,
+    blink_epochs: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    sfreq: float,
+    *,
+    perclos_ratio: float = 0.8,
+) -> Dict[str, np.ndarray]:
+    """Open-eye statistics of all epochs from one mask.
+
+    Parameters
+    ----------
+    epoch_signals : numpy.ndarray
+        ``(n_epochs, n_times)`` eyelid aperture matrix, as stored in
+        :attr:`pyear.utils.blink_table.BlinkTable.epoch_signals`.
+    signal_lengths : numpy.ndarray
+        Number of valid samples in every row.
+    blink_epochs, starts, ends : numpy.ndarray
+        Row and inclusive ``[start, end]`` span of every blink.
+    sfreq : float
+        Sampling frequency in Hertz.
+    perclos_ratio : float, optional
+        ``threshold_ratio`` of :func:`~.perclos.perclos_epoch`, by default
+        ``0.8``.
+
+    Returns
+    -------
+    dict of numpy.ndarray
+        Per-row values of :data:`OPEN_EYE_COLUMNS`. Statistics that need more
+        open samples than a row has are ``NaN``.
+    """
+    signals = np.asarray(epoch_signals, dtype=float)
+    n_rows, width = signals.shape
+    lengths = np.asarray(signal_lengths, dtype=np.int64)
+    mask = open_eye_masks(lengths, width, blink_epochs, starts, ends)
+    counts = mask.sum(axis=1)
+
+    # open samples of each row moved to its front, in their original order
+    rank = np.cumsum(mask, axis=1) - 1
+    row_of = np.broadcast_to(np.arange(n_rows)[:, None], mask.shape)
+    packed = np.full((n_rows, width), np.nan)
+    packed[row_of[mask], rank[mask]] = signals[mask]
+    filled = np.arange(width) < counts[:, None]
+    zeroed = np.where(filled, packed, 0.0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = zeroed.sum(axis=1) / counts
+        centred = np.where(filled, packed - mean[:, None], 0.0)
+        sum_sq = np.square(centred).sum(axis=1)
+        std = np.sqrt(sum_sq / (counts - 1))
+        rms = np.sqrt(np.square(zeroed).sum(axis=1) / counts)
+
+        # least-squares slope against the time of each open sample
+        n = counts.astype(float)
+        times = (np.arange(width) - (n[:, None] - 1) / 2) / sfreq
+        s_tt = (n**3 - n) / 12 / sfreq**2
+        drift = (np.where(filled, times, 0.0) * centred).sum(axis=1) / s_tt
+
+        closed = (signals <= (mean * (1 - perclos_ratio))[:, None]) & (
+            np.arange(width) < lengths[:, None]
+        )
+        perclos = closed.sum(axis=1) / lengths
+
+    has_nan = np.isnan(zeroed).any(axis=1)
+    median = _row_median(packed, counts)
+    mad = _row_median(np.where(filled, np.abs(packed - median[:, None]), np.nan), counts)
+    mad[has_nan] = np.nan
+
+    signs = np.signbit(np.diff(packed, axis=1))
+    changes = signs[:, 1:] != signs[:, :-1]
+    changes &= np.arange(max(width - 2, 0)) < (counts - 2)[:, None]
+    zero_crossing_rate = changes.sum(axis=1).astype(float)
+
+    none_open = counts == 0
+    too_few = counts < 2
+    mean[none_open] = np.nan
+    rms[none_open] = np.nan
+    mad[none_open] = np.nan
+    perclos[none_open] = np.nan
+    std[too_few] = np.nan
+    drift[too_few] = np.nan
+    zero_crossing_rate[too_few] = np.nan
+    logger.debug("Open-eye statistics for %d epochs", n_rows)
+    return {
+        "baseline_mean": mean,
+        "baseline_drift": drift,
+        "baseline_std": std,
+        "baseline_mad": mad,
+        "perclos": perclos,
+        "eye_opening_rms": rms,
+        "zero_crossing_rate": zero_crossing_rate,
+    }
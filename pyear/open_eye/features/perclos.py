@@ -6,21 +6,23 @@ closed.
 """
 from __future__ import annotations
 
-from typing import List, Dict
 import logging
 import numpy as np
 
+from .open_eye_mask import open_eye_mask
+from ...utils.blink_table import BlinkInput
+
 logger = logging.getLogger(__name__)
 
 
-def perclos_epoch(epoch_signal: np.ndarray, blinks: List[Dict[str, int]], threshold_ratio: float = 0.8) -> float:
+def perclos_epoch(epoch_signal: np.ndarray, blinks: BlinkInput, threshold_ratio: float = 0.8) -> float:
     """Compute the PERCLOS metric for one epoch.
 
     Parameters
     ----------
     epoch_signal : numpy.ndarray
         Eyelid aperture samples for the epoch.
-    blinks : list of dict
+    blinks : list of dict | BlinkTable
         Blink annotations for the epoch.
     threshold_ratio : float, optional
         Fraction of the open-eye baseline used as the closure threshold,
@@ -31,9 +33,7 @@ def perclos_epoch(epoch_signal: np.ndarray, blinks: List[Dict[str, int]], thresh
     float
         Percentage of samples below the closure threshold.
     """
-    mask = np.ones(len(epoch_signal), dtype=bool)
-    for blink in blinks:
-        mask[int(blink["refined_start_frame"]): int(blink["refined_end_frame"])+1] = False
+    mask = open_eye_mask(len(epoch_signal), blinks)
     open_signal = epoch_signal[mask]
     if open_signal.size == 0:
         return float("nan")
@@ -1,18 +1,18 @@
 """Zero-crossing rate of the eyelid velocity."""
 from __future__ import annotations
 
-from typing import List, Dict
 import logging
 import numpy as np
 
+from .open_eye_mask import open_eye_mask
+from ...utils.blink_table import BlinkInput
+
 logger = logging.getLogger(__name__)
 
 
-def zero_crossing_rate_epoch(epoch_signal: np.ndarray, blinks: List[Dict[str, int]]) -> float:
+def zero_crossing_rate_epoch(epoch_signal: np.ndarray, blinks: BlinkInput) -> float:
     """Count zero crossings of first derivative during open-eye periods."""
-    mask = np.ones(len(epoch_signal), dtype=bool)
-    for blink in blinks:
-        mask[int(blink["refined_start_frame"]): int(blink["refined_end_frame"])+1] = False
+    mask = open_eye_mask(len(epoch_signal), blinks)
     open_signal = epoch_signal[mask]
     if open_signal.size < 2:
         return float("nan")
@@ -2,9 +2,15 @@
 
 from __future__ import annotations
 
+import gc
 import logging
-from typing import Iterable, Dict, Sequence, Optional
+import os
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import partial
+from multiprocessing import shared_memory
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
 import pandas as pd
 import mne
 
@@ -20,31 +26,223 @@ from .ear_metrics import aggregate_ear_features
 from .waveform_features import aggregate_waveform_features
 from .frequency_domain import aggregate_frequency_domain_features
 from .blink_events.classification import aggregate_classification_features
+from .utils.blink_table import BlinkInput, BlinkTable, group_blinks_by_epoch
 
 # Configure root logger
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_EVENT_KEYS = ["blink_count", "blink_rate", "ibi"]
+
+# Blink-based feature groups in the column order of the output frame
+_GROUPS: List[Tuple[str, Callable[..., pd.DataFrame]]] = [
+    ("ear", aggregate_ear_features),
+    ("classification", aggregate_classification_features),
+    ("kinematics", aggregate_kinematic_features),
+    ("energy", aggregate_energy_complexity_features),
+    ("open_eye", aggregate_open_eye_features),
+    ("frequency", aggregate_frequency_domain_features),
+    ("waveform", aggregate_waveform_features),
+    ("morphology", aggregate_morphology_features),
+]
+
+# Groups that differentiate blink segments and accept ``edge_consistent``
+_DERIVATIVE_GROUPS = {"kinematics", "energy", "waveform"}
+
+
+def _run_derivative_groups(
+    funcs: Sequence[Callable[..., pd.DataFrame]], blinks: BlinkTable, *args: Any
+) -> List[pd.DataFrame]:
+    """Run derivative-based groups one after another on the same table.
+
+    Running them as one task lets them slice the single derivative cache of
+    ``blinks`` even when every task runs in its own worker process.
+    """
+    return [func(blinks, *args) for func in funcs]
+
+
+def _shared_table_task(
+    func: Callable[..., pd.DataFrame],
+    shm_name: str,
+    shape: Tuple[int, int],
+    signal_lengths: np.ndarray,
+    table: BlinkTable,
+    *args: Any,
+) -> pd.DataFrame:
+    """Run ``func`` on ``table`` with its epoch matrix read from a shared block.
+
+    The table is built on a read-only view of the block, so no worker holds a
+    private copy of the signals. The aggregators return fresh frames, hence
+    nothing refers to the block once ``func`` has returned.
+    """
+    # workers report to the parent's resource tracker, so attaching is safe
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        view = np.ndarray(shape, dtype=float, buffer=shm.buf)
+        view.flags.writeable = False
+        full = BlinkTable(
+            table.epoch_index,
+            table.refined_start_frame,
+            table.refined_peak_frame,
+            table.refined_end_frame,
+            view,
+            signal_lengths=signal_lengths,
+        )
+        full._grouping = table._grouping
+        result = func(full, *args)
+        del full, view
+        return result
+    finally:
+        try:
+            shm.close()
+        except BufferError:
+            # a view kept alive by a reference cycle; collect it and retry
+            gc.collect()
+            shm.close()
+
+
+def _submit_tasks(
+    pool: Executor,
+    tasks: List[Tuple[str, Callable[..., pd.DataFrame], tuple]],
+    share_signals: bool,
+) -> List[pd.DataFrame]:
+    """Submit ``tasks`` to ``pool`` and return their frames in task order.
+
+    With ``share_signals`` the epoch matrix of the blink table is copied once
+    into a :class:`multiprocessing.shared_memory.SharedMemory` block. Every
+    task attaches to it by name and computes on a view of it, so only the
+    blink frame arrays are pickled and the matrix is held in memory twice
+    (the caller's table and the block) however many workers run.
+    """
+    table = next(
+        (args[0] for _name, _func, args in tasks if args and isinstance(args[0], BlinkTable)),
+        None,
+    )
+    if not share_signals or table is None or table.epoch_signals.size == 0:
+        futures = [pool.submit(func, *args) for _name, func, args in tasks]
+        return [future.result() for future in futures]
+
+    signals = table.epoch_signals
+    shm = shared_memory.SharedMemory(create=True, size=signals.nbytes)
+    futures: List[Future] = []
+    try:
+        packed = np.ndarray(signals.shape, dtype=float, buffer=shm.buf)
+        packed[:] = signals
+        del packed
+
+        stripped = BlinkTable(
+            table.epoch_index,
+            table.refined_start_frame,
+            table.refined_peak_frame,
+            table.refined_end_frame,
+        )
+        stripped._grouping = table._grouping
+        for _name, func, args in tasks:
+            if args and args[0] is table:
+                futures.append(
+                    pool.submit(
+                        _shared_table_task,
+                        func,
+                        shm.name,
+                        signals.shape,
+                        table.signal_lengths,
+                        stripped,
+                        *args[1:],
+                    )
+                )
+            else:
+                futures.append(pool.submit(func, *args))
+        return [future.result() for future in futures]
+    finally:
+        # the block must outlive every task that may still attach to it
+        for future in futures:
+            future.cancel()
+        wait(futures)
+        shm.close()
+        shm.unlink()
+
+
+def _run_tasks(
+    tasks: List[Tuple[str, Callable[..., pd.DataFrame], tuple]],
+    n_jobs: Optional[int] = None,
+    executor: Union[str, Executor, None] = None,
+) -> List[pd.DataFrame]:
+    """Run feature-group tasks and return their frames in task order.
+
+    Parameters
+    ----------
+    tasks : list of tuple
+        ``(name, func, args)`` entries; each ``func(*args)`` returns a frame.
+    n_jobs : int | None, optional
+        Number of workers. ``None`` or ``1`` runs the tasks sequentially
+        unless ``executor`` is an :class:`~concurrent.futures.Executor`;
+        ``-1`` uses all available cores.
+    executor : {"thread", "process"} | concurrent.futures.Executor | None, optional
+        Pool used when running in parallel. Strings create a temporary pool
+        with ``n_jobs`` workers, ``None`` defaults to ``"process"``. A caller
+        supplied executor is used as is and not shut down. Process pools,
+        including a caller supplied
+        :class:`~concurrent.futures.ProcessPoolExecutor`, compute on views
+        of one shared-memory copy of the epoch matrix.
+
+    Returns
+    -------
+    list of pandas.DataFrame
+        One frame per task, in the order of ``tasks``.
+    """
+    if n_jobs == 0:
+        raise ValueError("n_jobs must be a positive integer, -1 or None, got 0")
+    if isinstance(executor, Executor):
+        return _submit_tasks(executor, tasks, isinstance(executor, ProcessPoolExecutor))
+
+    if n_jobs is not None and n_jobs < 0:
+        n_jobs = os.cpu_count() or 1
+    if n_jobs is None or n_jobs == 1 or len(tasks) < 2:
+        results = []
+        for name, func, args in tasks:
+            logger.debug("Computing feature group %s", name)
+            results.append(func(*args))
+        return results
+
+    kind = executor or "process"
+    if kind == "thread":
+        pool_cls = ThreadPoolExecutor
+    elif kind == "process":
+        pool_cls = ProcessPoolExecutor
+    else:
+        raise ValueError(f"Unknown executor: {executor!r}")
+
+    workers = min(n_jobs, len(tasks))
+    logger.info("Computing %d feature groups with %d %s workers", len(tasks), workers, kind)
+    with pool_cls(max_workers=workers) as pool:
+        return _submit_tasks(pool, tasks, kind == "process")
+
 
 def extract_features(
-    blinks: Iterable[Dict[str, int]],
+    blinks: BlinkInput,
     sfreq: float,
     epoch_len: float,
     n_epochs: int,
     features: Sequence[str] | None = None,
     raw_segments: Optional[Sequence[mne.io.BaseRaw]] = None,
+    n_jobs: Optional[int] = None,
+    executor: Union[str, Executor, None] = None,
+    edge_consistent: bool = True,
 ) -> pd.DataFrame:
     """Extract blink features using provided blink annotations.
 
     Parameters
     ----------
-    blinks : Iterable[Dict[str, int]]
+    blinks : Iterable[Dict[str, int]] | BlinkTable
         Blink annotations for each detected blink. Each record must contain
         ``epoch_index`` (``int``), ``epoch_signal`` (1D array),
         ``refined_start_frame`` (``int``), ``refined_peak_frame`` (``int``),
         and ``refined_end_frame`` (``int``). These fields match the format
         used throughout the feature modules and specify the blink location
-        relative to its epoch.
+        relative to its epoch. A :class:`~pyear.utils.blink_table.BlinkTable`
+        holding the same columns may be passed instead. Records are converted
+        to a table and grouped by epoch once, and that grouping is shared by
+        every feature group, so ``blinks`` may also be a one-shot generator.
     sfreq : float
         Sampling frequency of the recording.
     epoch_len : float
@@ -54,12 +252,34 @@ def extract_features(
     features : Sequence[str] | None, optional
         Feature groups to compute. Values from
         :func:`aggregate_blink_event_features` (``"blink_count"``, ``"blink_rate"``,
-        ``"ibi"``), ``"morphology``, ``"kinematics``, ``"energy``, ``"open_eye``,
-        ``"ear"``, ``"waveform`` and ``"classification"`` are recognized. ``None`` computes all
+        ``"ibi"``), ``"blink_interval_dist"``, ``"morphology"``, ``"kinematics"``,
+        ``"energy"``, ``"open_eye"``, ``"ear"``, ``"frequency"``, ``"waveform"``
+        and ``"classification"`` are recognized. ``None`` computes all
         available features.
     raw_segments : Sequence[mne.io.BaseRaw] | None, optional
         Collection of 30-second raw segments with annotations. Required when
         ``"blink_interval_dist"`` is among ``features``.
+    n_jobs : int | None, optional
+        Number of feature groups computed concurrently. ``None`` (default)
+        or ``1`` computes them one after another and ``-1`` uses all cores.
+    executor : {"thread", "process"} | concurrent.futures.Executor | None, optional
+        Pool type used when ``n_jobs`` is greater than one (processes by
+        default), or an existing executor to submit the feature groups to.
+        The aggregators loop over epochs and blinks in Python and hold the
+        GIL, so threads only overlap the numpy-heavy groups such as
+        ``"frequency"``. Process pools compute on views of one shared-memory
+        copy of the epoch matrix, so worker memory does not grow with a
+        private copy of the signals per feature group; only the blink frame
+        arrays are pickled.
+    edge_consistent : bool, optional
+        Forwarded to the ``"kinematics"``, ``"energy"`` and ``"waveform"``
+        groups. ``True`` (default) differentiates every blink segment as if
+        isolated, which reproduces the per-segment numbers but is not faster.
+        ``False`` slices the derivatives of the whole epoch signals, which
+        skips the per-blink differentiation. See
+        :class:`~pyear.utils.derivatives.DerivativeCache`. These three groups
+        run as one task, so they share one derivative cache of the recording
+        under every executor; a cache is never shared between processes.
 
     Returns
     -------
@@ -67,54 +287,73 @@ def extract_features(
         DataFrame with aggregated features per epoch.
     """
     logger.info("Starting feature extraction")
+    blinks = group_blinks_by_epoch(blinks, n_epochs)
 
-    df_events = aggregate_blink_event_features(
-        blinks, sfreq, epoch_len, n_epochs, features
-    )
+    if features is not None:
+        features = list(features)
+        valid = set(_EVENT_KEYS) | {"blink_interval_dist"} | {name for name, _ in _GROUPS}
+        invalid = set(features) - valid
+        if invalid:
+            raise ValueError(f"Unknown feature keys: {sorted(invalid)}")
+
+    event_keys = _EVENT_KEYS if features is None else [k for k in features if k in _EVENT_KEYS]
+    tasks: List[Tuple[str, Callable[..., pd.DataFrame], tuple]] = []
+    if event_keys:
+        tasks.append(
+            (
+                "events",
+                aggregate_blink_event_features,
+                (blinks, sfreq, epoch_len, n_epochs, event_keys),
+            )
+        )
 
     if features is None or "blink_interval_dist" in features:
         if raw_segments is None:
             raise ValueError(
                 "raw_segments must be provided when blink_interval_dist is requested"
             )
-        df_interval = aggregate_blink_interval_distribution(raw_segments, blink_label=None)
-        df_events = pd.concat([df_events, df_interval], axis=1)
-
-    if features is None or "ear" in features:
-        df_ear = aggregate_ear_features(blinks, sfreq, n_epochs)
-        df_events = pd.concat([df_events, df_ear], axis=1)
-
-    if features is None or "classification" in features:
-        df_cls = aggregate_classification_features(
-            blinks, sfreq, epoch_len, n_epochs
+        tasks.append(
+            (
+                "blink_interval_dist",
+                partial(aggregate_blink_interval_distribution, blink_label=None),
+                (raw_segments,),
+            )
         )
-        df_events = pd.concat([df_events, df_cls], axis=1)
-
-    if features is None or "kinematics" in features:
-        df_kin = aggregate_kinematic_features(blinks, sfreq, n_epochs)
-        df_events = pd.concat([df_events, df_kin], axis=1)
-
-    if features is None or "energy" in features:
-        df_energy = aggregate_energy_complexity_features(blinks, sfreq, n_epochs)
-        df_events = pd.concat([df_events, df_energy], axis=1)
-
-    if features is None or "open_eye" in features:
-        df_open = aggregate_open_eye_features(blinks, sfreq, n_epochs)
-        df_events = pd.concat([df_events, df_open], axis=1)
-
-    if features is None or "frequency" in features:
-        df_freq = aggregate_frequency_domain_features(blinks, sfreq, n_epochs)
-        df_events = pd.concat([df_events, df_freq], axis=1)
 
-    if features is None or "waveform" in features:
-        df_wave = aggregate_waveform_features(blinks, sfreq, n_epochs)
-        df_events = pd.concat([df_events, df_wave], axis=1)
+    # frame positions: (task, index within a derivative task or None)
+    layout: List[Tuple[int, Optional[int]]] = [(i, None) for i in range(len(tasks))]
+    derivative_funcs: List[Callable[..., pd.DataFrame]] = []
+    derivative_task = -1
+    for name, func in _GROUPS:
+        if features is None or name in features:
+            if name in _DERIVATIVE_GROUPS:
+                if derivative_task < 0:
+                    derivative_task = len(tasks)
+                    tasks.append(
+                        (
+                            "derivatives",
+                            partial(_run_derivative_groups, derivative_funcs),
+                            (blinks, sfreq, n_epochs),
+                        )
+                    )
+                layout.append((derivative_task, len(derivative_funcs)))
+                derivative_funcs.append(partial(func, edge_consistent=edge_consistent))
+                continue
+            if name == "classification":
+                args = (blinks, sfreq, epoch_len, n_epochs)
+            else:
+                args = (blinks, sfreq, n_epochs)
+            layout.append((len(tasks), None))
+            tasks.append((name, func, args))
 
-    if features is None or "morphology" in features:
-        df_morph = aggregate_morphology_features(blinks, sfreq, n_epochs)
-        df = pd.concat([df_events, df_morph], axis=1)
+    results = _run_tasks(tasks, n_jobs=n_jobs, executor=executor)
+    frames = [
+        results[task] if part is None else results[task][part] for task, part in layout
+    ]
+    if not frames:
+        df = pd.DataFrame(index=pd.RangeIndex(n_epochs, name="epoch"))
     else:
-        df = df_events
+        df = pd.concat(frames, axis=1)
 
     logger.info("Finished feature extraction")
     return df
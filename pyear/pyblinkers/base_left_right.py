@@ -1,8 +1,8 @@
 import numpy as np
-from pyear.pyblinkers.zero_crossing import (
-    max_pos_vel_frame,
-    get_left_base,
-    get_right_base,
+from pyear.pyblinkers.blink_landmarks import (
+    left_base_frames,
+    max_vel_frames,
+    right_base_frames,
 )
 
 
@@ -41,6 +41,16 @@ def create_left_right_base(candidate_signal, df):
         - 'right_base' (float): The calculated right base value for the blink event,
           derived from the blink velocity and the specified outer end index.
         Rows with NaN values in any of these new columns are dropped from the DataFrame.
+
+    Raises
+    ------
+    ValueError
+        If no blink is left after dropping incomplete rows.
+
+    Notes
+    -----
+    All landmarks are computed for every blink at once with the array helpers
+    of :mod:`pyear.pyblinkers.blink_landmarks`.
     """
 
     # Ensure df is a fresh copy to prevent SettingWithCopyWarning
@@ -51,48 +61,41 @@ def create_left_right_base(candidate_signal, df):
 
     # Remove rows with NaNs so we don't pass invalid candidate_signal to our calculations
     df.dropna(inplace=True)
+    _require_blinks(df)
 
-    # Calculate maxPosVelFrame and maxNegVelFrame safely
-    df[["max_pos_vel_frame", "max_neg_vel_frame"]] = df.apply(
-        lambda row: max_pos_vel_frame(
-            blink_velocity=blink_velocity,
-            max_blink=row["max_blink"],
-            left_zero=row["left_zero"],
-            right_zero=row["right_zero"],
-        ),
-        axis=1,
-        result_type="expand",
+    # Calculate maxPosVelFrame and maxNegVelFrame for all blinks at once
+    df["max_pos_vel_frame"], df["max_neg_vel_frame"] = max_vel_frames(
+        blink_velocity,
+        df["max_blink"].to_numpy(),
+        df["left_zero"].to_numpy(),
+        df["right_zero"].to_numpy(),
     )
 
     # Ensure df is a new variable after filtering
     df = df[df["outer_start"] < df["max_pos_vel_frame"]].copy()
+    _require_blinks(df)
 
-    # Compute leftBase safely using .assign()
-    df = df.assign(
-        left_base=df.apply(
-            lambda row: get_left_base(
-                blink_velocity=blink_velocity,
-                left_outer=row["outer_start"],
-                max_pos_vel_frame=row["max_pos_vel_frame"],
-            ),
-            axis=1,
-        )
+    df["left_base"] = left_base_frames(
+        blink_velocity,
+        df["outer_start"].to_numpy(),
+        df["max_pos_vel_frame"].to_numpy(),
     )
 
     # Drop rows with NaNs again if any were introduced
     df.dropna(inplace=True)
+    _require_blinks(df)
 
-    # Compute rightBase safely using .assign()
-    df = df.assign(
-        right_base=df.apply(
-            lambda row: get_right_base(
-                candidate_signal=candidate_signal,
-                blink_velocity=blink_velocity,
-                right_outer=row["outer_end"],
-                max_neg_vel_frame=row["max_neg_vel_frame"],
-            ),
-            axis=1,
-        )
+    df["right_base"] = right_base_frames(
+        candidate_signal,
+        blink_velocity,
+        df["outer_end"].to_numpy(),
+        df["max_neg_vel_frame"].to_numpy(),
     )
 
     return df
+
+
+def _require_blinks(df):
+    """Raise ``ValueError`` when every blink has been dropped."""
+    if df.empty:
+        raise ValueError("No blinks left to compute the left and right base")
@@ -0,0 +1,436 @@
+"""Array versions of the per-blink landmark helpers used by :class:`FitBlinks`.
+
+Each function below computes one of the landmarks of
+:mod:`pyear.pyblinkers.zero_crossing` (``get_max_blink``, ``max_pos_vel_frame``,
+``get_left_base``, ``get_right_base``, ``get_half_height`` and
+``compute_fit_range``) for every blink of a signal at once. Windows are
+gathered in bounded batches with :func:`pyear.utils.ragged.ragged_indices`
+and reduced with segmented argmax/first-crossing searches; the base searches
+use :func:`numpy.searchsorted` on the indices where the velocity changes sign.
+
+Results match the scalar helpers value for value, including their
+``argmax`` convention of returning the window start when no sample crosses
+the threshold. Inputs that make the scalar helpers fail (empty or
+out-of-bounds windows) raise a ``ValueError`` naming the first failing blink
+window.
+"""
+from __future__ import annotations
+
+import warnings
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pyear.utils.ragged import (
+    ragged_indices,
+    segment_argmax,
+    segment_argmin,
+    segment_first_true,
+    segment_last_true,
+)
+
+
+# upper bound on the number of samples gathered at once
+_BATCH_SAMPLES = 1 << 22
+# windows longer than this are reduced on a slice instead of being gathered
+_LONG_WINDOW = 1 << 12
+
+
+def _window_error(
+    reason: str,
+    bad: np.ndarray,
+    starts: np.ndarray,
+    stops: np.ndarray,
+    n_samples: int,
+    rows: Optional[np.ndarray] = None,
+) -> ValueError:
+    """Describe the first blink window flagged in ``bad``.
+
+    ``rows`` maps window positions to the blink rows reported in the message
+    when the windows are a subset of the blinks.
+    """
+    failing = np.flatnonzero(bad)
+    i = int(failing[0])
+    row = i if rows is None else int(rows[i])
+    more = f" ({failing.size} blinks affected)" if failing.size > 1 else ""
+    return ValueError(
+        f"Blink {row}: {reason} [{int(starts[i])}, {int(stops[i])}] "
+        f"of a signal with {n_samples} samples{more}"
+    )
+
+
+def _map_windows(
+    values: np.ndarray,
+    starts: np.ndarray,
+    stops: np.ndarray,
+    reducer: Tuple[Callable[..., np.ndarray], Callable[..., int]],
+    *per_window: np.ndarray,
+    rows: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Reduce every inclusive window ``[starts[i], stops[i]]`` of ``values``.
+
+    ``reducer`` is a ``(batched, single)`` pair. Short windows are gathered
+    in batches of at most ``_BATCH_SAMPLES`` samples and passed to
+    ``batched(window_values, offsets, *per_window_batch)``, which returns one
+    value per window. Long windows are passed one at a time as a slice to
+    ``single(window, *per_window_values)``, so that no index array is built
+    for them. Negative starts wrap around like the ``np.arange`` index arrays
+    of the scalar helpers. ``rows`` are the blink rows named in errors.
+    """
+    batched, single = reducer
+    n_samples = values.size
+    starts = np.asarray(starts, dtype=np.int64)
+    stops = np.asarray(stops, dtype=np.int64)
+    lengths = stops - starts + 1
+    empty = lengths <= 0
+    if np.any(empty):
+        raise _window_error("empty window", empty, starts, stops, n_samples, rows)
+    outside = (stops >= n_samples) | (starts < -n_samples)
+    if np.any(outside):
+        raise _window_error(
+            "window out of bounds", outside, starts, stops, n_samples, rows
+        )
+
+    result = np.zeros(starts.size, dtype=np.int64)
+    long_windows = (lengths > _LONG_WINDOW) & (starts >= 0)
+    for i in np.flatnonzero(long_windows):
+        window = values[starts[i] : starts[i] + lengths[i]]
+        result[i] = single(window, *(arg[i] for arg in per_window))
+
+    short = np.flatnonzero(~long_windows)
+    ends = np.cumsum(lengths[short])
+    first = 0
+    while first < short.size:
+        done = ends[first - 1] if first else 0
+        last = max(int(np.searchsorted(ends, done + _BATCH_SAMPLES, side="right")), first + 1)
+        batch = short[first:last]
+        flat, offsets = ragged_indices(starts[batch], lengths[batch])
+        result[batch] = batched(values[flat], offsets, *(arg[batch] for arg in per_window))
+        first = last
+    return result
+
+
+def _first_true(mask: np.ndarray) -> int:
+    """First ``True`` of ``mask``, or ``-1`` if none."""
+    idx = int(np.argmax(mask))
+    return idx if mask[idx] else -1
+
+
+def _last_true(mask: np.ndarray) -> int:
+    """Last ``True`` of ``mask``, or ``-1`` if none."""
+    idx = _first_true(mask[::-1])
+    return mask.size - 1 - idx if idx >= 0 else -1
+
+
+def _first_true_or_zero(mask: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """First ``True`` per window, ``0`` if none (``np.argmax`` rule)."""
+    return np.maximum(segment_first_true(mask, offsets), 0)
+
+
+def _thresholded(compare, locate):
+    """Reducer pair locating the samples where ``compare(window, threshold)``."""
+    batched_locate, single_locate = locate
+
+    def batched(values, offsets, threshold):
+        return batched_locate(compare(values, np.repeat(threshold, np.diff(offsets))), offsets)
+
+    def single(window, threshold):
+        return single_locate(compare(window, threshold))
+
+    return batched, single
+
+
+_ARGMAX = (segment_argmax, np.argmax)
+_ARGMIN = (segment_argmin, np.argmin)
+_FIRST_AT_LEAST = _thresholded(np.greater_equal, (_first_true_or_zero, np.argmax))
+_FIRST_AT_MOST = _thresholded(np.less_equal, (_first_true_or_zero, np.argmax))
+_FIRST_BELOW = _thresholded(np.less, (_first_true_or_zero, np.argmax))
+_LAST_BELOW = _thresholded(np.less, (segment_last_true, _last_true))
+_FIRST_ABOVE = _thresholded(np.greater, (segment_first_true, _first_true))
+_LAST_ABOVE = _thresholded(np.greater, (segment_last_true, _last_true))
+
+
+def max_blink_frames(
+    candidate_signal: np.ndarray, start_blink: np.ndarray, end_blink: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Maximum value and its frame within every ``[start_blink, end_blink]``.
+
+    Parameters
+    ----------
+    candidate_signal : numpy.ndarray
+        1D blink signal.
+    start_blink, end_blink : numpy.ndarray
+        Inclusive blink bounds. Ends past the signal are clipped.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        ``(max_value, max_blink)``.
+    """
+    starts = np.asarray(start_blink, dtype=np.int64)
+    ends = np.minimum(np.asarray(end_blink, dtype=np.int64), candidate_signal.size - 1)
+    max_blink = starts + _map_windows(candidate_signal, starts, ends, _ARGMAX)
+    return candidate_signal[max_blink], max_blink
+
+
+def max_vel_frames(
+    blink_velocity: np.ndarray,
+    max_blink: np.ndarray,
+    left_zero: np.ndarray,
+    right_zero: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Frames of maximum positive and negative velocity for every blink.
+
+    Array form of :func:`pyear.pyblinkers.zero_crossing.max_pos_vel_frame`.
+    The up-stroke is ``[left_zero, max_blink]`` and the down-stroke
+    ``[max_blink, right_zero]``.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        ``(max_pos_vel_frame, max_neg_vel_frame)``. Both are float with
+        ``NaN`` for blinks whose down-stroke is empty, otherwise int64.
+    """
+    m_frame = np.asarray(max_blink, dtype=np.int64)
+    l_zero = np.asarray(left_zero, dtype=np.int64)
+    r_zero = np.asarray(right_zero, dtype=np.int64)
+
+    max_pos = l_zero + _map_windows(blink_velocity, l_zero, m_frame, _ARGMAX)
+
+    has_down = r_zero >= m_frame
+    neg_frames = m_frame[has_down] + _map_windows(
+        blink_velocity,
+        m_frame[has_down],
+        r_zero[has_down],
+        _ARGMIN,
+        rows=np.flatnonzero(has_down),
+    )
+    if has_down.all():
+        return max_pos, neg_frames
+
+    warnings.warn("Force nan but require further investigation why happen like this")
+    max_neg = np.full(m_frame.shape, np.nan)
+    max_neg[has_down] = neg_frames
+    return max_pos.astype(float), max_neg
+
+
+def left_base_frames(
+    blink_velocity: np.ndarray, left_outer: np.ndarray, max_pos_vel_frame: np.ndarray
+) -> np.ndarray:
+    """Left base of every blink.
+
+    Array form of :func:`pyear.pyblinkers.zero_crossing.get_left_base`: one
+    sample before the last non-positive velocity in
+    ``[left_outer, max_pos_vel_frame]``, or ``max_pos_vel_frame - 1`` if the
+    velocity stays positive.
+    """
+    l_outer = np.asarray(left_outer, dtype=np.int64)
+    m_pos = np.asarray(max_pos_vel_frame, dtype=np.int64)
+    empty = m_pos < l_outer
+    if np.any(empty):
+        raise _window_error(
+            "empty left base search window", empty, l_outer, m_pos, blink_velocity.size
+        )
+
+    non_positive = np.flatnonzero(blink_velocity <= 0)
+    pos = np.searchsorted(non_positive, m_pos, side="right") - 1
+    last = non_positive[np.maximum(pos, 0)] if non_positive.size else np.zeros_like(pos)
+    found = (pos >= 0) & (last >= l_outer)
+    return np.where(found, last, m_pos) - 1
+
+
+def right_base_frames(
+    candidate_signal: np.ndarray,
+    blink_velocity: np.ndarray,
+    right_outer: np.ndarray,
+    max_neg_vel_frame: np.ndarray,
+) -> np.ndarray:
+    """Right base of every blink.
+
+    Array form of :func:`pyear.pyblinkers.zero_crossing.get_right_base`: one
+    sample after the first non-negative velocity in
+    ``[max_neg_vel_frame, right_outer)``, or ``max_neg_vel_frame + 1`` if the
+    velocity stays negative.
+
+    Returns
+    -------
+    numpy.ndarray
+        int64 frames, or float with ``NaN`` where the scalar helper returns
+        ``None`` because the search window is empty.
+    """
+    r_outer = np.asarray(right_outer, dtype=np.int64)
+    m_neg = np.asarray(max_neg_vel_frame, dtype=np.int64)
+    n_samples = candidate_signal.size
+
+    missing = m_neg >= np.minimum(r_outer, n_samples)
+    stop = np.minimum(r_outer, blink_velocity.size)
+    if np.any(~missing & (m_neg >= stop)):
+        raise ValueError("Please strategies how to address this")
+
+    non_negative = np.flatnonzero(blink_velocity >= 0)
+    pos = np.searchsorted(non_negative, m_neg, side="left")
+    first = stop
+    if non_negative.size:
+        candidate = non_negative[np.minimum(pos, non_negative.size - 1)]
+        first = np.where(pos < non_negative.size, candidate, stop)
+    right_base = np.where(first < stop, first, m_neg) + 1
+    if not missing.any():
+        return right_base
+    return np.where(missing, np.nan, right_base)
+
+
+def half_height_frames(
+    candidate_signal: np.ndarray,
+    max_blink: np.ndarray,
+    left_zero: np.ndarray,
+    right_zero: np.ndarray,
+    left_base: np.ndarray,
+    right_outer: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Half-height frames of every blink.
+
+    Array form of :func:`pyear.pyblinkers.zero_crossing.get_half_height`.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        ``(left_zero_half_height, right_zero_half_height,
+        left_base_half_height, right_base_half_height)``.
+    """
+    signal = candidate_signal
+    n_samples = signal.size
+    m_frame = np.asarray(max_blink, dtype=np.int64)
+    l_zero = np.asarray(left_zero, dtype=np.int64)
+    r_zero = np.asarray(right_zero, dtype=np.int64)
+    l_base = np.asarray(left_base, dtype=np.int64)
+    r_outer = np.asarray(right_outer, dtype=np.int64)
+
+    max_val = signal[m_frame]
+    half_height_val = max_val - 0.5 * (max_val - signal[l_base])
+
+    left_idx = _map_windows(signal, l_base, m_frame, _FIRST_AT_LEAST, half_height_val)
+    left_base_half_height = l_base + left_idx + 1
+
+    # the scalar helper drops the last sample when right_outer is past the end
+    right_stop = np.where(r_outer >= n_samples, r_outer - 1, r_outer)
+    right_idx = _map_windows(signal, m_frame, right_stop, _FIRST_AT_MOST, half_height_val)
+    right_base_half_height = np.minimum(r_outer, right_idx + m_frame)
+
+    zero_half_val = 0.5 * max_val
+    left_zero_idx = _map_windows(signal, l_zero, m_frame, _FIRST_AT_LEAST, zero_half_val)
+    left_zero_half_height = l_zero + left_zero_idx + 1
+
+    right_zero_idx = _map_windows(signal, m_frame, r_zero, _FIRST_AT_MOST, zero_half_val)
+    right_zero_half_height = np.minimum(r_outer, m_frame + right_zero_idx)
+
+    return (
+        left_zero_half_height,
+        right_zero_half_height,
+        left_base_half_height,
+        right_base_half_height,
+    )
+
+
+def _object_column(values, index: pd.Index) -> pd.Series:
+    """Wrap per-blink objects in a column, inferring dtype like ``apply``."""
+    column = np.empty(len(values), dtype=object)
+    for i, value in enumerate(values):
+        column[i] = value
+    return pd.Series(column, index=index).infer_objects()
+
+
+def fit_range_frames(
+    candidate_signal: np.ndarray,
+    max_blink: np.ndarray,
+    left_zero: np.ndarray,
+    right_zero: np.ndarray,
+    base_fraction: float,
+    index: pd.Index,
+) -> Dict[str, pd.Series]:
+    """Fit ranges and top/bottom points of every blink.
+
+    Array form of :func:`pyear.pyblinkers.zero_crossing.compute_fit_range`
+    with ``top_bottom=True``.
+
+    Parameters
+    ----------
+    candidate_signal : numpy.ndarray
+        1D blink signal.
+    max_blink, left_zero, right_zero : numpy.ndarray
+        Blink landmarks.
+    base_fraction : float
+        Fraction of the blink height used to place the top and bottom
+        thresholds.
+    index : pandas.Index
+        Index of the returned columns.
+
+    Returns
+    -------
+    dict of pandas.Series
+        Columns keyed like ``FitBlinks.cols_fit_range``. ``x_left`` and
+        ``x_right`` hold the integer fit ranges, or ``NaN`` when empty.
+    """
+    signal = candidate_signal
+    m_frame = np.asarray(max_blink, dtype=np.int64)
+    l_zero = np.asarray(left_zero, dtype=np.int64)
+    r_zero = np.asarray(right_zero, dtype=np.int64)
+
+    blink_height = signal[m_frame] - signal[l_zero]
+    blink_top = signal[m_frame] - base_fraction * blink_height
+    blink_bottom = signal[l_zero] + base_fraction * blink_height
+
+    top_l = _map_windows(signal, l_zero, m_frame, _LAST_BELOW, blink_top)
+    bottom_l = _map_windows(signal, l_zero, m_frame, _FIRST_ABOVE, blink_bottom)
+    no_left = (top_l < 0) | (bottom_l < 0)
+    if np.any(no_left):
+        raise _window_error(
+            "no top or bottom threshold crossing in rising edge",
+            no_left,
+            l_zero,
+            m_frame,
+            signal.size,
+        )
+
+    top_r = _map_windows(signal, m_frame, r_zero, _FIRST_BELOW, blink_top)
+    bottom_r = _map_windows(signal, m_frame, r_zero, _LAST_ABOVE, blink_bottom)
+    no_right = bottom_r < 0
+    if np.any(no_right):
+        raise _window_error(
+            "no bottom threshold crossing in falling edge",
+            no_right,
+            m_frame,
+            r_zero,
+            signal.size,
+        )
+
+    top_l_x = l_zero + top_l
+    bottom_l_x = l_zero + bottom_l
+    top_r_x = m_frame + top_r
+    bottom_r_x = m_frame + bottom_r
+
+    x_left = [
+        np.arange(lo, hi + 1, dtype=int) if hi >= lo else np.nan
+        for lo, hi in zip(bottom_l_x, top_l_x)
+    ]
+    x_right = [
+        np.arange(lo, hi + 1, dtype=int) if hi >= lo else np.nan
+        for lo, hi in zip(top_r_x, bottom_r_x)
+    ]
+    left_range = [[lo, hi] for lo, hi in zip(bottom_l_x, top_l_x)]
+    right_range = [[lo, hi] for lo, hi in zip(top_r_x, bottom_r_x)]
+
+    return {
+        "x_left": _object_column(x_left, index),
+        "x_right": _object_column(x_right, index),
+        "left_range": _object_column(left_range, index),
+        "right_range": _object_column(right_range, index),
+        "blink_bottom_point_l_y": pd.Series(signal[bottom_l_x], index=index),
+        "blink_bottom_point_l_x": pd.Series(bottom_l_x, index=index),
+        "blink_top_point_l_y": pd.Series(signal[top_l_x], index=index),
+        "blink_top_point_l_x": pd.Series(top_l_x, index=index),
+        "blink_bottom_point_r_x": pd.Series(bottom_r_x, index=index),
+        "blink_bottom_point_r_y": pd.Series(signal[bottom_r_x], index=index),
+        "blink_top_point_r_x": pd.Series(top_r_x, index=index),
+        "blink_top_point_r_y": pd.Series(signal[top_r_x], index=index),
+    }
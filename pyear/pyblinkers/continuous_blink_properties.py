@@ -0,0 +1,281 @@
+"""Blink property extraction over a continuous recording.
+
+:func:`compute_continuous_blink_properties` is the unsegmented counterpart of
+running :func:`pyear.blink_events.extract_blink_events_dataframe` and
+:func:`~pyear.pyblinkers.segment_blink_properties.compute_segment_blink_properties`
+on 30 second epochs. The blink channel is read once into a single array and
+blinks are located on the whole recording, so blinks that straddle an epoch
+boundary are kept. Landmarks and properties are then computed chunk by chunk:
+the blinks whose peak falls into a chunk are fitted on a window of the array
+that covers all their landmarks plus a halo, and the results are shifted back
+to global sample indices. Every blink is tagged with the epoch it starts in.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Executor
+from typing import Any, Dict, Iterable, List, Optional
+import logging
+import warnings
+
+import numpy as np
+import pandas as pd
+import mne
+
+from ..blink_events.blink_dataframe import extract_continuous_blink_events
+from ..utils.epoch_views import epoch_sample_bounds, load_channels
+from ..utils.epochs import epoch_times
+from .segment_blink_properties import (
+    _prepare_rows,
+    _resolve_n_jobs,
+    _run_shared,
+    _segment_properties,
+)
+
+logger = logging.getLogger(__name__)
+
+# columns holding sample indices, shifted from chunk windows to the recording
+_SAMPLE_COLUMNS = (
+    "start_blink",
+    "max_blink",
+    "end_blink",
+    "outer_start",
+    "outer_end",
+    "left_zero",
+    "max_blink_alternative",
+    "max_pos_vel_frame",
+    "max_neg_vel_frame",
+    "left_base",
+    "right_base",
+    "left_zero_half_height",
+    "right_zero_half_height",
+    "left_base_half_height",
+    "right_base_half_height",
+    "blink_bottom_point_l_x",
+    "blink_top_point_l_x",
+    "blink_bottom_point_r_x",
+    "blink_top_point_r_x",
+    "x_intersect",
+    "left_x_intercept",
+    "right_x_intercept",
+    "x_line_cross_l",
+    "x_line_cross_r",
+    "peaks_pos_vel_zero",
+    "peaks_pos_vel_base",
+)
+_RANGE_COLUMNS = ("x_left", "x_right", "left_range", "right_range")
+
+
+def epoch_ids_for_samples(
+    raw: mne.io.BaseRaw, samples: np.ndarray, epoch_len: float
+) -> np.ndarray:
+    """Return the epoch of :func:`pyear.utils.epochs.slice_raw_into_epochs` holding each sample.
+
+    Parameters
+    ----------
+    raw : mne.io.BaseRaw
+        Continuous recording.
+    samples : numpy.ndarray
+        Sample indices relative to the first sample of ``raw``.
+    epoch_len : float
+        Epoch length in seconds.
+
+    Returns
+    -------
+    numpy.ndarray
+        Epoch index of every sample, ``-1`` for samples outside every epoch
+        (the final sample is never part of an epoch).
+    """
+    samples = np.asarray(samples, dtype=np.int64)
+    starts, stops = epoch_times(raw, epoch_len)
+    bounds = [epoch_sample_bounds(raw, start, stop) for start, stop in zip(starts, stops)]
+    smin, smax = np.array(bounds, dtype=np.int64).reshape(-1, 2).T
+
+    epoch_ids = np.searchsorted(smin, samples, side="right") - 1
+    valid = epoch_ids >= 0
+    valid[valid] &= samples[valid] < smax[epoch_ids[valid]]
+    return np.where(valid, epoch_ids, -1)
+
+
+def _shift_samples(props: pd.DataFrame, offset: int) -> None:
+    """Shift the sample-index columns of ``props`` by ``offset`` in place."""
+    if offset == 0:
+        return
+    for col in _SAMPLE_COLUMNS:
+        if col in props.columns:
+            props[col] = props[col] + offset
+    if "right_zero" in props.columns:
+        # -1 marks a missing right zero and is kept as is
+        missing = props["right_zero"] < 0
+        props["right_zero"] = props["right_zero"].where(missing, props["right_zero"] + offset)
+    for col in _RANGE_COLUMNS:
+        if col in props.columns:
+            shifted = np.empty(len(props), dtype=object)
+            for i, value in enumerate(props[col]):
+                shifted[i] = (
+                    [bound + offset for bound in value]
+                    if isinstance(value, list)
+                    else value + offset
+                )
+            props[col] = shifted
+
+
+def _refresh_position_columns(
+    props: pd.DataFrame, sfreq: float, n_samples: int
+) -> None:
+    """Recompute the columns derived from absolute positions after merging."""
+    if "peak_time_blink" in props.columns:
+        props["peak_time_blink"] = props["max_blink"] / sfreq
+    if "peak_time_tent" in props.columns:
+        props["peak_time_tent"] = props["x_intersect"] / sfreq
+    if "inter_blink_max_amp" in props.columns:
+        peaks_with_len = np.append(props["max_blink"].to_numpy(), n_samples)
+        props["inter_blink_max_amp"] = np.diff(peaks_with_len) / sfreq
+    for kind in ("base", "zero"):
+        col = f"inter_blink_max_vel_{kind}"
+        if col in props.columns:
+            props[col] = (props[f"peaks_pos_vel_{kind}"] * -1) / sfreq
+
+
+def compute_continuous_blink_properties(
+    raw: mne.io.BaseRaw,
+    params: Dict[str, Any],
+    *,
+    channel: str = "EEG-E8",
+    blink_label: Optional[str] = "blink",
+    channel_type: Optional[str] = None,
+    epoch_len: float = 30.0,
+    chunk_duration: float = 600.0,
+    halo: float = 5.0,
+    run_fit: bool = False,
+    columns: Optional[Iterable[str]] = None,
+    n_jobs: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> pd.DataFrame:
+    """Detect blinks and compute their properties on a continuous recording.
+
+    Parameters
+    ----------
+    raw : mne.io.BaseRaw
+        Continuous recording with blink annotations. Only ``channel`` is read,
+        in chunks when ``raw`` is not preloaded.
+    params : dict
+        Parameter dictionary forwarded to :class:`FitBlinks` and
+        :class:`BlinkProperties`, as for
+        :func:`~pyear.pyblinkers.segment_blink_properties.compute_segment_blink_properties`.
+    channel : str, optional
+        Channel used for blink detection. Defaults to ``"EEG-E8"``.
+    blink_label : str | None, optional
+        Annotation label that denotes blinks. ``None`` uses all annotations.
+    channel_type : str | None, optional
+        Explicit channel type. When ``None`` the type is obtained from ``raw``.
+    epoch_len : float, optional
+        Epoch length in seconds used to assign ``epoch_id``. Epochs are laid
+        out as in :func:`pyear.utils.epochs.slice_raw_into_epochs`.
+    chunk_duration : float, optional
+        Blinks are fitted in groups whose peaks fall into consecutive chunks
+        of this many seconds. Defaults to ``600``.
+    halo : float, optional
+        Seconds of signal added on both sides of every chunk window, so that
+        extrapolated tent landmarks remain inside the window. Defaults to
+        ``5``.
+    run_fit : bool, optional
+        If ``True`` blink fits are computed via :meth:`FitBlinks.fit`. This
+        may drop blinks due to ``NaN`` values in the fit range.
+    columns : iterable of str, optional
+        Blink property columns to compute, see
+        :data:`pyear.pyblinkers.extract_blink_properties.PROPERTY_COLUMNS`.
+    n_jobs : int | None, optional
+        Number of worker processes used for the chunks. ``None`` or ``1``
+        (default) processes them sequentially; ``-1`` uses all cores.
+    executor : concurrent.futures.Executor | None, optional
+        Pool to submit the chunks to instead of creating one from ``n_jobs``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per blink ordered by peak. Sample-index columns are relative
+        to the first sample of ``raw``; ``blink_id`` numbers the detected
+        blinks of the recording and ``epoch_id`` is the epoch containing
+        ``start_blink`` (``-1`` if none).
+    """
+    if run_fit:
+        warnings.warn(
+            "run_fit=True may drop blinks due to NaNs in fit range",
+            RuntimeWarning,
+        )
+    if columns is not None:
+        columns = list(columns)
+    n_jobs = _resolve_n_jobs(n_jobs)
+
+    sfreq = raw.info["sfreq"]
+    signal = load_channels(raw, channel)[0]
+    n_samples = signal.size
+    events = extract_continuous_blink_events(
+        raw,
+        signal,
+        channel=channel,
+        blink_label=blink_label,
+        channel_type=channel_type,
+    )
+    if events.empty:
+        logger.info("No blink annotations found; nothing to compute")
+        return pd.DataFrame()
+
+    rows = _prepare_rows(events)
+    right_zero = rows["right_zero"].to_numpy()
+    lower = rows[["start_blink", "outer_start", "left_zero"]].min(axis=1).to_numpy()
+    # a missing right zero (-1) indexes the last sample of the recording
+    upper = np.maximum(
+        rows[["end_blink", "outer_end"]].max(axis=1).to_numpy(),
+        np.where(right_zero < 0, n_samples - 1, right_zero),
+    )
+
+    chunk_samples = max(int(round(chunk_duration * sfreq)), 1)
+    halo_samples = max(int(round(halo * sfreq)), 0)
+    chunk_of = rows["max_blink"].to_numpy() // chunk_samples
+    bounds = np.flatnonzero(np.diff(chunk_of)) + 1
+    groups = np.split(np.arange(len(rows)), bounds)
+
+    offsets: List[int] = []
+    signals: List[np.ndarray] = []
+    tasks: List[tuple] = []
+    for idx in groups:
+        lo = max(int(lower[idx].min()) - halo_samples, 0)
+        hi = min(int(upper[idx].max()) + 1 + halo_samples, n_samples)
+        if np.any(right_zero[idx] < 0):
+            hi = n_samples
+        chunk_rows = rows.iloc[idx].copy()
+        _shift_samples(chunk_rows, -lo)
+        offsets.append(lo)
+        signals.append(signal[lo:hi])
+        tasks.append((chunk_rows, sfreq, params, run_fit, columns))
+    logger.info(
+        "Computing blink properties for %d blinks in %d chunks", len(rows), len(tasks)
+    )
+
+    parallel = executor is not None or (n_jobs not in (None, 1) and len(tasks) > 1)
+    if parallel:
+        results = _run_shared(signals, tasks, n_jobs, executor)
+    else:
+        results = [
+            _segment_properties(chunk, *args) for chunk, args in zip(signals, tasks)
+        ]
+
+    all_props = []
+    for chunk_id, (offset, (props, error)) in enumerate(zip(offsets, results)):
+        if props is None:
+            logger.warning("Skipping chunk %d due to fit error: %s", chunk_id, error)
+            continue
+        _shift_samples(props, offset)
+        all_props.append(props)
+    if not all_props:
+        return pd.DataFrame()
+
+    result = pd.concat(all_props, ignore_index=True)
+    _refresh_position_columns(result, sfreq, n_samples)
+    result.insert(
+        0, "epoch_id", epoch_ids_for_samples(raw, result["start_blink"], epoch_len)
+    )
+    logger.info("Computed blink properties for %d blinks", len(result))
+    return result
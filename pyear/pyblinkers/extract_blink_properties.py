@@ -1,5 +1,156 @@
 import numpy as np
-import pandas as pd
+
+from pyear.pyblinkers.blink_landmarks import _ARGMAX, _ARGMIN, _map_windows
+from pyear.utils.ragged import segment_first_true
+
+# codes returned by the shut-duration reducers besides durations in samples
+_NEVER_SHUT = -1
+_NEVER_REOPENS = -2
+
+#: Every column added by :class:`BlinkProperties`, in the order it adds them.
+PROPERTY_COLUMNS = (
+    "duration_base",
+    "duration_zero",
+    "duration_tent",
+    "duration_half_base",
+    "duration_half_zero",
+    "pos_amp_vel_ratio_zero",
+    "peaks_pos_vel_zero",
+    "neg_amp_vel_ratio_zero",
+    "pos_amp_vel_ratio_base",
+    "peaks_pos_vel_base",
+    "neg_amp_vel_ratio_base",
+    "neg_amp_vel_ratio_tent",
+    "pos_amp_vel_ratio_tent",
+    "closing_time_zero",
+    "reopening_time_zero",
+    "time_shut_base",
+    "closing_time_tent",
+    "reopening_time_tent",
+    "time_shut_tent",
+    "peak_max_blink",
+    "peak_max_tent",
+    "peak_time_tent",
+    "peak_time_blink",
+    "inter_blink_max_amp",
+    "inter_blink_max_vel_base",
+    "inter_blink_max_vel_zero",
+)
+
+#: Columns derived from the tent (line intersection) fit of ``FitBlinks.fit``.
+TENT_COLUMNS = frozenset(
+    {
+        "duration_tent",
+        "neg_amp_vel_ratio_tent",
+        "pos_amp_vel_ratio_tent",
+        "closing_time_tent",
+        "reopening_time_tent",
+        "time_shut_tent",
+        "peak_max_tent",
+        "peak_time_tent",
+    }
+)
+
+#: Columns derived from the half-height landmarks of ``FitBlinks.fit``.
+HALF_HEIGHT_COLUMNS = frozenset({"duration_half_base", "duration_half_zero"})
+
+
+def fit_requirements(columns=None):
+    """Return the :meth:`FitBlinks.fit` stages needed for ``columns``.
+
+    Parameters
+    ----------
+    columns : iterable of str | None
+        Requested :class:`BlinkProperties` columns. ``None`` requests all.
+
+    Returns
+    -------
+    dict
+        ``{"tent": bool, "half_height": bool}``, ready to be passed as
+        keyword arguments to :meth:`FitBlinks.fit`.
+    """
+    if columns is None:
+        return {"tent": True, "half_height": True}
+    columns = set(columns)
+    return {
+        "tent": bool(columns & TENT_COLUMNS),
+        "half_height": bool(columns & HALF_HEIGHT_COLUMNS),
+    }
+
+
+def _slice_bounds(start, stop, n_samples):
+    """Normalise ``data[start:stop]`` bounds like Python slicing does."""
+    start = np.asarray(start, dtype=np.int64)
+    stop = np.asarray(stop, dtype=np.int64)
+    start = np.clip(np.where(start < 0, start + n_samples, start), 0, n_samples)
+    stop = np.clip(np.where(stop < 0, stop + n_samples, stop), 0, n_samples)
+    return start, np.maximum(stop, start)
+
+
+def _shut_reducer(tent):
+    """Reducer pair measuring how long a window stays above a threshold.
+
+    The duration runs from the first sample ``>= threshold`` to the first
+    later sample ``< threshold``. With ``tent=True`` the search for the end
+    excludes the last sample of the window, as in
+    :meth:`BlinkProperties.compute_time_shut_tent`.
+    """
+
+    def batched(values, offsets, threshold):
+        lengths = np.diff(offsets)
+        thr = np.repeat(threshold, lengths)
+        start = segment_first_true(values >= thr, offsets)
+        local = np.arange(values.size) - np.repeat(offsets[:-1], lengths)
+        after = local >= np.repeat(start, lengths) + (0 if tent else 1)
+        if tent:
+            after &= local < np.repeat(lengths - 1, lengths)
+        end = segment_first_true((values < thr) & after, offsets)
+        return np.where(start < 0, _NEVER_SHUT, np.where(end < 0, _NEVER_REOPENS, end - start))
+
+    def single(window, threshold):
+        above = window >= threshold
+        if not above.any():
+            return _NEVER_SHUT
+        start = int(np.argmax(above))
+        rest = window[start:-1] if tent else window[start + 1 :]
+        below = rest < threshold
+        if not below.any():
+            return _NEVER_REOPENS
+        return int(np.argmax(below)) + (0 if tent else 1)
+
+    return batched, single
+
+
+_SHUT = _shut_reducer(tent=False)
+_SHUT_TENT = _shut_reducer(tent=True)
+
+
+def _shut_durations(candidate_signal, start, stop, threshold, srate, *, tent=False):
+    """Shut duration of every blink over ``candidate_signal[start:stop]``.
+
+    Array form of :meth:`BlinkProperties.compute_time_shut` (``tent=False``)
+    and :meth:`BlinkProperties.compute_time_shut_tent` (``tent=True``).
+    Blinks that never reach ``threshold`` get ``0`` and blinks that never
+    drop below it again get ``NaN``. Like the row-wise version, the column is
+    integer when no blink reaches the threshold.
+    """
+    start, stop = _slice_bounds(start, stop, candidate_signal.size)
+    codes = np.full(start.size, _NEVER_SHUT, dtype=np.int64)
+    filled = stop > start
+    codes[filled] = _map_windows(
+        candidate_signal,
+        start[filled],
+        stop[filled] - 1,
+        _SHUT_TENT if tent else _SHUT,
+        np.asarray(threshold, dtype=float)[filled],
+    )
+    if codes.size and np.all(codes == _NEVER_SHUT):
+        return np.zeros(codes.size, dtype=np.int64)
+    return np.where(
+        codes == _NEVER_SHUT,
+        0.0,
+        np.where(codes == _NEVER_REOPENS, np.nan, codes / srate),
+    )
 
 
 class BlinkProperties:
@@ -14,7 +165,9 @@ class BlinkProperties:
     %     blinkFits     (output) structure with the blink landmarks
     """
 
-    def __init__(self, candidate_signal, df, srate, params, *, fitted: bool = True):
+    def __init__(
+        self, candidate_signal, df, srate, params, *, fitted: bool = True, columns=None
+    ):
         """Initializes BlinkProperties object to calculate blink features.
 
         This class calculates various properties of detected blinks based on
@@ -41,6 +194,17 @@ class BlinkProperties:
         fitted : bool, optional
             If ``True`` additional features requiring blink fitting are computed.
             Defaults to ``True``.
+        columns : iterable of str | None, optional
+            Subset of :data:`PROPERTY_COLUMNS` to compute. Only the landmarks
+            and intermediate arrays needed for these columns are evaluated and
+            the input columns of ``df`` are kept as they are. ``None``
+            (default) computes every column.
+
+        Raises
+        ------
+        ValueError
+            If ``columns`` contains an unknown name, or a tent or half-height
+            column while ``fitted`` is ``False``.
         """
         self.signal_len = None
         self.blink_velocity = None
@@ -52,6 +216,7 @@ class BlinkProperties:
         self.z_thresholds = params["z_thresholds"]
 
         self.fitted = fitted
+        self.columns = self._resolve_columns(columns)
 
         self.df_res = []
         self.reset_index()
@@ -60,12 +225,29 @@ class BlinkProperties:
 
         self.set_blink_amp_velocity_ratio_zero_to_max()
         self.amplitude_velocity_ratio_base()
-        if fitted:
+        if fitted and self.wants("neg_amp_vel_ratio_tent", "pos_amp_vel_ratio_tent"):
             self.amplitude_velocity_ratio_tent()
         self.time_zero_shut()
         self.time_base_shut()
         self.extract_other_times()
 
+    def _resolve_columns(self, columns):
+        if columns is None:
+            fit_only = set() if self.fitted else TENT_COLUMNS | HALF_HEIGHT_COLUMNS
+            return frozenset(PROPERTY_COLUMNS) - fit_only
+        columns = frozenset(columns)
+        unknown = columns.difference(PROPERTY_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown blink property columns: {sorted(unknown)}")
+        fit_only = columns & (TENT_COLUMNS | HALF_HEIGHT_COLUMNS)
+        if fit_only and not self.fitted:
+            raise ValueError(f"Columns {sorted(fit_only)} require fitted blinks")
+        return columns
+
+    def wants(self, *names):
+        """Return ``True`` if any of ``names`` was requested."""
+        return not self.columns.isdisjoint(names)
+
     def reset_index(self):
         self.df.reset_index(drop=True, inplace=True)
 
@@ -78,24 +260,31 @@ class BlinkProperties:
 
         constant = 1  # Constant for matching Matlab output
 
-        self.df["duration_base"] = (
-            self.df["right_base"] - self.df["left_base"]
-        ) / self.srate
-        self.df["duration_zero"] = (
-            self.df["right_zero"] - self.df["left_zero"]
-        ) / self.srate
-
-        if self.fitted:
-            self.df["duration_tent"] = (
-                self.df["right_x_intercept"] - self.df["left_x_intercept"]
-            ) / self.srate
-            self.df["duration_half_base"] = (
-                (self.df["right_base_half_height"] - self.df["left_base_half_height"]) + constant
+        if self.wants("duration_base"):
+            self.df["duration_base"] = (
+                self.df["right_base"] - self.df["left_base"]
             ) / self.srate
-            self.df["duration_half_zero"] = (
-                (self.df["right_zero_half_height"] - self.df["left_zero_half_height"]) + constant
+        if self.wants("duration_zero"):
+            self.df["duration_zero"] = (
+                self.df["right_zero"] - self.df["left_zero"]
             ) / self.srate
 
+        if self.fitted:
+            if self.wants("duration_tent"):
+                self.df["duration_tent"] = (
+                    self.df["right_x_intercept"] - self.df["left_x_intercept"]
+                ) / self.srate
+            if self.wants("duration_half_base"):
+                self.df["duration_half_base"] = (
+                    (self.df["right_base_half_height"] - self.df["left_base_half_height"])
+                    + constant
+                ) / self.srate
+            if self.wants("duration_half_zero"):
+                self.df["duration_half_zero"] = (
+                    (self.df["right_zero_half_height"] - self.df["left_zero_half_height"])
+                    + constant
+                ) / self.srate
+
     def compute_amplitude_velocity_ratio(
         self, start_key, end_key, ratio_key, aggregator="max", idx_col=None
     ):
@@ -106,40 +295,28 @@ class BlinkProperties:
         """
         start_vals = self.df[start_key].to_numpy().astype(int)
         end_vals = self.df[end_key].to_numpy().astype(int)
-        blink_vel = self.blink_velocity
 
-        lengths = (end_vals - start_vals + 1).astype(int)
-        max_len = lengths.max()
-        offsets = np.arange(max_len)[None, :]
-        mask = offsets < lengths[:, None]
-
-        all_indices = start_vals[:, None] + offsets
-        all_indices = all_indices[mask].astype(int)
-
-        row_idx_all = np.repeat(np.arange(len(lengths)), lengths)
-        velocities = blink_vel[all_indices]
-
-        temp_df = pd.DataFrame(
-            {"row_idx": row_idx_all, "velocity": velocities, "index": all_indices}
-        )
+        # groupby().idxmax() skipped NaN velocities; keep that behaviour
         if aggregator == "max":
-            idx_extreme = temp_df.groupby("row_idx")["velocity"].idxmax()
+            velocity = np.where(np.isnan(self.blink_velocity), -np.inf, self.blink_velocity)
+            reducer = _ARGMAX
         else:
-            idx_extreme = temp_df.groupby("row_idx")["velocity"].idxmin()
+            velocity = np.where(np.isnan(self.blink_velocity), np.inf, self.blink_velocity)
+            reducer = _ARGMIN
+        extreme_idx = start_vals + _map_windows(velocity, start_vals, end_vals, reducer)
 
-        df_extreme = temp_df.loc[idx_extreme].sort_values("row_idx")
         ratio_vals = (
             100
             * abs(
                 self.candidate_signal[self.df["max_blink"].to_numpy()]
-                / df_extreme["velocity"].to_numpy()
+                / self.blink_velocity[extreme_idx]
             )
             / self.srate
         )
 
         self.df[ratio_key] = ratio_vals
         if idx_col:
-            self.df[idx_col] = df_extreme["index"].to_numpy()
+            self.df[idx_col] = extreme_idx
 
     def compute_neg_amp_vel_ratio_zero(self):
         """
@@ -169,8 +346,12 @@ class BlinkProperties:
 
     def set_blink_amp_velocity_ratio_zero_to_max(self):
         """ "Computes and sets both positive and negative amplitude-velocity ratios (zero-to-max)."""
-        self.compute_pos_amp_vel_ratio_zero()
-        self.compute_neg_amp_vel_ratio_zero()
+        if self.wants(
+            "pos_amp_vel_ratio_zero", "peaks_pos_vel_zero", "inter_blink_max_vel_zero"
+        ):
+            self.compute_pos_amp_vel_ratio_zero()
+        if self.wants("neg_amp_vel_ratio_zero"):
+            self.compute_neg_amp_vel_ratio_zero()
 
     def compute_pos_amp_vel_ratio_base(self):
         """Computes and sets positive amplitude-velocity ratio from ``left_base`` to ``max_blink`` in DataFrame."""
@@ -196,8 +377,12 @@ class BlinkProperties:
         Blink amplitude-velocity ratio from base to max
         :return:
         """
-        self.compute_pos_amp_vel_ratio_base()
-        self.compute_neg_amp_vel_ratio_base()
+        if self.wants(
+            "pos_amp_vel_ratio_base", "peaks_pos_vel_base", "inter_blink_max_vel_base"
+        ):
+            self.compute_pos_amp_vel_ratio_base()
+        if self.wants("neg_amp_vel_ratio_base"):
+            self.compute_neg_amp_vel_ratio_base()
 
     def amplitude_velocity_ratio_tent(self):
         """
@@ -273,24 +458,17 @@ class BlinkProperties:
         Time zero shut
         :return:
         """
-        self.df["closing_time_zero"] = (
-            self.df["max_blink"] - self.df["left_zero"]
-        ) / self.srate
-        self.df["reopening_time_zero"] = (
-            self.df["right_zero"] - self.df["max_blink"]
-        ) / self.srate
-
-        self.df["time_shut_base"] = self.df.apply(
-            lambda row: self.compute_time_shut(
-                row,
-                self.candidate_signal,
-                self.srate,
-                self.shut_amp_fraction,
-                key_prefix="Base",
-                default_no_thresh=0,
-            ),
-            axis=1,
-        )
+        if self.wants("closing_time_zero"):
+            self.df["closing_time_zero"] = (
+                self.df["max_blink"] - self.df["left_zero"]
+            ) / self.srate
+        if self.wants("reopening_time_zero"):
+            self.df["reopening_time_zero"] = (
+                self.df["right_zero"] - self.df["max_blink"]
+            ) / self.srate
+
+        if self.wants("time_shut_base"):
+            self.df["time_shut_base"] = self.shut_durations("left_base", "right_base")
 
     @staticmethod
     def compute_time_shut_tent(row, candidate_signal, srate, shut_amp_fraction):
@@ -316,35 +494,57 @@ class BlinkProperties:
         :return:
         """
 
-        self.df["time_shut_base"] = self.df.apply(
-            lambda row: self.compute_time_shut(
-                row,
-                self.candidate_signal,
-                self.srate,
-                self.shut_amp_fraction,
-                key_prefix="Base",
-                default_no_thresh=0,
-            ),
-            axis=1,
-        )
+        # already filled by time_zero_shut() when the full pipeline runs
+        if self.wants("time_shut_base") and "time_shut_base" not in self.df:
+            self.df["time_shut_base"] = self.shut_durations("left_base", "right_base")
 
         if self.fitted:
-            self.df["closing_time_tent"] = (
-                self.df["x_intersect"] - self.df["left_x_intercept"]
-            ) / self.srate
-            self.df["reopening_time_tent"] = (
-                self.df["right_x_intercept"] - self.df["x_intersect"]
-            ) / self.srate
+            if self.wants("closing_time_tent"):
+                self.df["closing_time_tent"] = (
+                    self.df["x_intersect"] - self.df["left_x_intercept"]
+                ) / self.srate
+            if self.wants("reopening_time_tent"):
+                self.df["reopening_time_tent"] = (
+                    self.df["right_x_intercept"] - self.df["x_intersect"]
+                ) / self.srate
+
+            if self.wants("time_shut_tent"):
+                self.df["time_shut_tent"] = self.shut_durations(
+                    "left_x_intercept", "right_x_intercept", tent=True
+                )
+
+    def shut_durations(self, left_key, right_key, *, tent=False):
+        """Compute shut durations of all blinks between two landmark columns.
+
+        Vectorised form of :meth:`compute_time_shut` with
+        ``default_no_thresh=0`` (``tent=False``) and of
+        :meth:`compute_time_shut_tent` (``tent=True``).
 
-            self.df["time_shut_tent"] = self.df.apply(
-                lambda row: self.compute_time_shut_tent(
-                    row,
-                    self.candidate_signal,
-                    self.srate,
-                    self.shut_amp_fraction,
-                ),
-                axis=1,
-            )
+        Parameters
+        ----------
+        left_key, right_key : str
+            Columns holding the first and last sample of each window.
+        tent : bool, optional
+            Use the tent variant, which truncates fractional landmarks and
+            ignores the last sample when searching for the reopening.
+
+        Returns
+        -------
+        numpy.ndarray
+            Shut duration in seconds for every blink.
+        """
+        left = self.df[left_key].to_numpy()
+        right = self.df[right_key].to_numpy()
+        if not (np.all(np.isfinite(left)) and np.all(np.isfinite(right))):
+            raise ValueError(f"cannot convert non-finite {left_key}/{right_key} to integer")
+        return _shut_durations(
+            self.candidate_signal,
+            left.astype(np.int64),
+            right.astype(np.int64) + 1,
+            self.shut_amp_fraction * self.df["max_value"].to_numpy(dtype=float),
+            self.srate,
+            tent=tent,
+        )
 
     def get_argmax_val(self, row):
 
@@ -360,20 +560,27 @@ class BlinkProperties:
 
     def extract_other_times(self):
 
-        self.df["peak_max_blink"] = self.df["max_value"]
+        if self.wants("peak_max_blink"):
+            self.df["peak_max_blink"] = self.df["max_value"]
         if self.fitted:
-            self.df["peak_max_tent"] = self.df["y_intersect"]
-            self.df["peak_time_tent"] = self.df["x_intersect"] / self.srate
-        self.df["peak_time_blink"] = self.df["max_blink"] / self.srate
+            if self.wants("peak_max_tent"):
+                self.df["peak_max_tent"] = self.df["y_intersect"]
+            if self.wants("peak_time_tent"):
+                self.df["peak_time_tent"] = self.df["x_intersect"] / self.srate
+        if self.wants("peak_time_blink"):
+            self.df["peak_time_blink"] = self.df["max_blink"] / self.srate
+
+        if self.wants("inter_blink_max_amp"):
+            peaks_with_len = np.append(
+                self.df["max_blink"].to_numpy(), len(self.candidate_signal)
+            )
+            self.df["inter_blink_max_amp"] = np.diff(peaks_with_len) / self.srate
 
-        peaks_with_len = np.append(
-            self.df["max_blink"].to_numpy(), len(self.candidate_signal)
-        )
-        self.df["inter_blink_max_amp"] = np.diff(peaks_with_len) / self.srate
-
-        self.df["inter_blink_max_vel_base"] = (
-            self.df["peaks_pos_vel_base"] * -1
-        ) / self.srate
-        self.df["inter_blink_max_vel_zero"] = (
-            self.df["peaks_pos_vel_zero"] * -1
-        ) / self.srate
+        if self.wants("inter_blink_max_vel_base"):
+            self.df["inter_blink_max_vel_base"] = (
+                self.df["peaks_pos_vel_base"] * -1
+            ) / self.srate
+        if self.wants("inter_blink_max_vel_zero"):
+            self.df["inter_blink_max_vel_zero"] = (
+                self.df["peaks_pos_vel_zero"] * -1
+            ) / self.srate
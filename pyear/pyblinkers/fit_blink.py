@@ -1,13 +1,14 @@
 import numpy as np
 import warnings
 
-from pyear.pyblinkers.zero_crossing import (
-    get_half_height,
-    compute_fit_range,
-    left_right_zero_crossing,
-)
+from pyear.pyblinkers.zero_crossing import left_right_zero_crossings
 from pyear.pyblinkers.base_left_right import create_left_right_base
-from pyear.matlab_fork.line_intersection_matlab import lines_intersection_matlabx
+from pyear.pyblinkers.blink_landmarks import (
+    fit_range_frames,
+    half_height_frames,
+    max_blink_frames,
+)
+from pyear.matlab_fork.line_intersection_matlab import lines_intersection_batch
 
 
 class FitBlinks:
@@ -84,7 +85,9 @@ class FitBlinks:
         max_fr = blink_range[max_idx]
         return max_val, max_fr
 
-    def dprocess_segment_raw(self, *, run_fit: bool = False) -> None:
+    def dprocess_segment_raw(
+        self, *, run_fit: bool = False, tent: bool = True, half_height: bool = True
+    ) -> None:
         """Process blink metadata for a raw segment.
 
         If the DataFrame lacks essential columns (``outer_start``, ``outer_end``,
@@ -99,19 +102,23 @@ class FitBlinks:
             introduce ``NaN`` values in the resulting frame due to aggressive
             range estimation. The default is ``False`` which skips the fitting
             stage.
+        tent, half_height : bool, optional
+            Forwarded to :meth:`fit`.
         """
 
         required_cols = {"outer_start", "outer_end", "left_zero", "right_zero"}
         if not required_cols.issubset(self.df.columns):
-            self.dprocess(run_fit=run_fit)
+            self.dprocess(run_fit=run_fit, tent=tent, half_height=half_height)
             return
 
         # Compute the maximum value within each blink interval
-        self.df[["max_value", "max_blink_alternative"]] = self.df.apply(
-            lambda row: self.get_max_blink(row["start_blink"], row["end_blink"]),
-            axis=1,
-            result_type="expand",
+        max_value, max_blink = max_blink_frames(
+            self.candidate_signal,
+            self.df["start_blink"].to_numpy(),
+            self.df["end_blink"].to_numpy(),
         )
+        self.df["max_value"] = max_value.astype(float)
+        self.df["max_blink_alternative"] = max_blink.astype(float)
 
         # Compute baseline information required by downstream features
         self.frame_blinks = create_left_right_base(self.candidate_signal, self.df)
@@ -121,9 +128,11 @@ class FitBlinks:
                 "Running fit() may drop blinks due to NaNs in fit range",
                 RuntimeWarning,
             )
-            self.fit()
+            self.fit(tent=tent, half_height=half_height)
 
-    def dprocess(self, *, run_fit: bool = True) -> None:
+    def dprocess(
+        self, *, run_fit: bool = True, tent: bool = True, half_height: bool = True
+    ) -> None:
         """Compute blink boundaries and optional fits.
 
         This routine reproduces the legacy Matlab approach where blink fits were
@@ -133,6 +142,8 @@ class FitBlinks:
         ----------
         run_fit : bool, optional
             If ``True`` also execute :meth:`fit`. Defaults to ``True``.
+        tent, half_height : bool, optional
+            Forwarded to :meth:`fit`.
         """
 
         data_size = (
@@ -140,71 +151,88 @@ class FitBlinks:
         )  # store locally to avoid repeated lookups
 
         # Find the max_frame index and max_value at that max_frame index
-        self.df[["max_value", "max_blink"]] = self.df.apply(
-            lambda row: self.get_max_blink(row["start_blink"], row["end_blink"]),
-            axis=1,
-            result_type="expand",
+        max_value, max_blink = max_blink_frames(
+            self.candidate_signal,
+            self.df["start_blink"].to_numpy(),
+            self.df["end_blink"].to_numpy(),
         )
-        # Ensure the max_blink is integer
-        self.df["max_blink"] = self.df["max_blink"].astype(int)
+        self.df["max_value"] = max_value.astype(float)
+        self.df["max_blink"] = max_blink.astype(int)
 
         # Shifts for outer start/end
         self.df["outer_start"] = self.df["max_blink"].shift(1, fill_value=0)
         self.df["outer_end"] = self.df["max_blink"].shift(-1, fill_value=data_size)
 
-        # Add columns for leftZero/rightZero
-        self.df[["left_zero", "right_zero"]] = self.df.apply(
-            lambda row: left_right_zero_crossing(
-                self.candidate_signal,
-                row["max_blink"],
-                row["outer_start"],
-                row["outer_end"],
-            ),
-            axis=1,
-            result_type="expand",
+        # Add columns for leftZero/rightZero, answered for all blinks at once
+        left_zero, right_zero = left_right_zero_crossings(
+            self.candidate_signal, self.df["max_blink"].to_numpy()
         )
+        if np.any(left_zero < 0):
+            raise IndexError("No negative sample to the left of a blink peak")
+        if np.any(right_zero < 0):
+            # a missing right zero is stored as NaN, which makes both columns float
+            self.df["left_zero"] = left_zero.astype(float)
+            self.df["right_zero"] = np.where(right_zero < 0, np.nan, right_zero)
+        else:
+            self.df["left_zero"] = left_zero
+            self.df["right_zero"] = right_zero
 
         # Perform fitting calculations
         if run_fit:
-            self.fit()
+            self.fit(tent=tent, half_height=half_height)
 
-    def fit(self):
+    def fit(self, *, tent: bool = True, half_height: bool = True):
         """
         Main method to create base line fits, compute half-height, fit ranges,
         and line intersections.
+
+        The fit ranges are always computed because they decide which blinks
+        are kept. The other stages can be skipped when their columns are not
+        needed, see :func:`pyear.pyblinkers.extract_blink_properties.fit_requirements`.
+
+        Parameters
+        ----------
+        tent : bool, optional
+            Compute the line intersection (tent) columns listed in
+            ``cols_lines_intesection``. Defaults to ``True``.
+        half_height : bool, optional
+            Compute the half-height columns listed in ``cols_half_height``.
+            Defaults to ``True``.
         """
         # candidate_signal = self.candidate_signal  # Local reference for efficiency
 
         # Create left and right base lines
         self.frame_blinks = create_left_right_base(self.candidate_signal, self.df)
 
+        frames = self.frame_blinks
+        max_blink = frames["max_blink"].to_numpy()
+        left_zero = frames["left_zero"].to_numpy()
+        right_zero = frames["right_zero"].to_numpy()
+
         # Get half height
-        self.frame_blinks[self.cols_half_height] = self.frame_blinks.apply(
-            lambda row: get_half_height(
+        if half_height:
+            half_heights = half_height_frames(
                 self.candidate_signal,
-                row["max_blink"],
-                row["left_zero"],
-                row["right_zero"],
-                row["left_base"],
-                row["outer_end"],
-            ),
-            axis=1,
-            result_type="expand",
-        )
+                max_blink,
+                left_zero,
+                right_zero,
+                frames["left_base"].to_numpy(),
+                frames["outer_end"].to_numpy(),
+            )
+            for col, values in zip(self.cols_half_height, half_heights):
+                frames[col] = values
 
         # Compute fit ranges
-        self.frame_blinks[self.cols_fit_range] = self.frame_blinks.apply(
-            lambda row: compute_fit_range(
-                self.candidate_signal,
-                row["max_blink"],
-                row["left_zero"],
-                row["right_zero"],
-                self.base_fraction,
-                top_bottom=True,
-            ),
-            axis=1,
-            result_type="expand",
+        fit_ranges = fit_range_frames(
+            self.candidate_signal,
+            max_blink,
+            left_zero,
+            right_zero,
+            self.base_fraction,
+            frames.index,
         )
+        for col in self.cols_fit_range:
+            frames[col] = fit_ranges[col]
 
         # Drop rows with NaN values
         self.frame_blinks.dropna(inplace=True)
@@ -217,14 +245,19 @@ class FitBlinks:
             & (self.frame_blinks["nsize_x_right"] > 1)
         ].reset_index(drop=True)
 
-        # Calculate line intersections
-
-        self.frame_blinks[self.cols_lines_intesection] = self.frame_blinks.apply(
-            lambda row: lines_intersection_matlabx(
-                signal=self.candidate_signal,
-                xRight=row["x_right"],
-                xLeft=row["x_left"],
-            ),
-            axis=1,
-            result_type="expand",
+        # Calculate line intersections for all blinks at once
+        if self.frame_blinks.empty:
+            raise ValueError("No blinks left with a fit range of more than one sample")
+        if not tent:
+            return
+        left_range = np.array(self.frame_blinks["left_range"].tolist(), dtype=np.int64)
+        right_range = np.array(self.frame_blinks["right_range"].tolist(), dtype=np.int64)
+        tent_fits = lines_intersection_batch(
+            self.candidate_signal,
+            left_range[:, 0],
+            left_range[:, 1],
+            right_range[:, 0],
+            right_range[:, 1],
         )
+        for col in self.cols_lines_intesection:
+            self.frame_blinks[col] = tent_fits[col]
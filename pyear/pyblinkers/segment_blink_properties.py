@@ -3,23 +3,151 @@
 This module exposes :func:`compute_segment_blink_properties`, which iterates
 over a sequence of ``mne.Raw`` segments and extracts detailed blink metrics for
 each blink using :class:`FitBlinks` and :class:`BlinkProperties`.
+
+The blink table is grouped by segment once. Segments can be processed by a
+pool of workers; their signals are then packed into one
+:class:`multiprocessing.shared_memory.SharedMemory` block that workers attach
+to by name instead of receiving pickled copies.
 """
 
 from __future__ import annotations
 
-from typing import Sequence, Dict, Any
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 import logging
+import os
 import warnings
 
+import numpy as np
 import pandas as pd
 import mne
 from tqdm import tqdm
 
 from .fit_blink import FitBlinks
-from .extract_blink_properties import BlinkProperties
+from .extract_blink_properties import BlinkProperties, fit_requirements
+from ..utils.blink_table import EpochGrouping
 
 logger = logging.getLogger(__name__)
 
+_INT_COLUMNS = ("start_blink", "end_blink", "outer_start", "outer_end", "left_zero")
+
+
+def _prepare_rows(rows: pd.DataFrame) -> pd.DataFrame:
+    """Cast the landmark columns of one segment to integers."""
+    rows = rows.copy()
+    for col in _INT_COLUMNS:
+        rows[col] = rows[col].astype(int)
+    if "right_zero" in rows.columns:
+        rows["right_zero"] = rows["right_zero"].fillna(-1).astype(int)
+    return rows
+
+
+def _resolve_n_jobs(n_jobs: Optional[int]) -> Optional[int]:
+    """Validate ``n_jobs`` and replace a negative value by the core count."""
+    if n_jobs == 0:
+        raise ValueError("n_jobs must be a positive integer, -1 or None, got 0")
+    if n_jobs is not None and n_jobs < 0:
+        return os.cpu_count() or 1
+    return n_jobs
+
+
+def _segment_properties(
+    signal: np.ndarray,
+    rows: pd.DataFrame,
+    sfreq: float,
+    params: Dict[str, Any],
+    run_fit: bool,
+    columns: Optional[List[str]],
+) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+    """Fit the blinks of one segment and compute their properties.
+
+    Returns
+    -------
+    tuple
+        ``(properties, None)`` on success or ``(None, message)`` when the
+        fitting stage failed and the segment must be skipped.
+    """
+    fitter = FitBlinks(candidate_signal=signal, df=rows, params=params)
+    try:
+        fitter.dprocess_segment_raw(run_fit=run_fit, **fit_requirements(columns))
+    except Exception as exc:  # pragma: no cover - safeguard against bad data
+        return None, str(exc)
+
+    props = BlinkProperties(
+        signal,
+        fitter.frame_blinks,
+        sfreq,
+        params,
+        fitted=run_fit,
+        columns=columns,
+    ).df
+    return props, None
+
+
+def _shared_segment_properties(
+    shm_name: str,
+    start: int,
+    stop: int,
+    *args: Any,
+) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+    """Run :func:`_segment_properties` on ``[start, stop)`` of a shared block."""
+    # workers report to the parent's resource tracker, so attaching is safe
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        view = np.ndarray((stop,), dtype=float, buffer=shm.buf)
+        signal = view[start:stop].copy()
+        del view
+    finally:
+        shm.close()
+    return _segment_properties(signal, *args)
+
+
+def _run_shared(
+    signals: List[np.ndarray],
+    tasks: List[tuple],
+    n_jobs: Optional[int],
+    executor: Optional[Executor],
+) -> List[Tuple[Optional[pd.DataFrame], Optional[str]]]:
+    """Run segment tasks on a pool with the signals in shared memory."""
+    bounds = np.zeros(len(signals) + 1, dtype=np.int64)
+    np.cumsum([signal.size for signal in signals], out=bounds[1:])
+    shm = shared_memory.SharedMemory(create=True, size=max(int(bounds[-1]) * 8, 1))
+    futures: List[Future] = []
+    try:
+        packed = np.ndarray((int(bounds[-1]),), dtype=float, buffer=shm.buf)
+        for i, signal in enumerate(signals):
+            packed[bounds[i] : bounds[i + 1]] = signal
+        del packed
+
+        pool = executor
+        if pool is None:
+            workers = min(n_jobs, len(tasks))
+            logger.info("Fitting %d segments with %d processes", len(tasks), workers)
+            pool = ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = [
+                pool.submit(
+                    _shared_segment_properties,
+                    shm.name,
+                    int(bounds[i]),
+                    int(bounds[i + 1]),
+                    *args,
+                )
+                for i, args in enumerate(tasks)
+            ]
+            return [future.result() for future in tqdm(futures, desc="Segments")]
+        finally:
+            # the block must outlive every task that may still attach to it
+            for future in futures:
+                future.cancel()
+            wait(futures)
+            if executor is None:
+                pool.shutdown()
+    finally:
+        shm.close()
+        shm.unlink()
+
 
 def compute_segment_blink_properties(
     segments: Sequence[mne.io.BaseRaw],
@@ -28,6 +156,9 @@ def compute_segment_blink_properties(
     *,
     channel: str = "EEG-E8",
     run_fit: bool = False,
+    columns: Optional[Iterable[str]] = None,
+    n_jobs: Optional[int] = None,
+    executor: Optional[Executor] = None,
 ) -> pd.DataFrame:
     """Calculate blink properties for each blink found within every segment.
 
@@ -53,15 +184,29 @@ def compute_segment_blink_properties(
         ``end_blink`` were provided and fitting was always performed. This may
         drop blinks due to ``NaN`` values in the fit range. The default is
         ``False``.
+    columns : iterable of str, optional
+        Blink property columns to compute, see
+        :data:`pyear.pyblinkers.extract_blink_properties.PROPERTY_COLUMNS`.
+        Fit stages whose columns are not requested, such as the tent fit, are
+        skipped. ``None`` (default) computes every column.
+    n_jobs : int | None, optional
+        Number of worker processes. ``None`` or ``1`` (default) processes the
+        segments sequentially in the calling process; ``-1`` uses all
+        available cores.
+    executor : concurrent.futures.Executor | None, optional
+        Pool to submit the segments to instead of creating one from
+        ``n_jobs``. It is used as is and not shut down.
 
     Returns
     -------
     pandas.DataFrame
-        Concatenated blink-property table for all segments. The returned
-        DataFrame contains all columns generated by :class:`BlinkProperties`
-        along with ``seg_id`` identifying the source segment.
+        Concatenated blink-property table for all segments, in segment order.
+        The returned DataFrame contains the requested columns generated by
+        :class:`BlinkProperties` along with the blink landmarks and ``seg_id``
+        identifying the source segment.
     """
     logger.info("Computing blink properties for %d segments", len(segments))
+    n_jobs = _resolve_n_jobs(n_jobs)
 
     if run_fit:
         warnings.warn(
@@ -73,37 +218,36 @@ def compute_segment_blink_properties(
         logger.info("Blink DataFrame is empty; nothing to compute")
         return pd.DataFrame()
 
+    if columns is not None:
+        columns = list(columns)
     sfreq = segments[0].info["sfreq"] if segments else 0.0
-    all_props = []
 
-    for seg_id, raw in enumerate(tqdm(segments, desc="Segments")):
-        rows = blink_df[blink_df["seg_id"] == seg_id].copy()
-        rows["start_blink"] = rows["start_blink"].astype(int)
-        rows["end_blink"] = rows["end_blink"].astype(int)
-        rows["outer_start"] = rows["outer_start"].astype(int)
-        rows["outer_end"] = rows["outer_end"].astype(int)
-        rows["left_zero"] = rows["left_zero"].astype(int)
-        if "right_zero" in rows.columns:
-            rows["right_zero"] = rows["right_zero"].fillna(-1).astype(int)
-        if rows.empty:
-            continue
+    # group once instead of filtering the whole table for every segment
+    grouping = EpochGrouping(blink_df["seg_id"].to_numpy(), len(segments))
+    seg_ids: List[int] = []
+    signals: List[np.ndarray] = []
+    tasks: List[tuple] = []
+    for seg_id in np.flatnonzero(grouping.counts()):
+        rows = _prepare_rows(blink_df.iloc[grouping.indices(seg_id)])
+        signal = np.asarray(segments[seg_id].get_data(picks=channel)[0], dtype=float)
+        seg_ids.append(int(seg_id))
+        signals.append(signal)
+        tasks.append((rows, sfreq, params, run_fit, columns))
 
-        signal = raw.get_data(picks=channel)[0]
+    parallel = executor is not None or (n_jobs not in (None, 1) and len(tasks) > 1)
+    if parallel:
+        results = _run_shared(signals, tasks, n_jobs, executor)
+    else:
+        results = [
+            _segment_properties(signal, *args)
+            for signal, args in zip(tqdm(signals, desc="Segments"), tasks)
+        ]
 
-        fitter = FitBlinks(candidate_signal=signal, df=rows, params=params)
-        try:
-            fitter.dprocess_segment_raw(run_fit=run_fit)
-        except Exception as exc:  # pragma: no cover - safeguard against bad data
-            logger.warning("Skipping segment %d due to fit error: %s", seg_id, exc)
+    all_props = []
+    for seg_id, (props, error) in zip(seg_ids, results):
+        if props is None:
+            logger.warning("Skipping segment %d due to fit error: %s", seg_id, error)
             continue
-
-        props = BlinkProperties(
-            signal,
-            fitter.frame_blinks,
-            sfreq,
-            params,
-            fitted=run_fit,
-        ).df
         props["seg_id"] = seg_id
         all_props.append(props)
 
@@ -106,6 +106,59 @@ def left_right_zero_crossing(
     return left_zero, right_zero
 
 
+def negative_sample_index(candidate_signal: np.ndarray) -> np.ndarray:
+    """
+    Sorted indices of all negative samples of ``candidate_signal``.
+
+    Computing this once per signal lets :func:`left_right_zero_crossings`
+    answer every blink with a binary search instead of rescanning the signal.
+    """
+    return np.flatnonzero(np.asarray(candidate_signal) < 0)
+
+
+def left_right_zero_crossings(
+    candidate_signal: np.ndarray,
+    max_blinks: np.ndarray,
+    *,
+    negative_index: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorised :func:`left_right_zero_crossing` for many peaks of one signal.
+
+    The nearest zero crossing on the left of a peak is the last negative sample
+    before it and the one on the right is the first negative sample at or after
+    it. This is what the windowed search of :func:`left_right_zero_crossing`
+    returns once its fallback to the signal boundaries is taken into account,
+    so both are answered with :func:`numpy.searchsorted` on the sorted
+    negative-sample index in ``O((n + b) log n)``.
+
+    Parameters:
+        candidate_signal (np.ndarray): 1D array representing the signal data.
+        max_blinks (np.ndarray): Frame indices of the peaks.
+        negative_index (np.ndarray, optional): Result of
+            :func:`negative_sample_index` for ``candidate_signal``; computed when
+            omitted.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: ``(left_zero, right_zero)`` int64 arrays
+        with ``-1`` where no negative sample exists on that side.
+    """
+    if negative_index is None:
+        negative_index = negative_sample_index(candidate_signal)
+    peaks = np.asarray(max_blinks, dtype=np.int64)
+    pos = np.searchsorted(negative_index, peaks, side="left")
+    n_neg = negative_index.size
+
+    left_zero = np.full(peaks.shape, -1, dtype=np.int64)
+    has_left = pos > 0
+    left_zero[has_left] = negative_index[pos[has_left] - 1]
+
+    right_zero = np.full(peaks.shape, -1, dtype=np.int64)
+    has_right = pos < n_neg
+    right_zero[has_right] = negative_index[pos[has_right]]
+    return left_zero, right_zero
+
+
 def get_up_down_stroke(max_blink, left_zero, right_zero):
     """
     Compute the place of maximum positive and negative velocities.
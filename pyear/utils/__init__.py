@@ -1,6 +1,10 @@
 """Utility functions for pyear."""
+from .blink_table import BlinkTable, EpochGrouping, as_blink_table, group_blinks_by_epoch
+from .epoch_views import EpochView
 from .segments import slice_raw_to_segments
 from .epochs import (
+    assign_annotations_to_epochs,
+    epoch_times,
     slice_raw_into_epochs,
     save_epoch_raws,
     generate_epoch_report,
@@ -8,20 +12,33 @@ from .epochs import (
 )
 from .refinement import (
     refine_ear_extrema_and_threshold_stub,
+    refine_ear_extrema_and_threshold,
+    refine_ear_extrema_batch,
     refine_local_maximum_stub,
+    refine_local_maximum_batch,
     refine_blinks_from_epochs,
     plot_refined_blinks,
 )
 from .raw_preprocessing import prepare_refined_segments
 
 __all__ = [
+    "BlinkTable",
+    "EpochGrouping",
+    "as_blink_table",
+    "group_blinks_by_epoch",
+    "EpochView",
     "slice_raw_to_segments",
+    "assign_annotations_to_epochs",
+    "epoch_times",
     "slice_raw_into_epochs",
     "save_epoch_raws",
     "generate_epoch_report",
     "slice_into_mini_raws",
     "refine_ear_extrema_and_threshold_stub",
+    "refine_ear_extrema_and_threshold",
+    "refine_ear_extrema_batch",
     "refine_local_maximum_stub",
+    "refine_local_maximum_batch",
     "refine_blinks_from_epochs",
     "plot_refined_blinks",
     "prepare_refined_segments",
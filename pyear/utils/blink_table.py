@@ -0,0 +1,381 @@
+"""Columnar blink container used throughout the feature pipeline.
+
+Historically every refined blink was passed around as a dictionary holding its
+frame positions together with a reference to the full ``epoch_signal``. For
+long recordings this means tens of thousands of dictionaries and a
+``np.asarray(..., dtype=float)`` conversion for every blink in every feature
+group. :class:`BlinkTable` stores the same information as a struct of arrays:
+one integer array per frame field and a single 2-D matrix holding one signal
+row per epoch.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .derivatives import MAX_ORDER, DerivativeCache, segment_gradients
+
+logger = logging.getLogger(__name__)
+
+FRAME_FIELDS = (
+    "refined_start_frame",
+    "refined_peak_frame",
+    "refined_end_frame",
+)
+
+
+class BlinkTable:
+    """Struct-of-arrays representation of refined blinks.
+
+    Parameters
+    ----------
+    epoch_index : array-like of int
+        Epoch to which each blink belongs.
+    refined_start_frame, refined_peak_frame, refined_end_frame : array-like of int
+        Blink landmarks expressed as sample indices relative to the start of
+        the blink's epoch.
+    epoch_signals : numpy.ndarray | None, optional
+        2-D matrix of shape ``(n_epochs, n_times)`` whose row ``i`` holds the
+        signal of epoch ``i``. ``None`` creates a table without signals, which
+        is sufficient for blink-event features such as counts and IBIs.
+    signal_lengths : array-like of int | None, optional
+        Number of valid samples in each row of ``epoch_signals``. Rows may be
+        padded when epochs differ in length (e.g. a shorter final epoch). A
+        length of ``0`` marks an epoch without a signal. Defaults to the full
+        row width for every epoch.
+    """
+
+    def __init__(
+        self,
+        epoch_index: Sequence[int] | np.ndarray,
+        refined_start_frame: Sequence[int] | np.ndarray,
+        refined_peak_frame: Sequence[int] | np.ndarray,
+        refined_end_frame: Sequence[int] | np.ndarray,
+        epoch_signals: Optional[np.ndarray] = None,
+        *,
+        signal_lengths: Optional[Sequence[int] | np.ndarray] = None,
+    ) -> None:
+        self.epoch_index = np.asarray(epoch_index, dtype=np.int64).reshape(-1)
+        self.refined_start_frame = np.asarray(refined_start_frame, dtype=np.int64).reshape(-1)
+        self.refined_peak_frame = np.asarray(refined_peak_frame, dtype=np.int64).reshape(-1)
+        self.refined_end_frame = np.asarray(refined_end_frame, dtype=np.int64).reshape(-1)
+
+        n = self.epoch_index.size
+        for name in FRAME_FIELDS:
+            if getattr(self, name).size != n:
+                raise ValueError(
+                    f"{name} has {getattr(self, name).size} entries, expected {n}"
+                )
+
+        if epoch_signals is None:
+            epoch_signals = np.empty((0, 0), dtype=float)
+        epoch_signals = np.asarray(epoch_signals, dtype=float)
+        if epoch_signals.ndim != 2:
+            raise ValueError("epoch_signals must be a 2-D (n_epochs, n_times) matrix")
+        self.epoch_signals = epoch_signals
+
+        if signal_lengths is None:
+            signal_lengths = np.full(epoch_signals.shape[0], epoch_signals.shape[1])
+        self.signal_lengths = np.asarray(signal_lengths, dtype=np.int64).reshape(-1)
+        if self.signal_lengths.size != epoch_signals.shape[0]:
+            raise ValueError("signal_lengths must have one entry per epoch_signals row")
+        self._grouping: Optional[EpochGrouping] = None
+        self._derivative_caches: Dict[float, DerivativeCache] = {}
+
+    # ------------------------------------------------------------------
+    # Construction helpers
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_records(cls, blinks: Iterable[Mapping[str, Any]]) -> "BlinkTable":
+        """Build a table from the legacy list-of-dicts blink format.
+
+        The first ``epoch_signal`` encountered for an epoch is converted to
+        ``float`` once and stored as that epoch's row. Records without an
+        ``epoch_signal`` key are accepted; their epochs simply carry no signal.
+
+        Parameters
+        ----------
+        blinks : Iterable[Mapping[str, Any]]
+            Blink records with ``epoch_index`` and the refined frame fields.
+            The iterable is consumed exactly once, so generators are accepted.
+
+        Returns
+        -------
+        BlinkTable
+            Columnar copy of ``blinks``.
+        """
+        epoch_index: List[int] = []
+        frames: Dict[str, List[int]] = {name: [] for name in FRAME_FIELDS}
+        signals: Dict[int, np.ndarray] = {}
+        for blink in blinks:
+            idx = int(blink["epoch_index"])
+            epoch_index.append(idx)
+            for name in FRAME_FIELDS:
+                frames[name].append(int(blink[name]))
+            if idx >= 0 and idx not in signals and blink.get("epoch_signal") is not None:
+                signals[idx] = np.asarray(blink["epoch_signal"], dtype=float).reshape(-1)
+
+        n_rows = max(signals) + 1 if signals else 0
+        width = max((sig.size for sig in signals.values()), default=0)
+        matrix = np.full((n_rows, width), np.nan)
+        lengths = np.zeros(n_rows, dtype=np.int64)
+        for idx, sig in signals.items():
+            matrix[idx, : sig.size] = sig
+            lengths[idx] = sig.size
+
+        logger.debug(
+            "Converted %d blink records into a BlinkTable with %d signal rows",
+            len(epoch_index),
+            n_rows,
+        )
+        return cls(
+            epoch_index,
+            frames["refined_start_frame"],
+            frames["refined_peak_frame"],
+            frames["refined_end_frame"],
+            matrix,
+            signal_lengths=lengths,
+        )
+
+    def to_records(self, *, include_signal: bool = True) -> List[Dict[str, Any]]:
+        """Return the table in the legacy list-of-dicts format.
+
+        Parameters
+        ----------
+        include_signal : bool, optional
+            Attach each blink's epoch signal under ``epoch_signal``. Blinks
+            whose epoch has no signal are emitted without the key.
+
+        Returns
+        -------
+        list of dict
+            One dictionary per blink.
+        """
+        records: List[Dict[str, Any]] = []
+        for i in range(len(self)):
+            record: Dict[str, Any] = {"epoch_index": int(self.epoch_index[i])}
+            if include_signal:
+                signal = self.epoch_signal(int(self.epoch_index[i]))
+                if signal is not None:
+                    record["epoch_signal"] = signal
+            for name in FRAME_FIELDS:
+                record[name] = int(getattr(self, name)[i])
+            records.append(record)
+        return records
+
+    # ------------------------------------------------------------------
+    # Accessors
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return int(self.epoch_index.size)
+
+    def __repr__(self) -> str:
+        return (
+            f"BlinkTable(n_blinks={len(self)}, "
+            f"epoch_signals={self.epoch_signals.shape})"
+        )
+
+    @property
+    def n_signal_epochs(self) -> int:
+        """Number of rows in :attr:`epoch_signals`."""
+        return int(self.epoch_signals.shape[0])
+
+    def epoch_signal(self, epoch: int) -> Optional[np.ndarray]:
+        """Return the signal of ``epoch`` as a view, or ``None`` if unavailable."""
+        if not 0 <= epoch < self.n_signal_epochs:
+            return None
+        length = int(self.signal_lengths[epoch])
+        if length == 0:
+            return None
+        return self.epoch_signals[epoch, :length]
+
+    def take(self, indices: Union[np.ndarray, Sequence[int], slice]) -> "BlinkTable":
+        """Return a table containing only the selected blinks.
+
+        The signal matrix is shared with the parent table rather than copied.
+        """
+        table = BlinkTable(
+            self.epoch_index[indices],
+            self.refined_start_frame[indices],
+            self.refined_peak_frame[indices],
+            self.refined_end_frame[indices],
+            self.epoch_signals,
+            signal_lengths=self.signal_lengths,
+        )
+        table._derivative_caches = self._derivative_caches
+        return table
+
+    def derivatives(self, sfreq: float) -> DerivativeCache:
+        """Return the derivative cache of :attr:`epoch_signals`.
+
+        The cache is shared with every table derived through :meth:`take` or
+        :meth:`epoch`, so each feature group slices the same derivatives. It
+        lives in the current process; a table sent to a worker process starts
+        with an empty cache.
+        """
+        cache = self._derivative_caches.get(float(sfreq))
+        if cache is None:
+            cache = DerivativeCache(
+                self.epoch_signals, sfreq, signal_lengths=self.signal_lengths
+            )
+            cache = self._derivative_caches.setdefault(float(sfreq), cache)
+        return cache
+
+    @property
+    def grouping(self) -> "EpochGrouping":
+        """Epoch grouping index of this table, built on first access."""
+        if self._grouping is None:
+            n_epochs = int(self.epoch_index.max()) + 1 if len(self) else 0
+            self._grouping = EpochGrouping(self.epoch_index, max(n_epochs, 0))
+        return self._grouping
+
+    def group_by_epoch(self, n_epochs: int) -> "BlinkTable":
+        """Build the epoch grouping for ``n_epochs`` epochs and return ``self``.
+
+        Blinks whose ``epoch_index`` lies outside ``[0, n_epochs)`` are left
+        out of every group. Calling this again with the same ``n_epochs``
+        reuses the existing index.
+        """
+        if self._grouping is None or self._grouping.n_epochs != n_epochs:
+            self._grouping = EpochGrouping(self.epoch_index, n_epochs)
+        return self
+
+    def epoch(self, epoch: int) -> "BlinkTable":
+        """Return the blinks belonging to ``epoch`` in their original order."""
+        return self.take(self.grouping.indices(epoch))
+
+    def iter_frames(self) -> Iterator[Tuple[Optional[np.ndarray], int, int, int]]:
+        """Yield ``(epoch_signal, start, peak, end)`` for every blink."""
+        for i in range(len(self)):
+            yield (
+                self.epoch_signal(int(self.epoch_index[i])),
+                int(self.refined_start_frame[i]),
+                int(self.refined_peak_frame[i]),
+                int(self.refined_end_frame[i]),
+            )
+
+
+class EpochGrouping:
+    """Sorted epoch index with per-epoch offsets.
+
+    The blinks of epoch ``e`` are ``order[offsets[e]:offsets[e + 1]]``. A
+    stable sort keeps blinks of the same epoch in their original order, so
+    grouping once replaces the ``per_epoch`` bucketing each aggregator used to
+    perform on its own.
+
+    Parameters
+    ----------
+    epoch_index : numpy.ndarray
+        Epoch of every blink.
+    n_epochs : int
+        Number of epochs covered by the grouping.
+    """
+
+    def __init__(self, epoch_index: np.ndarray, n_epochs: int) -> None:
+        epoch_index = np.asarray(epoch_index, dtype=np.int64).reshape(-1)
+        self.n_epochs = int(n_epochs)
+        self.order = np.argsort(epoch_index, kind="stable")
+        self.sorted_epoch_index = epoch_index[self.order]
+        self.offsets = np.searchsorted(
+            self.sorted_epoch_index, np.arange(self.n_epochs + 1), side="left"
+        )
+
+    def __repr__(self) -> str:
+        return f"EpochGrouping(n_epochs={self.n_epochs}, n_blinks={self.order.size})"
+
+    def counts(self) -> np.ndarray:
+        """Number of blinks in each epoch."""
+        return np.diff(self.offsets)
+
+    def indices(self, epoch: int) -> np.ndarray:
+        """Row indices of the blinks in ``epoch``; empty when out of range."""
+        if not 0 <= epoch < self.n_epochs:
+            return self.order[:0]
+        return self.order[self.offsets[epoch] : self.offsets[epoch + 1]]
+
+
+BlinkInput = Union[BlinkTable, Iterable[Mapping[str, Any]]]
+
+
+def as_blink_table(blinks: BlinkInput) -> BlinkTable:
+    """Return ``blinks`` as a :class:`BlinkTable`, converting records if needed."""
+    if isinstance(blinks, BlinkTable):
+        return blinks
+    return BlinkTable.from_records(blinks)
+
+
+def group_blinks_by_epoch(blinks: BlinkInput, n_epochs: int) -> BlinkTable:
+    """Return ``blinks`` as a table grouped into ``n_epochs`` epochs.
+
+    Record iterables (including one-shot generators) are consumed once. A
+    table that already carries a grouping for ``n_epochs`` is returned
+    unchanged, which lets :func:`pyear.pipeline.extract_features` build the
+    index once and share it with every aggregator.
+    """
+    return as_blink_table(blinks).group_by_epoch(n_epochs)
+
+
+def iter_blink_frames(
+    blinks: BlinkInput,
+) -> Iterator[Tuple[Optional[np.ndarray], int, int, int]]:
+    """Yield ``(epoch_signal, start, peak, end)`` for table or record input.
+
+    This lets the per-epoch feature functions accept either representation
+    while sharing one array-based implementation.
+    """
+    if isinstance(blinks, BlinkTable):
+        yield from blinks.iter_frames()
+        return
+    for blink in blinks:
+        signal = blink.get("epoch_signal")
+        yield (
+            None if signal is None else np.asarray(signal, dtype=float),
+            int(blink["refined_start_frame"]),
+            int(blink["refined_peak_frame"]),
+            int(blink["refined_end_frame"]),
+        )
+
+
+def iter_blink_derivatives(
+    blinks: BlinkInput,
+    sfreq: float,
+    *,
+    order: int = MAX_ORDER,
+    edge_consistent: bool = True,
+) -> Iterator[Tuple[Optional[np.ndarray], int, int, int, Tuple[np.ndarray, ...]]]:
+    """Yield ``(epoch_signal, start, peak, end, derivatives)`` for every blink.
+
+    ``derivatives`` holds the velocity, acceleration and jerk of
+    ``epoch_signal[start : end + 1]`` up to ``order``. Table input slices the
+    recording-wide cache of :meth:`BlinkTable.derivatives`; record input
+    differentiates each blink segment on its own. ``edge_consistent`` is
+    forwarded to :meth:`~pyear.utils.derivatives.DerivativeCache.segment`
+    and keeps the one-sided edges of per-segment differentiation; only
+    ``edge_consistent=False`` is faster than differentiating every segment.
+    """
+    if not isinstance(blinks, BlinkTable):
+        for signal, start, peak, end in iter_blink_frames(blinks):
+            gradients = segment_gradients(signal[start : end + 1], sfreq, order)
+            yield signal, start, peak, end, gradients
+        return
+    cache = blinks.derivatives(sfreq)
+    for row, (signal, start, peak, end) in zip(blinks.epoch_index, blinks.iter_frames()):
+        if signal is None:
+            raise TypeError(f"epoch {int(row)} has no signal to differentiate")
+        gradients = cache.segment(
+            int(row), start, end, order=order, edge_consistent=edge_consistent
+        )
+        yield signal, start, peak, end, gradients
+
+
+def blink_frame_arrays(blinks: BlinkInput) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return ``(starts, peaks, ends)`` integer arrays for table or record input."""
+    if isinstance(blinks, BlinkTable):
+        return blinks.refined_start_frame, blinks.refined_peak_frame, blinks.refined_end_frame
+    blinks = list(blinks)
+    return tuple(  # type: ignore[return-value]
+        np.fromiter((int(b[name]) for b in blinks), dtype=np.int64, count=len(blinks))
+        for name in FRAME_FIELDS
+    )
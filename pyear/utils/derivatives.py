@@ -0,0 +1,191 @@
+"""Velocity, acceleration and jerk computed once per recording.
+
+Kinematic, energy and waveform features all differentiate the same blink
+segments with :func:`numpy.gradient`. :class:`DerivativeCache` differentiates
+every epoch signal once and hands out slices of the result instead.
+
+``np.gradient`` uses one-sided differences at both ends of its input, so the
+derivatives of an isolated segment differ from a slice of the continuous
+derivatives in the first and last ``order`` samples of the ``order``-th
+derivative. With ``edge_consistent=True`` exactly these samples are
+recomputed from the segment alone, which reproduces per-segment
+differentiation bit for bit while the interior still comes from the cache.
+That correction still slices and differentiates every segment, so it only
+exists to reproduce the numbers of per-segment differentiation and is not
+faster than it. ``edge_consistent=False`` returns the continuous derivatives
+unchanged and is the option that actually saves time.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAX_ORDER = 3
+
+
+def segment_gradients(
+    segment: np.ndarray, sfreq: float, order: int = MAX_ORDER
+) -> Tuple[np.ndarray, ...]:
+    """Differentiate an isolated segment ``order`` times with ``np.gradient``.
+
+    Parameters
+    ----------
+    segment : numpy.ndarray
+        Signal samples; at least two are required.
+    sfreq : float
+        Sampling frequency in Hertz.
+    order : int, optional
+        Number of successive derivatives, at most ``3``.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        Velocity, then acceleration and jerk as requested by ``order``.
+    """
+    dt = 1.0 / sfreq
+    derivatives = []
+    current = segment
+    for _ in range(order):
+        current = np.gradient(current, dt)
+        derivatives.append(current)
+    return tuple(derivatives)
+
+
+class DerivativeCache:
+    """Derivatives of every row of an epoch matrix, computed on first use.
+
+    Parameters
+    ----------
+    epoch_signals : numpy.ndarray
+        ``(n_epochs, n_times)`` signal matrix or a single continuous signal.
+    sfreq : float
+        Sampling frequency in Hertz.
+    signal_lengths : array-like of int | None, optional
+        Number of valid samples in every row; defaults to the full width.
+        Samples beyond a row's length are never differentiated.
+    """
+
+    def __init__(
+        self,
+        epoch_signals: np.ndarray,
+        sfreq: float,
+        *,
+        signal_lengths: Optional[np.ndarray] = None,
+    ) -> None:
+        signals = np.asarray(epoch_signals, dtype=float)
+        if signals.ndim == 1:
+            signals = signals[None, :]
+        self.epoch_signals = signals
+        self.sfreq = float(sfreq)
+        if signal_lengths is None:
+            signal_lengths = np.full(signals.shape[0], signals.shape[1])
+        self.signal_lengths = np.asarray(signal_lengths, dtype=np.int64).reshape(-1)
+        self._derivatives: list = []
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def derivative(self, order: int) -> np.ndarray:
+        """Return the ``order``-th derivative matrix (``1`` is velocity).
+
+        Rows are differentiated over their valid samples only; the padding,
+        and rows with fewer than two samples, hold ``NaN``.
+        """
+        if not 1 <= order <= MAX_ORDER:
+            raise ValueError(f"order must be between 1 and {MAX_ORDER}, got {order}")
+        with self._lock:
+            while len(self._derivatives) < order:
+                source = self._derivatives[-1] if self._derivatives else self.epoch_signals
+                result = np.full(source.shape, np.nan)
+                for length in np.unique(self.signal_lengths):
+                    if length < 2:
+                        continue
+                    rows = np.flatnonzero(self.signal_lengths == length)
+                    result[rows, :length] = np.gradient(
+                        source[rows, :length], 1.0 / self.sfreq, axis=1
+                    )
+                self._derivatives.append(result)
+                logger.debug("Cached derivative of order %d", len(self._derivatives))
+            return self._derivatives[order - 1]
+
+    @property
+    def velocity(self) -> np.ndarray:
+        """First derivative of every row."""
+        return self.derivative(1)
+
+    @property
+    def acceleration(self) -> np.ndarray:
+        """Second derivative of every row."""
+        return self.derivative(2)
+
+    @property
+    def jerk(self) -> np.ndarray:
+        """Third derivative of every row."""
+        return self.derivative(3)
+
+    def segment(
+        self,
+        row: int,
+        start: int,
+        end: int,
+        *,
+        order: int = MAX_ORDER,
+        edge_consistent: bool = True,
+    ) -> Tuple[np.ndarray, ...]:
+        """Derivatives of the inclusive span ``[start, end]`` of ``row``.
+
+        Parameters
+        ----------
+        row : int
+            Row (epoch) holding the segment.
+        start, end : int
+            Inclusive sample span of the segment.
+        order : int, optional
+            Number of derivatives to return, at most ``3``.
+        edge_consistent : bool, optional
+            If ``True`` (default) the result equals
+            :func:`segment_gradients` applied to ``signal[start : end + 1]``,
+            including its one-sided edges; this reproduces per-segment
+            numbers but costs as much as differentiating the segment. If
+            ``False`` the continuous derivatives are sliced without
+            correction, which is the fast path.
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            Velocity, then acceleration and jerk as requested by ``order``.
+        """
+        length = int(self.signal_lengths[row])
+        signal = self.epoch_signals[row, :length]
+        n_samples = end - start + 1
+        # spans the cache cannot serve keep the slicing rules of the segment
+        if not 0 <= start <= end < length or (edge_consistent and n_samples <= 2 * order):
+            return segment_gradients(signal[start : end + 1], self.sfreq, order)
+
+        sliced = [self.derivative(k)[row, start : end + 1] for k in range(1, order + 1)]
+        if not edge_consistent:
+            return tuple(sliced)
+        # only the first and last ``k`` samples of the k-th derivative see an edge
+        width = 2 * order
+        left = segment_gradients(signal[start : start + width], self.sfreq, order)
+        right = segment_gradients(signal[end + 1 - width : end + 1], self.sfreq, order)
+        patched = []
+        for k, (values, lo, hi) in enumerate(zip(sliced, left, right), start=1):
+            values = values.copy()
+            values[:k] = lo[:k]
+            values[-k:] = hi[-k:]
+            patched.append(values)
+        return tuple(patched)
+
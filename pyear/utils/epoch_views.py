@@ -0,0 +1,351 @@
+"""Lightweight per-epoch views over a continuous recording.
+
+:func:`pyear.utils.epochs.slice_raw_into_epochs` historically produced one
+``raw.copy().crop(...)`` per epoch. On a preloaded recording every copy
+duplicates the whole data array before cropping, so slicing costs
+``O(n_epochs x recording length)``. The :class:`EpochView` objects created
+here share a single array holding only the picked channels; each epoch is a
+slice of that array together with its shifted annotations. A full
+:class:`mne.io.BaseRaw` segment is only built when :meth:`EpochView.to_raw`
+is called.
+"""
+from __future__ import annotations
+
+import logging
+from typing import List, Optional, Sequence, Tuple, Union
+
+import mne
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+Picks = Union[str, Sequence[str], None]
+
+
+def epoch_sample_bounds(
+    raw: mne.io.BaseRaw, start: float, stop: float
+) -> Tuple[int, int]:
+    """Return the ``[smin, smax)`` samples kept by ``crop(start, stop)``.
+
+    Mirrors the rounding used by :meth:`mne.io.Raw.crop` with
+    ``include_tmax=False``.
+    """
+    sfreq = raw.info["sfreq"]
+    smin = int(round(start * sfreq))
+    smax = min(int(round(stop * sfreq)), raw.n_times)
+    return smin, smax
+
+
+def crop_epoch(raw: mne.io.BaseRaw, start: float, stop: float) -> mne.io.BaseRaw:
+    """Crop ``raw`` to ``[start, stop)`` and shift annotations to the segment.
+
+    Parameters
+    ----------
+    raw : mne.io.BaseRaw
+        Continuous recording.
+    start, stop : float
+        Epoch bounds in seconds relative to the first sample of ``raw``.
+
+    Returns
+    -------
+    mne.io.BaseRaw
+        Independent copy of the epoch.
+    """
+    mini = raw.copy().crop(tmin=start, tmax=stop, include_tmax=False)
+    ann_epoch = mini.annotations
+    shifted = mne.Annotations(
+        onset=ann_epoch.onset - start,
+        duration=ann_epoch.duration,
+        description=ann_epoch.description,
+    )
+    mini.set_annotations(shifted)
+    return mini
+
+
+def _clip_annotations(
+    onset: np.ndarray,
+    duration: np.ndarray,
+    lower: float,
+    upper: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Drop and clip annotations to ``[lower, upper]`` like ``Annotations.crop``.
+
+    Returns the kept mask together with the clipped onsets and durations of
+    the kept annotations.
+    """
+    duration = np.nan_to_num(duration)
+    offset = onset + duration
+    keep = (onset <= upper) & (offset >= lower)
+    onset = onset[keep]
+    offset = offset[keep]
+    duration = duration[keep]
+    clipped = (onset < lower) | (offset > upper)
+    new_onset = np.clip(onset, lower, upper)
+    new_offset = np.clip(offset, lower, upper)
+    duration = np.where(clipped, new_offset - new_onset, duration)
+    return keep, new_onset, duration
+
+
+class EpochView:
+    """Read-only view on one epoch of a continuous recording.
+
+    The view exposes the subset of the :class:`mne.io.BaseRaw` interface used
+    by the pyear feature and refinement code: ``info``, ``ch_names``,
+    ``n_times``, ``times``, ``first_samp``, ``first_time``, ``annotations``,
+    :meth:`get_data` and :meth:`get_channel_types`.
+
+    Parameters
+    ----------
+    raw : mne.io.BaseRaw
+        Recording the epoch belongs to. Used for :meth:`to_raw`.
+    data : numpy.ndarray
+        Array of shape ``(n_channels, n_times_total)`` holding the picked
+        channels of the whole recording. Shared between all views.
+    info : mne.Info
+        Measurement info restricted to the channels in ``data``.
+    start, stop : float
+        Epoch bounds in seconds relative to the first sample of ``raw``.
+    shift_annotations : bool, optional
+        Reproduce :func:`crop_epoch` (``True``, default) or a plain
+        ``raw.copy().crop(...)`` (``False``) when deriving annotations and
+        materialising the epoch.
+    """
+
+    def __init__(
+        self,
+        raw: mne.io.BaseRaw,
+        data: np.ndarray,
+        info: mne.Info,
+        start: float,
+        stop: float,
+        *,
+        shift_annotations: bool = True,
+    ) -> None:
+        self._raw = raw
+        self._data = data
+        self.info = info
+        self.start = float(start)
+        self.stop = float(stop)
+        self.shift_annotations = shift_annotations
+        self._smin, self._smax = epoch_sample_bounds(raw, start, stop)
+        self._annotations: Optional[mne.Annotations] = None
+        self._annotations_replaced = False
+
+    def __repr__(self) -> str:
+        return (
+            f"EpochView({self.start:.2f}-{self.stop:.2f}s, "
+            f"{len(self.ch_names)} channels, {self.n_times} samples)"
+        )
+
+    @property
+    def ch_names(self) -> List[str]:
+        """Names of the channels available in the view."""
+        return self.info["ch_names"]
+
+    @property
+    def n_times(self) -> int:
+        """Number of samples in the epoch."""
+        return self._smax - self._smin
+
+    @property
+    def first_samp(self) -> int:
+        """First sample of the epoch in the sample numbering of ``raw``."""
+        return self._raw.first_samp + self._smin
+
+    @property
+    def first_time(self) -> float:
+        """Time of the first sample in seconds, as in :attr:`mne.io.Raw.first_time`."""
+        return self.first_samp / self.info["sfreq"]
+
+    @property
+    def times(self) -> np.ndarray:
+        """Sample times in seconds relative to the epoch start."""
+        return np.arange(self.n_times) / self.info["sfreq"]
+
+    @property
+    def annotations(self) -> mne.Annotations:
+        """Annotations clipped to the epoch, as produced by :meth:`to_raw`."""
+        if self._annotations is None:
+            self._annotations = self._crop_annotations()
+        return self._annotations
+
+    def _crop_annotations(self) -> mne.Annotations:
+        ann = self._raw.annotations
+        length = self.n_times / self.info["sfreq"]
+        first_time = self.first_time
+        onset = np.asarray(ann.onset, dtype=float)
+        duration = np.asarray(ann.duration, dtype=float)
+        description = np.asarray(ann.description)
+
+        # crop() keeps annotations overlapping [first_time, first_time + length]
+        keep, onset, duration = _clip_annotations(
+            onset, duration, first_time, first_time + length
+        )
+        description = description[keep]
+        if self.shift_annotations:
+            # crop_epoch() then shifts by ``start`` and re-applies the segment range
+            keep, onset, duration = _clip_annotations(
+                onset - self.start, duration, 0.0, length
+            )
+            onset = onset + first_time
+            description = description[keep]
+        return mne.Annotations(
+            onset=onset,
+            duration=duration,
+            description=description,
+            orig_time=ann.orig_time,
+        )
+
+    def set_annotations(self, annotations: Optional[mne.Annotations]) -> "EpochView":
+        """Replace the annotations of the view.
+
+        Like :meth:`mne.io.Raw.set_annotations`, onsets of annotations without
+        ``orig_time`` are taken relative to the first sample of the epoch.
+        Annotations are not clipped to the epoch.
+        """
+        orig_time = self._raw.annotations.orig_time
+        if annotations is None:
+            annotations = mne.Annotations([], [], [], orig_time=orig_time)
+        elif annotations.orig_time is None:
+            annotations = mne.Annotations(
+                onset=np.asarray(annotations.onset) + self.first_time,
+                duration=annotations.duration,
+                description=annotations.description,
+                orig_time=orig_time,
+            )
+        self._annotations = annotations
+        self._annotations_replaced = True
+        return self
+
+    def _pick_rows(self, picks: Picks) -> Union[slice, List[int]]:
+        if picks is None:
+            return slice(None)
+        if isinstance(picks, str):
+            picks = [picks]
+        missing = [name for name in picks if name not in self.ch_names]
+        if missing:
+            raise ValueError(f"Channels {missing} are not available in this epoch view")
+        return [self.ch_names.index(name) for name in picks]
+
+    def get_data(self, picks: Picks = None) -> np.ndarray:
+        """Return the epoch data as a view on the shared array.
+
+        Parameters
+        ----------
+        picks : str | sequence of str | None, optional
+            Channel name(s) to return. ``None`` returns all channels.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of shape ``(n_picked, n_times)``. The array is not copied;
+            callers must not modify it in place.
+        """
+        rows = self._pick_rows(picks)
+        return self._data[rows, self._smin : self._smax]
+
+    def get_channel_types(self, picks: Picks = None) -> List[str]:
+        """Return the channel types of ``picks``."""
+        rows = self._pick_rows(picks)
+        types = self.info.get_channel_types()
+        if isinstance(rows, slice):
+            return list(types)
+        return [types[row] for row in rows]
+
+    def to_raw(self) -> mne.io.BaseRaw:
+        """Materialise the epoch as an independent :class:`mne.io.BaseRaw`.
+
+        All channels of the source recording are kept, exactly as returned by
+        :func:`crop_epoch` (or ``raw.copy().crop(...)`` when
+        ``shift_annotations`` is ``False``). Annotations replaced with
+        :meth:`set_annotations` are carried over.
+        """
+        if self.shift_annotations:
+            mini = crop_epoch(self._raw, self.start, self.stop)
+        else:
+            mini = self._raw.copy().crop(tmin=self.start, tmax=self.stop, include_tmax=False)
+        if self._annotations_replaced:
+            mini.set_annotations(self._annotations)
+        return mini
+
+
+def load_channels(
+    raw: mne.io.BaseRaw,
+    picks: Picks = None,
+    *,
+    chunk_duration: float = 600.0,
+) -> np.ndarray:
+    """Read only ``picks`` from ``raw`` into one array.
+
+    For recordings that are not preloaded the data are read in chunks of
+    ``chunk_duration`` seconds and copied into a preallocated array, so peak
+    memory scales with the picked channels rather than with every channel of
+    the file.
+
+    Parameters
+    ----------
+    raw : mne.io.BaseRaw
+        Recording to read.
+    picks : str | sequence of str | None, optional
+        Channels to read. ``None`` reads all channels.
+    chunk_duration : float, optional
+        Length of each read in seconds, by default ``600``.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape ``(n_picks, n_times)``.
+    """
+    if isinstance(picks, str):
+        picks = [picks]
+    ch_names = list(raw.ch_names) if picks is None else list(picks)
+    if raw.preload:
+        return raw.get_data(picks=ch_names)
+
+    chunk = max(int(round(chunk_duration * raw.info["sfreq"])), 1)
+    data = np.empty((len(ch_names), raw.n_times))
+    for start in range(0, raw.n_times, chunk):
+        stop = min(start + chunk, raw.n_times)
+        data[:, start:stop] = raw.get_data(picks=ch_names, start=start, stop=stop)
+    logger.debug(
+        "Read %d channel(s) in %d chunk(s)", len(ch_names), -(-raw.n_times // chunk)
+    )
+    return data
+
+
+def make_epoch_views(
+    raw: mne.io.BaseRaw,
+    times: Sequence[Tuple[float, float]],
+    picks: Picks = None,
+    *,
+    shift_annotations: bool = True,
+) -> List[EpochView]:
+    """Create :class:`EpochView` objects for ``times`` sharing one data array.
+
+    Parameters
+    ----------
+    raw : mne.io.BaseRaw
+        Continuous recording.
+    times : sequence of tuple
+        ``(start, stop)`` bounds of each epoch in seconds.
+    picks : str | sequence of str | None, optional
+        Channels to load. ``None`` loads every channel. Only these channels
+        are read, once, for the whole recording.
+    shift_annotations : bool, optional
+        Forwarded to :class:`EpochView`.
+
+    Returns
+    -------
+    list of EpochView
+        One view per entry in ``times``.
+    """
+    if isinstance(picks, str):
+        picks = [picks]
+    ch_names = list(raw.ch_names) if picks is None else list(picks)
+    logger.info("Loading %d channel(s) once for %d epoch views", len(ch_names), len(times))
+    data = load_channels(raw, ch_names)
+    info = mne.pick_info(raw.info, [raw.ch_names.index(name) for name in ch_names])
+    return [
+        EpochView(raw, data, info, start, stop, shift_annotations=shift_annotations)
+        for start, stop in times
+    ]
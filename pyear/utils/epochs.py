@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import List, Tuple, Optional, Sequence
+from typing import List, Tuple, Optional, Sequence, Union
 
 import matplotlib.pyplot as plt
 import mne
@@ -11,6 +11,8 @@ import numpy as np
 import pandas as pd
 from tqdm import tqdm
 
+from .epoch_views import EpochView, Picks, crop_epoch, make_epoch_views
+
 # -----------------------------------------------------------------------------
 # Configuration
 # -----------------------------------------------------------------------------
@@ -26,12 +28,83 @@ logger = logging.getLogger(__name__)
 # Core utility functions
 # -----------------------------------------------------------------------------
 
+def assign_annotations_to_epochs(
+    onsets: np.ndarray,
+    durations: np.ndarray,
+    starts: np.ndarray,
+    stops: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, List[Tuple[int, int]]]:
+    """Assign annotations to epochs and detect epoch-boundary crossings.
+
+    An annotation belongs to epoch ``i`` when ``starts[i] <= onset < stops[i]``.
+    Epochs are located with a single :func:`numpy.searchsorted` call, so the
+    cost is ``O(n log n)`` rather than one full scan of all annotations per
+    epoch.
+
+    Parameters
+    ----------
+    onsets, durations : numpy.ndarray
+        Annotation onsets and durations in seconds.
+    starts, stops : numpy.ndarray
+        Sorted, non-overlapping epoch bounds in seconds.
+
+    Returns
+    -------
+    numpy.ndarray
+        Number of annotations per epoch.
+    numpy.ndarray
+        Epoch index of each annotation, ``-1`` for annotations outside every
+        epoch.
+    list of tuple
+        One ``(i, i + 1)`` pair for each annotation that starts in epoch ``i``
+        and ends after ``stops[i]``, ordered by epoch. Annotations in the last
+        epoch are never paired.
+    """
+    onsets = np.asarray(onsets, dtype=float)
+    durations = np.asarray(durations, dtype=float)
+    starts = np.asarray(starts, dtype=float)
+    stops = np.asarray(stops, dtype=float)
+    n_epochs = starts.size
+
+    epoch_ids = np.searchsorted(starts, onsets, side="right") - 1
+    valid = epoch_ids >= 0
+    valid[valid] &= onsets[valid] < stops[epoch_ids[valid]]
+    epoch_ids = np.where(valid, epoch_ids, -1)
+
+    counts = np.bincount(epoch_ids[valid], minlength=n_epochs)
+    spans = valid & (epoch_ids + 1 < n_epochs)
+    spans[spans] &= (onsets[spans] + durations[spans]) > stops[epoch_ids[spans]]
+    crossing = np.sort(epoch_ids[spans], kind="stable")
+    boundary_pairs = [(int(i), int(i) + 1) for i in crossing]
+    return counts, epoch_ids, boundary_pairs
+
+
+def epoch_times(raw: mne.io.BaseRaw, epoch_len: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the start and stop times (seconds) of the epochs of ``raw``.
+
+    Epochs of ``epoch_len`` seconds tile the recording from its first sample;
+    the last epoch is cut at the final sample time.
+    """
+    total_time = raw.times[-1]
+    n_epochs = int(np.ceil(total_time / epoch_len))
+    starts = np.arange(n_epochs) * epoch_len
+    stops = np.minimum(starts + epoch_len, total_time)
+    return starts, stops
+
+
 def slice_raw_into_epochs(
     raw: mne.io.BaseRaw,
     *,
     epoch_len: float = EPOCH_LEN,
     blink_label: Optional[str] = BLINK_LABEL,
-) -> Tuple[List[mne.io.BaseRaw], pd.DataFrame, List[Tuple[int, int]], List[Tuple[float, float]]]:
+    as_views: bool = False,
+    picks: Picks = None,
+) -> Tuple[
+    List[Union[mne.io.BaseRaw, EpochView]],
+    pd.DataFrame,
+    List[Tuple[int, int]],
+    List[Tuple[float, float]],
+]:
     """Slice a raw recording into epochs and count blink annotations.
 
     Parameters
@@ -42,12 +115,20 @@ def slice_raw_into_epochs(
         Length of each epoch in seconds. Defaults to :data:`EPOCH_LEN`.
     blink_label : str | None, optional
         Annotation label to filter blinks. ``None`` counts all annotations.
+    as_views : bool, optional
+        Return lightweight :class:`~pyear.utils.epoch_views.EpochView`
+        objects instead of cropped copies. The picked channels are loaded
+        once and every view slices that array; call ``view.to_raw()`` to
+        materialise a full segment. Defaults to ``False``.
+    picks : str | sequence of str | None, optional
+        Channels loaded for the views. ``None`` loads all channels. Ignored
+        unless ``as_views`` is ``True``.
 
     Returns
     -------
-    list of mne.io.BaseRaw
+    list of mne.io.BaseRaw or list of EpochView
         Raw segments cropped from the input recording with annotations shifted
-        relative to each segment.
+        relative to each segment, or epoch views when ``as_views`` is set.
     pandas.DataFrame
         Blink counts per epoch with columns ``epoch_id`` and ``blink_count``.
     list of tuple
@@ -65,36 +146,21 @@ def slice_raw_into_epochs(
     onsets = ann.onset[mask]
     durations = ann.duration[mask]
 
-    total_time = raw.times[-1]
-    n_epochs = int(np.ceil(total_time / epoch_len))
-    counts: List[int] = [0] * n_epochs
-    boundary_pairs: List[Tuple[int, int]] = []
-    segments: List[mne.io.BaseRaw] = []
-    times: List[Tuple[float, float]] = []
-
-    for i in tqdm(range(n_epochs), desc="Cropping epochs", unit="epoch"):
-        start = i * epoch_len
-        stop = min(start + epoch_len, total_time)
-        times.append((start, stop))
-
-        in_epoch = (onsets >= start) & (onsets < stop)
-        counts[i] = int(np.sum(in_epoch))
-        spans = in_epoch & ((onsets + durations) > stop)
-        for _ in np.where(spans)[0]:
-            if i + 1 < n_epochs:
-                boundary_pairs.append((i, i + 1))
-
-        mini = raw.copy().crop(tmin=start, tmax=stop, include_tmax=False)
-        ann_epoch = mini.annotations
-        shifted = mne.Annotations(
-            onset=ann_epoch.onset - start,
-            duration=ann_epoch.duration,
-            description=ann_epoch.description,
-        )
-        mini.set_annotations(shifted)
-        segments.append(mini)
+    starts, stops = epoch_times(raw, epoch_len)
+    n_epochs = starts.size
+    times: List[Tuple[float, float]] = list(zip(starts.tolist(), stops.tolist()))
+    counts, _, boundary_pairs = assign_annotations_to_epochs(onsets, durations, starts, stops)
+
+    segments: List[Union[mne.io.BaseRaw, EpochView]]
+    if as_views:
+        segments = make_epoch_views(raw, times, picks)
+    else:
+        segments = [
+            crop_epoch(raw, start, stop)
+            for start, stop in tqdm(times, desc="Cropping epochs", unit="epoch")
+        ]
 
-    df = pd.DataFrame({"epoch_id": range(n_epochs), "blink_count": counts})
+    df = pd.DataFrame({"epoch_id": range(n_epochs), "blink_count": counts.tolist()})
     logger.debug("Blink counts per epoch: %s", counts)
     logger.debug("Cross-boundary pairs: %s", boundary_pairs)
     return segments, df, boundary_pairs, times
@@ -0,0 +1,157 @@
+"""Helpers for batched operations over variable-length windows.
+
+Blink-level computations often apply the same reduction (maximum, argmax,
+sum, ...) to many short windows of a longer signal. Rather than slicing the
+signal once per blink, the windows are gathered into one flat array with
+``offsets`` marking where each window starts, and the reduction is applied
+with a single ``ufunc.reduceat`` call.
+"""
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+
+def ragged_indices(
+    starts: np.ndarray, lengths: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return flat indices covering ``[starts[i], starts[i] + lengths[i])``.
+
+    Parameters
+    ----------
+    starts : numpy.ndarray
+        First index of every window.
+    lengths : numpy.ndarray
+        Number of samples in every window. Must be non-negative.
+
+    Returns
+    -------
+    numpy.ndarray
+        Concatenated indices of all windows.
+    numpy.ndarray
+        ``offsets`` of length ``n_windows + 1``; window ``i`` occupies
+        ``flat[offsets[i]:offsets[i + 1]]``.
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    offsets = np.zeros(lengths.size + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    # position inside each window, then shift by the window start
+    within = np.arange(offsets[-1], dtype=np.int64) - np.repeat(offsets[:-1], lengths)
+    return np.repeat(starts, lengths) + within, offsets
+
+
+def segment_ids(offsets: np.ndarray) -> np.ndarray:
+    """Return the window number of every element described by ``offsets``."""
+    lengths = np.diff(offsets)
+    return np.repeat(np.arange(lengths.size), lengths)
+
+
+def segment_argmax(values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """Position of the first maximum of each non-empty window.
+
+    Matches :func:`numpy.argmax` applied to every window separately,
+    including returning the first ``NaN`` when a window contains one.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        Concatenated window values.
+    offsets : numpy.ndarray
+        Window boundaries as returned by :func:`ragged_indices`. Every
+        window must contain at least one element.
+
+    Returns
+    -------
+    numpy.ndarray
+        Index of the maximum relative to the start of each window.
+    """
+    values = np.asarray(values, dtype=float)
+    if offsets.size <= 1:
+        return np.zeros(0, dtype=np.int64)
+    lengths = np.diff(offsets)
+    maxima = np.maximum.reduceat(values, offsets[:-1])
+    expanded = np.repeat(maxima, lengths)
+    hit = (values == expanded) | (np.isnan(values) & np.isnan(expanded))
+    hit_pos = np.flatnonzero(hit)
+    ids = segment_ids(offsets)[hit_pos]
+    # hits are in ascending order, so the first hit of each window comes first
+    first = np.searchsorted(ids, np.arange(lengths.size), side="left")
+    return hit_pos[first] - offsets[:-1]
+
+
+def segment_argmin(values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """Position of the first minimum of each non-empty window.
+
+    See :func:`segment_argmax`.
+    """
+    return segment_argmax(-np.asarray(values, dtype=float), offsets)
+
+
+def segment_first_true(mask: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """Position of the first ``True`` of each window, or ``-1`` if none.
+
+    Parameters
+    ----------
+    mask : numpy.ndarray
+        Concatenated boolean window values.
+    offsets : numpy.ndarray
+        Window boundaries as returned by :func:`ragged_indices`.
+
+    Returns
+    -------
+    numpy.ndarray
+        Index relative to the start of each window.
+    """
+    n_windows = offsets.size - 1
+    hit_pos = np.flatnonzero(mask)
+    ids = segment_ids(offsets)[hit_pos]
+    first = np.searchsorted(ids, np.arange(n_windows), side="left")
+    found = first < hit_pos.size
+    found[found] = ids[first[found]] == np.flatnonzero(found)
+    result = np.full(n_windows, -1, dtype=np.int64)
+    result[found] = hit_pos[first[found]] - offsets[:-1][found]
+    return result
+
+
+def segment_last_true(mask: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """Position of the last ``True`` of each window, or ``-1`` if none.
+
+    See :func:`segment_first_true`.
+    """
+    n_windows = offsets.size - 1
+    hit_pos = np.flatnonzero(mask)
+    ids = segment_ids(offsets)[hit_pos]
+    last = np.searchsorted(ids, np.arange(n_windows), side="right") - 1
+    found = last >= 0
+    found[found] = ids[last[found]] == np.flatnonzero(found)
+    result = np.full(n_windows, -1, dtype=np.int64)
+    result[found] = hit_pos[last[found]] - offsets[:-1][found]
+    return result
+
+
+def run_length_encode(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Split ``values`` into runs of equal consecutive elements.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        One-dimensional integer or boolean array.
+
+    Returns
+    -------
+    numpy.ndarray
+        Index of the first element of every run.
+    numpy.ndarray
+        Length of every run.
+    numpy.ndarray
+        Value shared by the elements of every run.
+    """
+    values = np.asarray(values).reshape(-1)
+    if values.size == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty.copy(), values[:0]
+    starts = np.concatenate(([0], np.flatnonzero(values[1:] != values[:-1]) + 1))
+    lengths = np.diff(np.append(starts, values.size))
+    return starts, lengths, values[starts]
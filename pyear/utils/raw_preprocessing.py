@@ -10,6 +10,7 @@ from mne.io import BaseRaw
 from tqdm import tqdm
 
 from .blink_refinement_helpers import group_refined_by_epoch
+from .epoch_views import EpochView
 from .epochs import slice_raw_into_epochs, EPOCH_LEN
 from .refinement import refine_blinks_from_epochs
 
@@ -18,7 +19,7 @@ logger = logging.getLogger(__name__)
 
 
 def _update_segment_annotations(
-    segments: Sequence[mne.io.BaseRaw],
+    segments: Sequence[Union[mne.io.BaseRaw, EpochView]],
     refined: Sequence[Dict[str, int]],
 ) -> None:
     """Update annotations on each segment with refined blink timings."""
@@ -57,7 +58,8 @@ def prepare_refined_segments(
     *,
     epoch_len: float = EPOCH_LEN,
     keep_epoch_signal: bool = False,
-) -> tuple[list[BaseRaw], list[dict[str, Any]]]:
+    channels_only: bool = False,
+) -> tuple[list[Union[BaseRaw, EpochView]], list[dict[str, Any]]]:
     """Load and prepare raw segments with refined blink annotations.
 
     This routine is intended for ``mne.io.Raw`` recordings that already contain
@@ -81,10 +83,17 @@ def prepare_refined_segments(
     keep_epoch_signal : bool, optional
         If ``True``, keep the ``epoch_signal`` field in the returned refined
         blink dictionaries. This can be useful for manual inspection.
+    channels_only : bool, optional
+        If ``True``, read only ``channel`` from the recording (in chunks when
+        it is not preloaded) and return
+        :class:`~pyear.utils.epoch_views.EpochView` segments over that single
+        channel. Peak memory then scales with one channel instead of every
+        channel in the file. Call ``segment.to_raw()`` to obtain a full
+        segment. Defaults to ``False``.
 
     Returns
     -------
-    list of mne.io.BaseRaw
+    list of mne.io.BaseRaw or list of EpochView
         Segmented raws with updated annotations.
     list of dict
         Refined blink information per annotation.
@@ -100,7 +109,9 @@ def prepare_refined_segments(
     if len(raw.annotations) == 0:
         raise ValueError("Raw recording has no annotations to refine")
 
-    segments, _, _, _ = slice_raw_into_epochs(raw, epoch_len=epoch_len)
+    segments, _, _, _ = slice_raw_into_epochs(
+        raw, epoch_len=epoch_len, as_views=channels_only, picks=channel
+    )
     refined = refine_blinks_from_epochs(segments, channel)
 
     # segments[1].plot(block=True)
@@ -8,6 +8,9 @@ import matplotlib.pyplot as plt
 import mne
 import numpy as np
 
+from .blink_table import BlinkTable
+from .ragged import ragged_indices, segment_argmax
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,9 +26,10 @@ def refine_ear_extrema_and_threshold_stub(
 ) -> Tuple[int, int, int]:
     """Return a crude EAR trough refinement.
 
-    Parameters mirror those of the real refinement routine but the
-    implementation merely validates that indices are within bounds and
-    estimates a trough location if ``peak_rel_cvat`` is not supplied.
+    Parameters mirror those of :func:`refine_ear_extrema_and_threshold` but
+    the implementation merely validates that indices are within bounds and
+    estimates a trough location if ``peak_rel_cvat`` is not supplied. Use
+    the real routine (or :func:`refine_ear_extrema_batch`) for actual data.
 
     Returns
     -------
@@ -48,8 +52,248 @@ def refine_ear_extrema_and_threshold_stub(
     return rs_stub, valid_trough, re_stub
 
 
-import numpy as np
-from typing import Tuple
+# upper bound on the number of window samples laid out at once
+_BATCH_SAMPLES = 1 << 22
+
+
+def _peak_prominence(
+    highs: np.ndarray, lows: np.ndarray, peak_rows: np.ndarray, peak_cols: np.ndarray
+) -> np.ndarray:
+    """Prominence of the local maxima at ``(peak_rows, peak_cols)``.
+
+    ``highs`` and ``lows`` are the padded windows with samples outside the
+    window set to ``-inf`` and ``+inf``. From every peak the window is
+    followed on each side up to the nearest strictly higher sample; the base
+    of that side is the lowest sample passed on the way. The prominence is the
+    peak height above the higher of the two bases. A side that reaches the
+    window edge first cannot be judged from inside the window and is ignored;
+    if both sides do, the lowest sample of the window is the base.
+    """
+    span = highs.shape[1]
+    cols = np.arange(span)
+    prominence = np.empty(peak_rows.size)
+    step = max(_BATCH_SAMPLES // max(span, 1), 1)
+    for first in range(0, peak_rows.size, step):
+        rows = peak_rows[first : first + step]
+        at = peak_cols[first : first + step, None]
+        height = highs[rows, at[:, 0]]
+        higher = highs[rows] > height[:, None]
+        left_stop = np.where(higher & (cols < at), cols, -1).max(axis=1)
+        right_stop = np.where(higher & (cols > at), cols, span).min(axis=1)
+        row_lows = lows[rows]
+        left_base = np.where((cols > left_stop[:, None]) & (cols <= at), row_lows, np.inf).min(axis=1)
+        right_base = np.where((cols >= at) & (cols < right_stop[:, None]), row_lows, np.inf).min(axis=1)
+
+        left_open = left_stop >= 0
+        right_open = right_stop < span
+        base = np.where(
+            left_open & right_open,
+            np.maximum(left_base, right_base),
+            np.where(
+                left_open,
+                left_base,
+                np.where(right_open, right_base, np.minimum(left_base, right_base)),
+            ),
+        )
+        prominence[first : first + step] = height - base
+    return prominence
+
+
+def _refine_ear_chunk(
+    flat: np.ndarray,
+    width: int,
+    epoch_index: np.ndarray,
+    rs: np.ndarray,
+    re: np.ndarray,
+    ws: np.ndarray,
+    we: np.ndarray,
+    cvat: Optional[np.ndarray],
+    local_max_prominence: float,
+    value_threshold: float | None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Trough and shoulder offsets from ``ws`` for one chunk of blinks."""
+    n_blinks = epoch_index.size
+    span = int((we - ws).max(initial=0)) + 1
+    cols = np.arange(span)
+    idx = ws[:, None] + cols
+    in_window = idx <= we[:, None]
+    gather = np.where(in_window, epoch_index[:, None] * width + idx, 0)
+    values = np.where(in_window, flat[gather], np.nan)
+
+    # trough: annotated frame if usable, otherwise minimum of [rs, re]
+    in_core = (idx >= rs[:, None]) & (idx <= re[:, None])
+    core = np.where(in_core & ~np.isnan(values), values, np.inf)
+    trough = np.argmin(core, axis=1)
+    if cvat is not None:
+        use_cvat = (cvat >= rs) & (cvat <= re)
+        trough = np.where(use_cvat, cvat - ws, trough)
+
+    # shoulders: local maxima prominent enough, or samples above the threshold
+    neg_inf = np.full((n_blinks, 1), -np.inf)
+    highs = np.where(np.isnan(values), -np.inf, values)
+    left_nb = np.hstack([neg_inf, highs[:, :-1]])
+    right_nb = np.hstack([highs[:, 1:], neg_inf])
+    peaks = (highs >= left_nb) & (highs >= right_nb) & in_window
+    peak_rows, peak_cols = np.nonzero(peaks)
+    lows = np.where(np.isnan(values), np.inf, values)
+    prominent = _peak_prominence(highs, lows, peak_rows, peak_cols) >= local_max_prominence
+    shoulder = np.zeros_like(peaks)
+    shoulder[peak_rows[prominent], peak_cols[prominent]] = True
+    if value_threshold is not None:
+        shoulder |= (highs >= value_threshold) & in_window
+
+    rel_trough = trough[:, None]
+    left = np.where(shoulder & (cols < rel_trough), cols, -1).max(axis=1, initial=-1)
+    right = np.where(shoulder & (cols > rel_trough), cols, span).min(axis=1, initial=span)
+    left = np.where(left < 0, 0, left)
+    right = np.where(right >= span, we - ws, right)
+    return left, trough, right
+
+
+def refine_ear_extrema_batch(
+    epoch_signals: np.ndarray,
+    epoch_index: np.ndarray,
+    start_rel: np.ndarray,
+    end_rel: np.ndarray,
+    *,
+    peak_rel_cvat: Optional[np.ndarray] = None,
+    signal_lengths: Optional[np.ndarray] = None,
+    local_max_prominence: float = 0.01,
+    search_expansion_frames: int = 5,
+    value_threshold: float | None = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Refine EAR blink troughs and shoulders for many blinks at once.
+
+    For every blink the trough is the minimum of the signal between the
+    clipped ``start_rel`` and ``end_rel`` (or ``peak_rel_cvat`` when it lies in
+    that range). The search window is then widened by
+    ``search_expansion_frames`` on each side and the blink start and end are
+    the shoulders closest to the trough on the left and right. A shoulder is a
+    local maximum whose prominence within the widened window is at least
+    ``local_max_prominence`` or, when ``value_threshold`` is given, any sample
+    at or above that value. Prominence is measured as in
+    :func:`scipy.signal.peak_prominences`, except that a flank cut off by the
+    window edge does not bound it, so small bumps on a flank are walked past.
+    If no shoulder is found the edge of the widened window is used.
+
+    Blinks are sorted by window length and laid out in padded
+    ``(n_blinks, width)`` chunks of bounded size, so one long annotation does
+    not widen the array of every other blink.
+
+    Parameters
+    ----------
+    epoch_signals : numpy.ndarray
+        2-D array whose row ``i`` holds the EAR signal of epoch ``i``.
+    epoch_index : numpy.ndarray
+        Epoch (row of ``epoch_signals``) of every blink.
+    start_rel, end_rel : numpy.ndarray
+        Unrefined start and end frames relative to the epoch.
+    peak_rel_cvat : numpy.ndarray | None, optional
+        Annotated trough frames; negative values mark missing entries.
+    signal_lengths : numpy.ndarray | None, optional
+        Number of valid samples in each row. Defaults to the row width.
+    local_max_prominence : float, optional
+        Minimum prominence of a shoulder.
+    search_expansion_frames : int, optional
+        Frames added on each side of the annotation when searching shoulders.
+    value_threshold : float | None, optional
+        EAR value regarded as an open eye.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        ``(start_frame, trough_frame, end_frame)`` within each epoch.
+    """
+    epoch_signals = np.asarray(epoch_signals, dtype=float)
+    epoch_index = np.asarray(epoch_index, dtype=np.int64)
+    start_rel = np.asarray(start_rel, dtype=np.int64)
+    end_rel = np.asarray(end_rel, dtype=np.int64)
+    width = epoch_signals.shape[1] if epoch_signals.ndim == 2 else 0
+    if signal_lengths is None:
+        signal_lengths = np.full(epoch_signals.shape[0], width, dtype=np.int64)
+    n = np.asarray(signal_lengths, dtype=np.int64)[epoch_index]
+    n_blinks = epoch_index.size
+    cvat = None if peak_rel_cvat is None else np.asarray(peak_rel_cvat, dtype=np.int64)
+
+    last = np.maximum(n - 1, 0)
+    rs = np.clip(start_rel, 0, last)
+    re = np.clip(end_rel, 0, last)
+    rs = np.minimum(rs, re)
+    expansion = max(int(search_expansion_frames), 0)
+    ws = np.maximum(rs - expansion, 0)
+    we = np.minimum(re + expansion, last)
+
+    flat = epoch_signals.reshape(-1)
+    if flat.size == 0:
+        flat = np.zeros(1)
+    left = np.zeros(n_blinks, dtype=np.int64)
+    trough = np.zeros(n_blinks, dtype=np.int64)
+    right = np.zeros(n_blinks, dtype=np.int64)
+
+    spans = we - ws + 1
+    order = np.argsort(spans, kind="stable")
+    sorted_spans = spans[order]
+    first = 0
+    while first < n_blinks:
+        # padded size of the chunk grows with both its length and its widest window
+        cost = np.arange(1, n_blinks - first + 1) * sorted_spans[first:]
+        stop = first + max(int(np.searchsorted(cost, _BATCH_SAMPLES, side="right")), 1)
+        chunk = order[first:stop]
+        left[chunk], trough[chunk], right[chunk] = _refine_ear_chunk(
+            flat,
+            width,
+            epoch_index[chunk],
+            rs[chunk],
+            re[chunk],
+            ws[chunk],
+            we[chunk],
+            None if cvat is None else cvat[chunk],
+            local_max_prominence,
+            value_threshold,
+        )
+        first = stop
+
+    starts = ws + left
+    troughs = ws + trough
+    ends = ws + right
+    empty = n == 0
+    starts[empty] = troughs[empty] = ends[empty] = 0
+    return starts, troughs, ends
+
+
+def refine_ear_extrema_and_threshold(
+    signal_segment: np.ndarray,
+    start_rel: int,
+    end_rel: int,
+    peak_rel_cvat: int | None = None,
+    *,
+    local_max_prominence: float = 0.01,
+    search_expansion_frames: int = 5,
+    value_threshold: float | None = None,
+) -> Tuple[int, int, int]:
+    """Refine the trough and shoulders of a single EAR blink.
+
+    Per-blink interface to :func:`refine_ear_extrema_batch`; see that
+    function for the refinement rules.
+
+    Returns
+    -------
+    tuple
+        ``(start_frame, trough_frame, end_frame)`` indices within the segment.
+    """
+    signal = np.asarray(signal_segment, dtype=float).reshape(1, -1)
+    starts, troughs, ends = refine_ear_extrema_batch(
+        signal,
+        np.zeros(1, dtype=np.int64),
+        np.array([start_rel]),
+        np.array([end_rel]),
+        peak_rel_cvat=None if peak_rel_cvat is None else np.array([peak_rel_cvat]),
+        local_max_prominence=local_max_prominence,
+        search_expansion_frames=search_expansion_frames,
+        value_threshold=value_threshold,
+    )
+    return int(starts[0]), int(troughs[0]), int(ends[0])
+
 
 def refine_local_maximum_stub(
         signal_segment: np.ndarray,
@@ -93,6 +337,62 @@ def refine_local_maximum_stub(
 
 
 
+def refine_local_maximum_batch(
+    epoch_signals: np.ndarray,
+    epoch_index: np.ndarray,
+    start_rel: np.ndarray,
+    end_rel: np.ndarray,
+    *,
+    signal_lengths: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Batched :func:`refine_local_maximum_stub` for many blinks at once.
+
+    The search windows of all blinks are gathered into one flat array and the
+    maximum of each window is found with ``np.maximum.reduceat``.
+
+    Parameters
+    ----------
+    epoch_signals : numpy.ndarray
+        2-D array whose row ``i`` holds the signal of epoch ``i``.
+    epoch_index : numpy.ndarray
+        Epoch (row of ``epoch_signals``) of every blink.
+    start_rel, end_rel : numpy.ndarray
+        Unrefined start and end frames relative to the epoch.
+    signal_lengths : numpy.ndarray | None, optional
+        Number of valid samples in each row. Defaults to the row width.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        ``(start_frame, peak_frame, end_frame)`` arrays, identical to calling
+        :func:`refine_local_maximum_stub` for every blink without a CVAT peak.
+    """
+    epoch_signals = np.asarray(epoch_signals, dtype=float)
+    epoch_index = np.asarray(epoch_index, dtype=np.int64)
+    start_rel = np.asarray(start_rel, dtype=np.int64)
+    end_rel = np.asarray(end_rel, dtype=np.int64)
+    width = epoch_signals.shape[1] if epoch_signals.ndim == 2 else 0
+    if signal_lengths is None:
+        signal_lengths = np.full(epoch_signals.shape[0], width, dtype=np.int64)
+    n = np.asarray(signal_lengths, dtype=np.int64)[epoch_index]
+
+    last = np.maximum(n - 1, 0)
+    rs = np.clip(start_rel, 0, last)
+    re = np.clip(end_rel, 0, last)
+    rs = np.minimum(rs, re)
+
+    peaks = rs.copy()
+    valid = n > 0
+    if valid.any():
+        flat_idx, offsets = ragged_indices(
+            epoch_index[valid] * width + rs[valid], re[valid] - rs[valid] + 1
+        )
+        values = epoch_signals.reshape(-1)[flat_idx]
+        peaks[valid] = rs[valid] + segment_argmax(values, offsets)
+    rs[~valid] = re[~valid] = peaks[~valid] = 0
+    return rs, peaks, re
+
+
 def plot_refined_blinks(
     refined_blinks: Sequence[Dict[str, Any]],
     sfreq: float,
@@ -160,6 +460,57 @@ def plot_refined_blinks(
     return figs
 
 
+def _segment_annotation_frames(
+    segments: Sequence[mne.io.BaseRaw],
+    channel: str,
+    sfreq: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Collect segment signals and annotation frames as arrays.
+
+    Returns the padded signal matrix, the number of samples per segment and
+    the epoch index, start frame and end frame of every annotation.
+    """
+    signals = [raw.get_data(picks=channel)[0] for raw in segments]
+    lengths = np.array([sig.size for sig in signals], dtype=np.int64)
+    matrix = np.full((len(signals), int(lengths.max(initial=0))), np.nan)
+    for row, sig in enumerate(signals):
+        matrix[row, : sig.size] = sig
+
+    epoch_index, starts, ends = [], [], []
+    for idx, raw in enumerate(segments):
+        ann = raw.annotations
+        onset = np.asarray(ann.onset, dtype=float) - raw.first_time
+        epoch_index.append(np.full(onset.size, idx, dtype=np.int64))
+        starts.append(np.rint(onset * sfreq))
+        ends.append(np.rint((onset + np.asarray(ann.duration, dtype=float)) * sfreq))
+    return (
+        matrix,
+        lengths,
+        np.concatenate(epoch_index).astype(np.int64),
+        np.concatenate(starts).astype(np.int64),
+        np.concatenate(ends).astype(np.int64),
+    )
+
+
+def _local_maximum_batch(matrix, epoch_index, starts, ends, *, signal_lengths, **_params):
+    return refine_local_maximum_batch(
+        matrix, epoch_index, starts, ends, signal_lengths=signal_lengths
+    )
+
+
+def _ear_extrema_batch(matrix, epoch_index, starts, ends, *, signal_lengths, **params):
+    return refine_ear_extrema_batch(
+        matrix, epoch_index, starts, ends, signal_lengths=signal_lengths, **params
+    )
+
+
+# Per-blink refiners with an equivalent batched implementation
+_BATCH_REFINERS: Dict[Callable[..., Tuple[int, int, int]], Callable[..., Tuple[np.ndarray, np.ndarray, np.ndarray]]] = {
+    refine_local_maximum_stub: _local_maximum_batch,
+    refine_ear_extrema_and_threshold: _ear_extrema_batch,
+}
+
+
 def refine_blinks_from_epochs(
     segments: Sequence[mne.io.BaseRaw],
     channel: str,
@@ -168,9 +519,15 @@ def refine_blinks_from_epochs(
     local_max_prominence: float = 0.01,
     search_expansion_frames: int | None = None,
     value_threshold: float | None = None,
-) -> List[Dict[str, Any]]:
+    as_table: bool = False,
+) -> List[Dict[str, Any]] | BlinkTable:
     """Refine blink annotations within pre-sliced raw segments.
 
+    Refiners with a batched counterpart (:func:`refine_local_maximum_stub`
+    and :func:`refine_ear_extrema_and_threshold`) are applied to all blinks
+    of all segments at once; any other ``refine_func`` is called once per
+    blink.
+
     Parameters
     ----------
     segments : sequence of mne.io.BaseRaw
@@ -188,42 +545,51 @@ def refine_blinks_from_epochs(
         ``int(0.1 * sfreq)``.
     value_threshold : float | None, optional
         Threshold parameter for ``refine_func``.
+    as_table : bool, optional
+        Return a :class:`~pyear.utils.blink_table.BlinkTable` instead of a
+        list of dictionaries. Defaults to ``False``.
 
     Returns
     -------
-    list of dict
+    list of dict or BlinkTable
         Refined blink annotations with keys ``epoch_index``,
         ``epoch_signal``, ``refined_start_frame``, ``refined_peak_frame`` and
-        ``refined_end_frame``.
+        ``refined_end_frame``, or the equivalent table when ``as_table`` is set.
     """
     logger.info("Refining blinks across %d segments", len(segments))
-    refined: List[Dict[str, Any]] = []
     if not segments:
-        return refined
+        return BlinkTable([], [], [], []) if as_table else []
     sfreq = segments[0].info["sfreq"]
     if search_expansion_frames is None:
         search_expansion_frames = int(0.1 * sfreq)
 
-    for epoch_index, raw in enumerate(segments):
-        signal = raw.get_data(picks=channel)[0]
-        for ann in raw.annotations:
-            onset = float(ann["onset"]) - raw.first_time
-            start_frame = int(round(onset * sfreq))
-            end_frame = int(round((onset + float(ann["duration"])) * sfreq))
-            r_start, r_peak, r_end = refine_func(
-                signal,
-                start_frame,
-                end_frame,
-                None,
-            )
-            refined.append(
-                {
-                    "epoch_index": epoch_index,
-                    "epoch_signal": signal,
-                    "refined_start_frame": r_start,
-                    "refined_peak_frame": r_peak,
-                    "refined_end_frame": r_end,
-                }
-            )
-    logger.info("Refined %d blink annotations", len(refined))
-    return refined
+    matrix, lengths, epoch_index, start_frames, end_frames = _segment_annotation_frames(
+        segments, channel, sfreq
+    )
+    batch_func = _BATCH_REFINERS.get(refine_func)
+    if batch_func is not None:
+        r_start, r_peak, r_end = batch_func(
+            matrix,
+            epoch_index,
+            start_frames,
+            end_frames,
+            signal_lengths=lengths,
+            local_max_prominence=local_max_prominence,
+            search_expansion_frames=search_expansion_frames,
+            value_threshold=value_threshold,
+        )
+    else:
+        refined_frames = [
+            refine_func(matrix[idx, : lengths[idx]], int(start), int(end), None)
+            for idx, start, end in zip(epoch_index, start_frames, end_frames)
+        ]
+        r_start, r_peak, r_end = (
+            np.array([frames[k] for frames in refined_frames], dtype=np.int64)
+            for k in range(3)
+        )
+
+    table = BlinkTable(epoch_index, r_start, r_peak, r_end, matrix, signal_lengths=lengths)
+    logger.info("Refined %d blink annotations", len(table))
+    if as_table:
+        return table
+    return table.to_records()
@@ -1,16 +1,24 @@
 """Raw segmentation helpers."""
 from __future__ import annotations
 
-from typing import List
+from typing import List, Union
 import logging
 
 import mne
 from tqdm import tqdm
 
+from .epoch_views import EpochView, Picks, make_epoch_views
+
 logger = logging.getLogger(__name__)
 
 
-def slice_raw_to_segments(raw: mne.io.BaseRaw, epoch_len: float = 30.0) -> List[mne.io.BaseRaw]:
+def slice_raw_to_segments(
+    raw: mne.io.BaseRaw,
+    epoch_len: float = 30.0,
+    *,
+    as_views: bool = False,
+    picks: Picks = None,
+) -> List[Union[mne.io.BaseRaw, EpochView]]:
     """Slice a continuous :class:`mne.io.BaseRaw` into fixed-length segments.
 
     Parameters
@@ -19,17 +27,26 @@ def slice_raw_to_segments(raw: mne.io.BaseRaw, epoch_len: float = 30.0) -> List[
         Continuous raw recording with blink annotations.
     epoch_len : float, optional
         Length of each segment in seconds, by default ``30.0``.
+    as_views : bool, optional
+        Return :class:`~pyear.utils.epoch_views.EpochView` objects sharing a
+        single data array instead of cropped copies, by default ``False``.
+    picks : str | sequence of str | None, optional
+        Channels loaded for the views. ``None`` loads all channels.
 
     Returns
     -------
-    list of mne.io.BaseRaw
+    list of mne.io.BaseRaw or list of EpochView
         List of cropped raw segments containing annotations.
     """
     n_segments = int(raw.times[-1] // epoch_len)
+    times = [(i * epoch_len, i * epoch_len + epoch_len) for i in range(n_segments)]
+    if as_views:
+        segments = make_epoch_views(raw, times, picks, shift_annotations=False)
+        logger.info("Created %d segment views", n_segments)
+        return segments
+
     segments: List[mne.io.BaseRaw] = []
-    for i in tqdm(range(n_segments), desc="Segmenting", unit="segment"):
-        start = i * epoch_len
-        stop = start + epoch_len
+    for start, stop in tqdm(times, desc="Segmenting", unit="segment"):
         seg = raw.copy().crop(tmin=start, tmax=stop, include_tmax=False)
         segments.append(seg)
     logger.info("Created %d segments", n_segments)
@@ -8,21 +8,23 @@ duration and amplitude‑velocity metrics included here.
 """
 from __future__ import annotations
 
-from typing import Iterable, Dict, Any, List
 import logging
 import pandas as pd
 import numpy as np
 
-from .features.duration_features import duration_base, duration_zero
-from .features.amp_vel_ratio_features import neg_amp_vel_ratio_zero
+from .features.duration_features import _duration_base, _duration_zero
+from .features.amp_vel_ratio_features import _neg_amp_vel_ratio_zero
+from ..utils.blink_table import BlinkInput, group_blinks_by_epoch, iter_blink_derivatives
 
 logger = logging.getLogger(__name__)
 
 
 def aggregate_waveform_features(
-    blinks: Iterable[Dict[str, Any]],
+    blinks: BlinkInput,
     sfreq: float,
     n_epochs: int,
+    *,
+    edge_consistent: bool = True,
 ) -> pd.DataFrame:
     """Aggregate waveform metrics across epochs.
 
@@ -32,12 +34,18 @@ def aggregate_waveform_features(
 
     Parameters
     ----------
-    blinks : Iterable[dict]
+    blinks : Iterable[dict] | BlinkTable
         Blink annotations with an ``epoch_index`` field.
     sfreq : float
         Sampling frequency in Hertz.
     n_epochs : int
         Number of epochs to aggregate.
+    edge_consistent : bool, optional
+        Differentiate every blink segment as if isolated, with one-sided
+        differences at its ends (default). This only reproduces the numbers
+        of per-segment differentiation and is not faster. ``False`` slices
+        the velocity of the whole epoch signal, which is the fast path. See
+        :class:`~pyear.utils.derivatives.DerivativeCache`.
 
     Returns
     -------
@@ -45,18 +53,26 @@ def aggregate_waveform_features(
         DataFrame indexed by epoch with mean waveform features.
     """
     logger.info("Aggregating waveform features over %d epochs", n_epochs)
-    per_epoch: List[List[Dict[str, Any]]] = [list() for _ in range(n_epochs)]
-    for blink in blinks:
-        idx = blink["epoch_index"]
-        if 0 <= idx < n_epochs:
-            per_epoch[idx].append(blink)
+    table = group_blinks_by_epoch(blinks, n_epochs)
 
     records = []
-    for epoch_idx, epoch_blinks in enumerate(per_epoch):
-        if epoch_blinks:
-            dur_base = [duration_base(b, sfreq) for b in epoch_blinks]
-            dur_zero = [duration_zero(b, sfreq) for b in epoch_blinks]
-            ratio_neg = [neg_amp_vel_ratio_zero(b, sfreq) for b in epoch_blinks]
+    for epoch_idx in range(n_epochs):
+        epoch_blinks = table.epoch(epoch_idx)
+        if len(epoch_blinks):
+            # one velocity per blink serves both velocity-based features
+            frames = list(
+                iter_blink_derivatives(
+                    epoch_blinks, sfreq, order=1, edge_consistent=edge_consistent
+                )
+            )
+            dur_base = [_duration_base(s, e, sfreq) for _, s, _, e, _ in frames]
+            dur_zero = [
+                _duration_zero(sig, s, e, sfreq, vel) for sig, s, _, e, (vel,) in frames
+            ]
+            ratio_neg = [
+                _neg_amp_vel_ratio_zero(sig, s, e, sfreq, vel)
+                for sig, s, _, e, (vel,) in frames
+            ]
             features = {
                 "duration_base_mean": float(np.mean(dur_base)),
                 "duration_zero_mean": float(np.mean(dur_zero)),
@@ -14,7 +14,7 @@ Example
 from __future__ import annotations
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 import numpy as np
 
@@ -42,14 +42,30 @@ def neg_amp_vel_ratio_zero(blink: Dict[str, Any], sfreq: float) -> float:
         Ratio of blink amplitude to maximum downward velocity. ``nan`` if
         velocity cannot be computed.
     """
-    start = int(blink["refined_start_frame"])
-    end = int(blink["refined_end_frame"])
-    signal = np.asarray(blink["epoch_signal"], dtype=float)
+    return _neg_amp_vel_ratio_zero(
+        np.asarray(blink["epoch_signal"], dtype=float),
+        int(blink["refined_start_frame"]),
+        int(blink["refined_end_frame"]),
+        sfreq,
+    )
+
+
+def _neg_amp_vel_ratio_zero(
+    signal: np.ndarray,
+    start: int,
+    end: int,
+    sfreq: float,
+    velocity: Optional[np.ndarray] = None,
+) -> float:
+    """Array-level implementation of :func:`neg_amp_vel_ratio_zero`.
+
+    ``velocity`` may hold the precomputed derivative of the segment.
+    """
     segment = signal[start : end + 1]
     baseline = signal[start]
     amplitude = baseline - np.min(segment)
-    dt = 1.0 / sfreq
-    velocity = np.gradient(segment, dt)
+    if velocity is None:
+        velocity = np.gradient(segment, 1.0 / sfreq)
     if velocity.size == 0:
         return float("nan")
     neg_vel = np.min(velocity)
@@ -16,7 +16,7 @@ Example
 from __future__ import annotations
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 import numpy as np
 
@@ -44,8 +44,13 @@ def duration_base(blink: Dict[str, Any], sfreq: float) -> float:
     float
         Duration in seconds from blink start to end.
     """
-    start = int(blink["refined_start_frame"])
-    end = int(blink["refined_end_frame"])
+    return _duration_base(
+        int(blink["refined_start_frame"]), int(blink["refined_end_frame"]), sfreq
+    )
+
+
+def _duration_base(start: int, end: int, sfreq: float) -> float:
+    """Array-level implementation of :func:`duration_base`."""
     duration = (end - start) / sfreq
     logger.debug("duration_base=%s", duration)
     return float(duration)
@@ -75,12 +80,28 @@ def duration_zero(blink: Dict[str, Any], sfreq: float) -> float:
     float
         Duration in seconds between zero-slope landmarks.
     """
-    start = int(blink["refined_start_frame"])
-    end = int(blink["refined_end_frame"])
-    signal = np.asarray(blink["epoch_signal"], dtype=float)
+    return _duration_zero(
+        np.asarray(blink["epoch_signal"], dtype=float),
+        int(blink["refined_start_frame"]),
+        int(blink["refined_end_frame"]),
+        sfreq,
+    )
+
+
+def _duration_zero(
+    signal: np.ndarray,
+    start: int,
+    end: int,
+    sfreq: float,
+    derivative: Optional[np.ndarray] = None,
+) -> float:
+    """Array-level implementation of :func:`duration_zero`.
+
+    ``derivative`` may hold the precomputed velocity of the segment.
+    """
     segment = signal[start : end + 1]
-    dt = 1.0 / sfreq
-    derivative = np.gradient(segment, dt)
+    if derivative is None:
+        derivative = np.gradient(segment, 1.0 / sfreq)
 
     left_indices = np.where(np.diff(np.sign(derivative[: (end - start) // 2])))[0]
     right_indices = np.where(
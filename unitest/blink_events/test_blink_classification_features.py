@@ -3,7 +3,13 @@
 import unittest
 import logging
 
-from pyear.blink_events.classification import aggregate_classification_features
+import numpy as np
+
+from pyear.blink_events.classification import (
+    aggregate_classification_features,
+    classify_blinks_epoch,
+)
+from pyear.morphology.per_blink import compute_single_blink_features
 from unitest.fixtures.mock_ear_generation import _generate_refined_ear
 
 logger = logging.getLogger(__name__)
@@ -28,6 +34,30 @@ class TestBlinkClassification(unittest.TestCase):
         self.assertTrue((df["Partial_Blink_Total"] == 0).all())
         self.assertTrue((df["Complete_Blink_Total"] > 0).any())
 
+    def test_matches_per_blink_amplitude(self) -> None:
+        """Counts equal thresholding the per-blink morphology amplitude."""
+        amplitudes = np.array(
+            [compute_single_blink_features(b, self.sfreq)["amplitude"] for b in self.blinks]
+        )
+        epochs = np.array([b["epoch_index"] for b in self.blinks])
+        threshold = float(np.median(amplitudes))
+        df = aggregate_classification_features(
+            self.blinks, self.sfreq, self.epoch_len, self.n_epochs, threshold=threshold
+        )
+        for idx in range(self.n_epochs):
+            in_epoch = amplitudes[epochs == idx]
+            partial = int(np.sum(in_epoch < threshold))
+            self.assertEqual(df.loc[idx, "Partial_Blink_Total"], partial)
+            self.assertEqual(df.loc[idx, "Complete_Blink_Total"], in_epoch.size - partial)
+            feats = classify_blinks_epoch(
+                [b for b in self.blinks if b["epoch_index"] == idx],
+                self.sfreq,
+                self.epoch_len,
+                threshold,
+            )
+            for key, value in feats.items():
+                self.assertAlmostEqual(df.loc[idx, key], value)
+
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
@@ -0,0 +1,115 @@
+"""Tests for the vectorised inter-blink interval complexity measures."""
+import itertools
+import logging
+import unittest
+
+import numpy as np
+
+from pyear.blink_events.event_features.ibi_complexity import (
+    dfa_exponent,
+    ibi_complexity_windows,
+    ordinal_pattern_codes,
+    permutation_entropy,
+    rescaled_range_hurst,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _reference_permutation_entropy(series, order=3, delay=1):
+    """Per-sequence permutation entropy from explicit pattern tuples."""
+    if len(series) < order * delay:
+        return float("nan")
+    patterns = [
+        tuple(np.argsort(series[i : i + order * delay : delay], kind="stable"))
+        for i in range(len(series) - delay * (order - 1))
+    ]
+    _, counts = np.unique(patterns, axis=0, return_counts=True)
+    probs = counts / counts.sum()
+    return float(-np.sum(probs * np.log(probs)))
+
+
+def _reference_hurst(series):
+    """Single-scale R/S estimate of one sequence."""
+    if len(series) < 20:
+        return float("nan")
+    cumdev = np.cumsum(series - np.mean(series))
+    r = np.max(cumdev) - np.min(cumdev)
+    s = np.std(series, ddof=1)
+    if s == 0 or r == 0:
+        return float("nan")
+    return float(np.log(r / s) / np.log(len(series)))
+
+
+class TestIBIComplexity(unittest.TestCase):
+    """Compare batched measures with one sequence at a time."""
+
+    def setUp(self) -> None:
+        rng = np.random.default_rng(24)
+        self.sequences = [rng.gamma(3.0, 1.0, n) for n in (0, 1, 2, 3, 7, 19, 20, 64, 300)]
+        self.sequences.append(np.round(rng.random(40) * 2))
+        self.values = np.concatenate(self.sequences)
+        self.offsets = np.concatenate([[0], np.cumsum([s.size for s in self.sequences])])
+
+    def test_pattern_codes_follow_permutation_order(self) -> None:
+        """Codes are ranks of the permutations in lexicographic order."""
+        perms = np.array(list(itertools.permutations(range(4))))
+        values = np.argsort(perms, axis=1).reshape(-1).astype(float)
+        offsets = np.arange(0, values.size + 1, 4)
+        codes, ids = ordinal_pattern_codes(values, offsets, order=4)
+        np.testing.assert_array_equal(ids, np.arange(len(perms)))
+        self.assertTrue(np.all(np.diff(codes) > 0))
+
+    def test_permutation_entropy_matches_reference(self) -> None:
+        """Batched entropies equal the tuple-based computation."""
+        for order, delay in ((3, 1), (3, 2), (4, 1)):
+            got = permutation_entropy(self.values, self.offsets, order=order, delay=delay)
+            want = [_reference_permutation_entropy(s, order, delay) for s in self.sequences]
+            np.testing.assert_allclose(got, want, rtol=1e-12)
+
+    def test_rescaled_range_matches_reference(self) -> None:
+        """Batched R/S estimates equal the per-sequence estimate."""
+        got = rescaled_range_hurst(self.values, self.offsets)
+        want = [_reference_hurst(s) for s in self.sequences]
+        np.testing.assert_allclose(got, want, rtol=1e-12)
+
+    def test_dfa_exponent(self) -> None:
+        """White noise scales near 0.5 and its running sum near 1.5."""
+        rng = np.random.default_rng(0)
+        noise = rng.standard_normal(20000)
+        self.assertAlmostEqual(dfa_exponent(noise)[0], 0.5, delta=0.05)
+        self.assertAlmostEqual(dfa_exponent(np.cumsum(noise))[0], 1.5, delta=0.05)
+
+        batched = dfa_exponent(self.values, self.offsets, scales=[4, 8, 16])
+        for alpha, sequence in zip(batched, self.sequences):
+            single = dfa_exponent(sequence, scales=[4, 8, 16])[0]
+            np.testing.assert_allclose(alpha, single, rtol=1e-12)
+        self.assertTrue(np.isnan(batched[:7]).all())
+
+    def test_dfa_default_scales_ignore_batch(self) -> None:
+        """A sequence keeps its exponent when batched with a longer one."""
+        short, long = self.sequences[-3], self.sequences[-2]
+        alone = dfa_exponent(short)[0]
+        values = np.concatenate([short, long])
+        batched = dfa_exponent(values, np.array([0, short.size, values.size]))
+        self.assertFalse(np.isnan(alone))
+        self.assertAlmostEqual(batched[0], alone, places=12)
+        self.assertAlmostEqual(batched[1], dfa_exponent(long)[0], places=12)
+
+    def test_sliding_windows(self) -> None:
+        """Overlapping index windows match each window sliced on its own."""
+        ibis = self.sequences[-2]
+        starts = np.arange(0, 240, 30)
+        result = ibi_complexity_windows(ibis, starts, starts + 60)
+        for i, start in enumerate(starts):
+            window = ibis[start : start + 60]
+            self.assertAlmostEqual(
+                result["ibi_permutation_entropy"][i], _reference_permutation_entropy(window)
+            )
+            self.assertAlmostEqual(result["ibi_hurst_exponent"][i], _reference_hurst(window))
+            self.assertAlmostEqual(result["ibi_dfa_alpha"][i], dfa_exponent(window)[0])
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    unittest.main()
@@ -0,0 +1,87 @@
+"""Tests for IBI features over epochs and sliding recording windows."""
+import logging
+import unittest
+
+import numpy as np
+
+from pyear.blink_events.event_features.inter_blink_interval import compute_ibi_features
+from pyear.blink_events.event_features.recording_ibi import (
+    IBI_COLUMNS,
+    RecordingIBI,
+    epoch_ibi_features,
+)
+from pyear.utils.blink_table import BlinkTable
+from unitest.fixtures.mock_ear_generation import _generate_refined_ear
+
+logger = logging.getLogger(__name__)
+
+SFREQ = 100.0
+
+
+def _blinks(starts, ends):
+    """Single-epoch blink table with the given frames."""
+    return BlinkTable(np.zeros(len(starts)), starts, starts, ends)
+
+
+class TestRecordingIBI(unittest.TestCase):
+    """Compare batched IBI features with the per-epoch implementation."""
+
+    def setUp(self) -> None:
+        rng = np.random.default_rng(25)
+        gaps = rng.gamma(4.0, 90.0, size=400).astype(np.int64) + 30
+        self.starts = np.cumsum(gaps)
+        self.ends = self.starts + rng.integers(10, 25, size=self.starts.size)
+        self.recording = RecordingIBI(self.starts[::-1], self.ends[::-1], SFREQ)
+
+    def test_epochs_match_per_epoch_features(self) -> None:
+        """Every epoch equals compute_ibi_features on its own blinks."""
+        blinks, sfreq, _, n_epochs = _generate_refined_ear()
+        table = BlinkTable.from_records(blinks).group_by_epoch(n_epochs)
+        df = epoch_ibi_features(table, sfreq, n_epochs)
+        for epoch in range(n_epochs):
+            expected = compute_ibi_features(table.epoch(epoch), sfreq)
+            for col in IBI_COLUMNS:
+                np.testing.assert_array_equal(df.loc[epoch, col], expected[col])
+
+    def test_rolling_windows_match_reference(self) -> None:
+        """Sliding windows equal the features of the blinks they contain."""
+        df = self.recording.rolling_features(120.0, 7.5)
+        self.assertEqual(df["start"].iloc[1], 7.5)
+        for row in df.iloc[::9].itertuples():
+            onsets = self.starts / SFREQ
+            inside = np.flatnonzero((onsets >= row.start) & (onsets < row.stop))
+            # the interval leading into the window counts as well
+            if inside.size and inside[0] > 0:
+                inside = np.concatenate([[inside[0] - 1], inside])
+            expected = compute_ibi_features(_blinks(self.starts[inside], self.ends[inside]), SFREQ)
+            for col in IBI_COLUMNS:
+                np.testing.assert_allclose(getattr(row, col), expected[col], rtol=1e-12)
+
+    def test_keep_boundary(self) -> None:
+        """Dropping boundary intervals matches per-window blink subsets."""
+        t_starts = np.array([0.0, 95.0, 400.0, 10_000.0])
+        with_boundary = self.recording.window_features(t_starts, t_starts + 60.0)
+        without = self.recording.window_features(t_starts, t_starts + 60.0, keep_boundary=False)
+        onsets = self.starts / SFREQ
+        for i, start in enumerate(t_starts):
+            inside = (onsets >= start) & (onsets < start + 60.0)
+            expected = compute_ibi_features(
+                _blinks(self.starts[inside], self.ends[inside]), SFREQ
+            )
+            np.testing.assert_allclose(without.loc[i, "ibi_mean"], expected["ibi_mean"])
+        self.assertEqual(without.loc[0, "ibi_mean"], with_boundary.loc[0, "ibi_mean"])
+        self.assertTrue(np.isnan(with_boundary.loc[3, "ibi_mean"]))
+
+    def test_from_blinks_spans_epochs(self) -> None:
+        """Epoch-relative frames are placed on the recording timeline."""
+        table = BlinkTable([0, 0, 1], [100, 2500, 200], [110, 2510, 210], [120, 2520, 220])
+        recording = RecordingIBI.from_blinks(table, SFREQ, 30.0)
+        np.testing.assert_allclose(recording.ibis, [23.8, 6.8])
+        epochs = epoch_ibi_features(table, SFREQ, 2)
+        self.assertAlmostEqual(epochs.loc[0, "ibi_mean"], 23.8)
+        self.assertTrue(np.isnan(epochs.loc[1, "ibi_mean"]))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    unittest.main()
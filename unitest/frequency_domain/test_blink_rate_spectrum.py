@@ -0,0 +1,85 @@
+"""Tests for the sparse blink-rate spectrum.
+
+The spectrum evaluated from the onsets is compared with the ``rfft`` of a
+dense indicator array, within one epoch and over recording-length windows.
+"""
+import unittest
+import logging
+
+import numpy as np
+
+from pyear.frequency_domain.blink_rate_spectrum import (
+    blink_rate_peaks,
+    blink_rate_spectrum,
+    recording_blink_rate_peaks,
+)
+
+logger = logging.getLogger(__name__)
+
+SFREQ = 100.0
+
+
+def _dense_spectrum(onsets, n, sfreq, fmin=0.1, fmax=0.5):
+    """Indicator-train spectrum restricted to ``[fmin, fmax]``."""
+    freqs = np.fft.rfftfreq(n, 1.0 / sfreq)
+    indicator = np.zeros(n)
+    indicator[onsets[(onsets >= 0) & (onsets < n)]] = 1.0
+    mask = (freqs >= fmin) & (freqs <= fmax)
+    return freqs[mask], (np.abs(np.fft.rfft(indicator)) ** 2 / n)[mask]
+
+
+class TestBlinkRateSpectrum(unittest.TestCase):
+    """Compare the sparse evaluation with dense indicator spectra."""
+
+    def setUp(self) -> None:
+        rng = np.random.default_rng(22)
+        self.n_samples = 360_000
+        intervals = rng.gamma(9.0, 40.0, size=1500).astype(np.int64) + 20
+        onsets = np.cumsum(intervals)
+        self.onsets = onsets[onsets < self.n_samples]
+
+    def test_matches_dense_fft(self) -> None:
+        """Epoch and whole-recording spectra equal the dense ``rfft``."""
+        for n in (3000, self.n_samples):
+            onsets = self.onsets[self.onsets < n]
+            onsets = np.concatenate([onsets, onsets[:3], [-5, n + 7]])
+            freqs, power = blink_rate_spectrum(onsets, n, SFREQ)
+            want_freqs, want_power = _dense_spectrum(onsets, n, SFREQ)
+            np.testing.assert_allclose(freqs, want_freqs, rtol=1e-12)
+            np.testing.assert_allclose(power, want_power, rtol=1e-9, atol=1e-12)
+
+    def test_arbitrary_frequencies(self) -> None:
+        """Explicit frequencies on the grid agree with the grid evaluation."""
+        grid, power = blink_rate_spectrum(self.onsets, 6000, SFREQ)
+        _, explicit = blink_rate_spectrum(self.onsets, 6000, SFREQ, freqs=grid)
+        np.testing.assert_allclose(explicit, power, rtol=1e-9, atol=1e-12)
+
+    def test_peaks_and_ties(self) -> None:
+        """Peaks match the dense argmax; flat spectra take the lowest bin."""
+        rows = np.array([0, 0, 0, 1, 3, 3])
+        onsets = np.array([120, 450, 800, 495, 10, 2990])
+        freq, power = blink_rate_peaks(rows, onsets, 4, 3000, SFREQ)
+        want_freqs, want_power = _dense_spectrum(onsets[:3], 3000, SFREQ)
+        self.assertAlmostEqual(freq[0], want_freqs[np.argmax(want_power)])
+        self.assertAlmostEqual(power[0], want_power.max())
+        self.assertAlmostEqual(freq[1], 0.1)
+        self.assertEqual(power[2], 0.0)
+        self.assertAlmostEqual(freq[2], 0.1)
+
+    def test_recording_windows(self) -> None:
+        """Each window equals the spectrum of its own onsets."""
+        df = recording_blink_rate_peaks(self.onsets, self.n_samples, SFREQ, window=60.0, step=45.0)
+        self.assertEqual(len(df), (self.n_samples - 6000) // 4500 + 1)
+        for row in df.itertuples():
+            start = int(round(row.window_start * SFREQ))
+            inside = self.onsets[(self.onsets >= start) & (self.onsets < start + 6000)] - start
+            freqs, power = _dense_spectrum(inside, 6000, SFREQ)
+            self.assertAlmostEqual(row.blink_rate_peak_power, power.max(), delta=1e-9)
+        whole = recording_blink_rate_peaks(self.onsets, self.n_samples, SFREQ)
+        self.assertEqual(len(whole), 1)
+        self.assertTrue(0.1 <= whole.loc[0, "blink_rate_peak_freq"] <= 0.5)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    unittest.main()
@@ -0,0 +1,85 @@
+"""Tests for Welch features sliced from a recording-wide spectrogram."""
+import pickle
+import unittest
+import logging
+
+import numpy as np
+
+from pyear.frequency_domain.recording_spectrogram import RecordingSpectrogram
+from pyear.frequency_domain.segment_features import compute_segment_spectrogram_features
+from pyear.frequency_domain.spectral_engine import (
+    APERTURE_SPECTRAL_COLUMNS,
+    frequency_domain_features_batch,
+)
+
+logger = logging.getLogger(__name__)
+
+SFREQ = 100.0
+
+
+def _reference_welch(signal, nperseg, hop):
+    """Mean Hann-tapered periodogram of the complete frames of ``signal``."""
+    taper = 0.5 - 0.5 * np.cos(2.0 * np.pi * np.arange(nperseg) / nperseg)
+    spectra = [
+        np.abs(np.fft.rfft(signal[lo : lo + nperseg] * taper)) ** 2 / np.sum(taper**2)
+        for lo in range(0, signal.size - nperseg + 1, hop)
+    ]
+    return np.mean(spectra, axis=0)
+
+
+class TestRecordingSpectrogram(unittest.TestCase):
+    """Compare sliced spectra with spectra of each window on its own."""
+
+    def setUp(self) -> None:
+        rng = np.random.default_rng(23)
+        self.signal = rng.standard_normal(int(SFREQ * 605)).cumsum()
+        self.spectrogram = RecordingSpectrogram(self.signal, SFREQ)
+
+    def test_welch_matches_reference(self) -> None:
+        """Frame-aligned windows average exactly the frames inside them."""
+        psd = self.spectrogram.welch([0, 3000, 4000], [3000, 9000, 4100])
+        np.testing.assert_allclose(psd[0], _reference_welch(self.signal[:3000], 400, 200))
+        np.testing.assert_allclose(psd[1], _reference_welch(self.signal[3000:9000], 400, 200))
+        self.assertTrue(np.isnan(psd[2]).all())
+
+    def test_single_boxcar_frame_matches_epoch_engine(self) -> None:
+        """One boxcar frame per epoch reproduces the periodogram features."""
+        spectrogram = RecordingSpectrogram(
+            self.signal, SFREQ, frame_length=30.0, overlap=0.0, window="boxcar"
+        )
+        df = spectrogram.epoch_features(30.0)
+        self.assertEqual(len(df), 21)
+        self.assertTrue(df.iloc[-1][list(APERTURE_SPECTRAL_COLUMNS)].isna().all())
+        expected = frequency_domain_features_batch(
+            self.signal[:60000].reshape(20, 3000), [], [], SFREQ
+        )
+        for col in APERTURE_SPECTRAL_COLUMNS:
+            np.testing.assert_array_equal(df[col].to_numpy()[:20], expected[col])
+
+    def test_windows_reuse_cached_frames(self) -> None:
+        """Changing window length or hop only slices the cached frames."""
+        first = self.spectrogram.sliding_features(60.0, 15.0)
+        power = self.spectrogram._frame_power()
+        segments = compute_segment_spectrogram_features(self.spectrogram, 45.0)
+        self.assertIs(self.spectrogram._frame_power(), power)
+        self.assertEqual(len(first), (605 - 60) // 15 + 1)
+        self.assertEqual(len(segments), 13)
+        row = first.iloc[3]
+        again = self.spectrogram.window_features([4500], [10500])
+        for col in APERTURE_SPECTRAL_COLUMNS:
+            self.assertAlmostEqual(row[col], again.loc[0, col], places=12)
+
+    def test_non_finite_frames_are_skipped(self) -> None:
+        """Frames touching NaN samples drop out of the averages."""
+        signal = self.signal.copy()
+        signal[3050] = np.nan
+        spectrogram = pickle.loads(pickle.dumps(RecordingSpectrogram(signal, SFREQ)))
+        psd = spectrogram.welch([3000, 2600], [6000, 3000])
+        want = _reference_welch(signal[3200:6000], 400, 200)
+        np.testing.assert_allclose(psd[0], want)
+        self.assertTrue(np.isfinite(psd[1]).all())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    unittest.main()
@@ -17,9 +17,15 @@ import numpy as np
 import pandas as pd
 
 from pyear.blink_events import generate_blink_dataframe
+from pyear.pyblinkers.continuous_blink_properties import (
+    compute_continuous_blink_properties,
+    epoch_ids_for_samples,
+)
 from pyear.pyblinkers.segment_blink_properties import (
     compute_segment_blink_properties,
 )
+from pyear.utils.epoch_views import epoch_sample_bounds
+from pyear.utils.epochs import slice_raw_into_epochs
 
 logger = logging.getLogger(__name__)
 
@@ -107,6 +113,67 @@ class TestLongContinuousRaw(unittest.TestCase):
         self.assertEqual(set(props["seg_id"].unique()), {0})
         self.assertEqual(len(props), self.total_expected)
 
+    def test_continuous_mode_matches_single_segment(self) -> None:
+        """Chunked continuous extraction reproduces the single-segment run.
+
+        The recording is fitted in one minute chunks. After shifting back to
+        global sample indices every column matches the legacy workflow, and
+        the per-epoch blink counts match the epoch-based CSV.
+        """
+        expected = compute_segment_blink_properties(
+            self.segments,
+            self.blink_df,
+            self.params,
+            channel="EEG-E8",
+            run_fit=False,
+        ).drop(columns="seg_id")
+        props = compute_continuous_blink_properties(
+            self.raw,
+            self.params,
+            channel="EEG-E8",
+            blink_label=None,
+            chunk_duration=60.0,
+        )
+        epoch_ids = props.pop("epoch_id")
+        pd.testing.assert_frame_equal(props, expected, check_dtype=False)
+
+        counts = pd.read_csv(PROJECT_ROOT / "unitest" / "ear_eog_blink_count_epoch.csv")
+        np.testing.assert_array_equal(
+            np.bincount(epoch_ids, minlength=len(counts)), counts["blink_count"]
+        )
+
+    def test_continuous_mode_with_fit(self) -> None:
+        """Tent landmarks are shifted to global sample indices."""
+        with self.assertWarns(RuntimeWarning):
+            expected = compute_segment_blink_properties(
+                self.segments, self.blink_df, self.params, run_fit=True
+            ).drop(columns="seg_id")
+        with self.assertWarns(RuntimeWarning):
+            props = compute_continuous_blink_properties(
+                self.raw,
+                self.params,
+                blink_label=None,
+                chunk_duration=60.0,
+                run_fit=True,
+            ).drop(columns="epoch_id")
+        self.assertFalse(props.empty)
+        pd.testing.assert_frame_equal(props, expected, check_dtype=False, rtol=1e-9)
+
+    def test_epoch_ids_follow_sliced_epochs(self) -> None:
+        """Samples map to the epochs cut by :func:`slice_raw_into_epochs`."""
+        _, _, _, times = slice_raw_into_epochs(self.raw, epoch_len=30.0, as_views=True)
+        for epoch, (start, stop) in enumerate(times):
+            smin, smax = epoch_sample_bounds(self.raw, start, stop)
+            ids = epoch_ids_for_samples(self.raw, np.array([smin, smax - 1]), 30.0)
+            np.testing.assert_array_equal(ids, [epoch, epoch])
+        last = epoch_ids_for_samples(self.raw, np.array([self.raw.n_times - 1]), 30.0)
+        self.assertEqual(int(last[0]), -1)
+
+    def test_zero_jobs_rejected(self) -> None:
+        """``n_jobs=0`` is rejected before any chunk is loaded."""
+        with self.assertRaisesRegex(ValueError, "n_jobs"):
+            compute_continuous_blink_properties(self.raw, self.params, n_jobs=0)
+
 
 if __name__ == "__main__":  # pragma: no cover - manual execution
     logging.basicConfig(level=logging.INFO)
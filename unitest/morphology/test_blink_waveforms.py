@@ -0,0 +1,94 @@
+"""Unit tests for the batched blink-waveform kernels.
+
+Random blinks on a noisy aperture signal are passed through
+:func:`blink_feature_arrays` as a table and as records, and every metric is
+compared with :func:`compute_single_blink_features` for the same blink.
+"""
+
+import unittest
+import logging
+
+import numpy as np
+
+from pyear.morphology.blink_waveforms import (
+    SINGLE_BLINK_FEATURES,
+    blink_amplitudes,
+    blink_feature_arrays,
+)
+from pyear.morphology.per_blink import compute_single_blink_features
+from pyear.utils.blink_table import BlinkTable
+
+logger = logging.getLogger(__name__)
+
+SFREQ = 100.0
+
+
+class TestBlinkWaveforms(unittest.TestCase):
+    """Compare batched morphology with the per-blink implementation."""
+
+    def setUp(self) -> None:
+        rng = np.random.default_rng(11)
+        self.records = []
+        for epoch in range(4):
+            signal = 0.3 + 0.02 * rng.standard_normal(1000)
+            # a flat stretch gives constant waveforms
+            signal[500:520] = 0.3
+            for _ in range(40):
+                start = int(rng.integers(0, 980))
+                end = start + int(rng.integers(0, 18))
+                peak = int(rng.integers(start, end + 1))
+                self.records.append(
+                    {
+                        "epoch_index": epoch,
+                        "refined_start_frame": start,
+                        "refined_peak_frame": peak,
+                        "refined_end_frame": end,
+                        "epoch_signal": signal,
+                    }
+                )
+            # a peak after the end uses the per-blink fallback
+            for start, peak, end in ((100, 130, 120), (502, 508, 515)):
+                self.records.append(
+                    {
+                        "epoch_index": epoch,
+                        "refined_start_frame": start,
+                        "refined_peak_frame": peak,
+                        "refined_end_frame": end,
+                        "epoch_signal": signal,
+                    }
+                )
+
+    def _check(self, features) -> None:
+        for i, blink in enumerate(self.records):
+            expected = compute_single_blink_features(blink, SFREQ)
+            for name in SINGLE_BLINK_FEATURES:
+                np.testing.assert_array_equal(
+                    features[name][i], expected[name], err_msg=f"{name} of blink {i}"
+                )
+
+    def test_records_match_single_blink(self) -> None:
+        """Record input gives the per-blink values exactly."""
+        self._check(blink_feature_arrays(self.records, SFREQ))
+
+    def test_table_matches_single_blink(self) -> None:
+        """Table input gathers the same waveforms from the epoch matrix."""
+        table = BlinkTable.from_records(self.records)
+        self._check(blink_feature_arrays(table, SFREQ))
+
+    def test_amplitudes(self) -> None:
+        """The amplitude vector equals the morphology amplitude."""
+        expected = blink_feature_arrays(self.records, SFREQ)["amplitude"]
+        np.testing.assert_array_equal(blink_amplitudes(self.records), expected)
+        table = BlinkTable.from_records(self.records)
+        np.testing.assert_array_equal(blink_amplitudes(table), expected)
+
+    def test_empty_input(self) -> None:
+        """No blinks give empty arrays."""
+        features = blink_feature_arrays([], SFREQ)
+        self.assertEqual(set(features), set(SINGLE_BLINK_FEATURES))
+        self.assertTrue(all(values.size == 0 for values in features.values()))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    unittest.main()
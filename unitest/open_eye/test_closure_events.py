@@ -0,0 +1,127 @@
+"""Unit tests for the run-length closure-event engine.
+
+Micropauses, prolonged blinks and the longest closure are compared with a
+sample-by-sample reference on synthetic eyelid signals with known closures.
+"""
+import unittest
+import logging
+
+import numpy as np
+
+from pyear.open_eye import aggregate_open_eye_features
+from pyear.open_eye.features import (
+    aggregate_closure_events,
+    baseline_mean_epoch,
+    closure_events_epoch,
+    micropause_count_epoch,
+)
+from pyear.utils.blink_table import BlinkTable
+from unitest.fixtures.mock_ear_generation import _generate_refined_ear
+
+logger = logging.getLogger(__name__)
+
+SFREQ = 100.0
+
+
+def _reference(signal, blinks, sfreq, threshold_ratio=0.5):
+    """Walk the samples once, tracking closed runs and blink overlap."""
+    baseline = baseline_mean_epoch(signal, blinks)
+    threshold = baseline * threshold_ratio
+    in_blink = np.zeros(signal.size, dtype=bool)
+    for blink in blinks:
+        start = max(blink["refined_start_frame"], 0)
+        in_blink[start : blink["refined_end_frame"] + 1] = True
+
+    pauses, prolonged, longest = 0, 0, 0.0
+    pause_len, closure_len, touches_blink = 0, 0, False
+    for value, blink in zip(np.append(signal, np.inf), np.append(in_blink, False)):
+        closed = value <= threshold
+        if closed and not blink:
+            pause_len += 1
+        else:
+            pauses += 0.1 <= pause_len / sfreq <= 0.3
+            pause_len = 0
+        if closed:
+            closure_len += 1
+            touches_blink |= blink
+        else:
+            prolonged += touches_blink and closure_len / sfreq > 0.4
+            longest = max(longest, closure_len / sfreq)
+            closure_len, touches_blink = 0, False
+    return int(pauses), int(prolonged), longest
+
+
+class TestClosureEvents(unittest.TestCase):
+    """Verify the closure-event engine against a per-sample reference."""
+
+    def setUp(self) -> None:
+        rng = np.random.default_rng(3)
+        self.signals = []
+        self.blinks = []
+        for epoch in range(6):
+            signal = 1.0 + 0.01 * rng.standard_normal(3000)
+            blinks = []
+            for start in rng.choice(np.arange(50, 2900, 150), 8, replace=False):
+                width = int(rng.integers(5, 70))
+                signal[start : start + width] = 0.1
+                if rng.random() < 0.5:
+                    # the closure extends around an annotated blink
+                    blinks.append(
+                        {
+                            "epoch_index": epoch,
+                            "refined_start_frame": int(start + width // 3),
+                            "refined_peak_frame": int(start + width // 2),
+                            "refined_end_frame": int(start + 2 * width // 3),
+                            "epoch_signal": signal,
+                        }
+                    )
+            self.signals.append(signal)
+            self.blinks.append(blinks)
+
+    def test_known_events(self) -> None:
+        """Closures of 20, 50 and 80 samples around one blink."""
+        signal = np.ones(1000)
+        signal[100:120] = 0.0  # too short for a micropause
+        signal[300:350] = 0.0  # micropause
+        signal[600:680] = 0.0  # prolonged blink
+        blinks = [{"refined_start_frame": 605, "refined_peak_frame": 640, "refined_end_frame": 675}]
+        events = closure_events_epoch(signal, blinks, SFREQ)
+        self.assertEqual(events["micropause_count"], 1)
+        self.assertEqual(events["prolonged_blink_count"], 1)
+        self.assertAlmostEqual(events["max_closure_duration"], 0.8)
+
+    def test_matches_reference(self) -> None:
+        """Every epoch matches the sample-by-sample reference."""
+        for signal, blinks in zip(self.signals, self.blinks):
+            expected = _reference(signal, blinks, SFREQ)
+            events = closure_events_epoch(signal, blinks, SFREQ)
+            self.assertEqual(events["micropause_count"], expected[0])
+            self.assertEqual(micropause_count_epoch(signal, blinks, SFREQ), expected[0])
+            self.assertEqual(events["prolonged_blink_count"], expected[1])
+            self.assertAlmostEqual(events["max_closure_duration"], expected[2])
+
+    def test_recording_pass_matches_epochs(self) -> None:
+        """One pass over all epochs equals the per-epoch results."""
+        records = [blink for blinks in self.blinks for blink in blinks]
+        table = BlinkTable.from_records(records)
+        n_epochs = len(self.signals) + 1  # the last epoch has no signal
+        df = aggregate_closure_events(table, SFREQ, n_epochs)
+        for epoch in range(n_epochs - 1):
+            events = closure_events_epoch(table.epoch_signal(epoch), table.epoch(epoch), SFREQ)
+            for col, value in events.items():
+                self.assertAlmostEqual(df.loc[epoch, col], value)
+        self.assertEqual(df.loc[n_epochs - 1, "micropause_count"], 0)
+        self.assertTrue(np.isnan(df.loc[n_epochs - 1, "max_closure_duration"]))
+
+    def test_open_eye_aggregate_columns(self) -> None:
+        """The open-eye aggregate reports the microsleep metrics."""
+        blinks, sfreq, _, n_epochs = _generate_refined_ear()
+        df = aggregate_open_eye_features(blinks, sfreq, n_epochs)
+        expected = aggregate_closure_events(blinks, sfreq, n_epochs)
+        for col in ("micropause_count", "prolonged_blink_count", "max_closure_duration"):
+            np.testing.assert_array_equal(df[col].to_numpy(), expected[col].to_numpy())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    unittest.main()
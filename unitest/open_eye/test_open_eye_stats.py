@@ -0,0 +1,140 @@
+"""Unit tests for the single-pass open-eye statistics engine.
+
+Every column of :func:`open_eye_summary` is compared with the per-epoch
+feature function it replaces, on random epochs of unequal length that include
+blinks with negative starts, overlapping blinks and a fully closed epoch.
+"""
+import unittest
+import logging
+
+import numpy as np
+
+from pyear.open_eye import aggregate_open_eye_features
+from pyear.open_eye.features import (
+    baseline_drift_epoch,
+    baseline_mad_epoch,
+    baseline_mean_epoch,
+    baseline_std_epoch,
+    eye_opening_rms_epoch,
+    open_eye_summary,
+    perclos_epoch,
+    zero_crossing_rate_epoch,
+)
+from pyear.open_eye.features.open_eye_mask import open_eye_mask, open_eye_masks
+from pyear.open_eye.features.open_eye_stats import OPEN_EYE_COLUMNS
+from pyear.utils.blink_table import BlinkTable
+
+logger = logging.getLogger(__name__)
+
+SFREQ = 100.0
+
+
+class TestOpenEyeSummary(unittest.TestCase):
+    """Verify the open-eye engine against the per-epoch features."""
+
+    def setUp(self) -> None:
+        rng = np.random.default_rng(7)
+        records = []
+        self.signals = []
+        for epoch in range(5):
+            n_samples = int(rng.integers(200, 400))
+            signal = 1.0 + 0.05 * rng.standard_normal(n_samples)
+            signal[rng.integers(0, n_samples, 20)] = 0.1
+            n_blinks = int(rng.integers(0, 6))
+            for _ in range(n_blinks):
+                start = int(rng.integers(-30, n_samples))
+                records.append(
+                    {
+                        "epoch_index": epoch,
+                        "refined_start_frame": start,
+                        "refined_peak_frame": start + 5,
+                        "refined_end_frame": start + int(rng.integers(0, 60)),
+                        "epoch_signal": signal,
+                    }
+                )
+            if n_blinks == 0:
+                # keep the epoch signal although the epoch has no blinks
+                records.append(
+                    {
+                        "epoch_index": epoch,
+                        "refined_start_frame": n_samples + 10,
+                        "refined_peak_frame": n_samples + 11,
+                        "refined_end_frame": n_samples + 12,
+                        "epoch_signal": signal,
+                    }
+                )
+            self.signals.append(signal)
+        # the last epoch is closed from start to end
+        records.append(
+            {
+                "epoch_index": 4,
+                "refined_start_frame": 0,
+                "refined_peak_frame": 1,
+                "refined_end_frame": self.signals[4].size,
+                "epoch_signal": self.signals[4],
+            }
+        )
+        self.table = BlinkTable.from_records(records)
+
+    def test_masks_match_slices(self) -> None:
+        """Difference-array masks equal slice assignment per epoch."""
+        table = self.table
+        masks = open_eye_masks(
+            table.signal_lengths,
+            table.epoch_signals.shape[1],
+            table.epoch_index,
+            table.refined_start_frame,
+            table.refined_end_frame,
+        )
+        for epoch, signal in enumerate(self.signals):
+            expected = np.ones(signal.size, dtype=bool)
+            for blink in table.epoch(epoch).to_records():
+                expected[blink["refined_start_frame"] : blink["refined_end_frame"] + 1] = False
+            np.testing.assert_array_equal(masks[epoch, : signal.size], expected)
+            np.testing.assert_array_equal(open_eye_mask(signal.size, table.epoch(epoch)), expected)
+            self.assertFalse(masks[epoch, signal.size :].any())
+
+    def test_matches_epoch_features(self) -> None:
+        """Every statistic equals the per-epoch feature function."""
+        table = self.table
+        summary = open_eye_summary(
+            table.epoch_signals,
+            table.signal_lengths,
+            table.epoch_index,
+            table.refined_start_frame,
+            table.refined_end_frame,
+            SFREQ,
+        )
+        for epoch in range(len(self.signals)):
+            signal = table.epoch_signal(epoch)
+            blinks = table.epoch(epoch)
+            expected = {
+                "baseline_mean": baseline_mean_epoch(signal, blinks),
+                "baseline_drift": baseline_drift_epoch(signal, blinks, SFREQ),
+                "baseline_std": baseline_std_epoch(signal, blinks),
+                "baseline_mad": baseline_mad_epoch(signal, blinks),
+                "perclos": perclos_epoch(signal, blinks),
+                "eye_opening_rms": eye_opening_rms_epoch(signal, blinks),
+                "zero_crossing_rate": zero_crossing_rate_epoch(signal, blinks),
+            }
+            for col, value in expected.items():
+                np.testing.assert_allclose(
+                    summary[col][epoch], value, rtol=1e-9, atol=1e-12, err_msg=col
+                )
+        self.assertTrue(np.isnan(summary["baseline_mean"][4]))
+
+    def test_aggregate_pads_missing_epochs(self) -> None:
+        """Epochs without a signal are ``NaN`` in the aggregate."""
+        n_epochs = len(self.signals) + 2
+        df = aggregate_open_eye_features(self.table, SFREQ, n_epochs)
+        self.assertEqual(len(df), n_epochs)
+        self.assertTrue(df.loc[n_epochs - 1, list(OPEN_EYE_COLUMNS)].isna().all())
+        self.assertAlmostEqual(
+            df.loc[0, "baseline_std"],
+            baseline_std_epoch(self.table.epoch_signal(0), self.table.epoch(0)),
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    unittest.main()
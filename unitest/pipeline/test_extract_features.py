@@ -0,0 +1,146 @@
+"""Unit tests for :func:`pyear.pipeline.extract_features`."""
+
+import unittest
+import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import mne
+import numpy as np
+import pandas as pd
+
+from pyear.pipeline import extract_features
+from pyear.utils.blink_table import BlinkTable
+from unitest.fixtures.mock_ear_generation import _generate_refined_ear
+
+logger = logging.getLogger(__name__)
+
+
+class TestExtractFeatures(unittest.TestCase):
+    """Run the full pipeline on mock blinks."""
+
+    def setUp(self) -> None:
+        blinks, sfreq, epoch_len, n_epochs = _generate_refined_ear()
+        self.blinks = blinks
+        self.sfreq = sfreq
+        self.epoch_len = epoch_len
+        self.n_epochs = n_epochs
+        n_times = int(sfreq * epoch_len)
+        info = mne.create_info(["EAR"], sfreq, ch_types=["misc"])
+        self.raw_segments = [
+            mne.io.RawArray(np.zeros((1, n_times)), info, verbose=False)
+            for _ in range(n_epochs)
+        ]
+
+    def _extract(self, blinks, **kwargs) -> pd.DataFrame:
+        return extract_features(
+            blinks,
+            self.sfreq,
+            self.epoch_len,
+            self.n_epochs,
+            raw_segments=self.raw_segments,
+            **kwargs,
+        )
+
+    def test_generator_input(self) -> None:
+        """A one-shot generator yields the same frame as a list."""
+        expected = self._extract(self.blinks)
+        result = self._extract(blink for blink in self.blinks)
+        self.assertEqual(len(expected), self.n_epochs)
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_table_input(self) -> None:
+        """A pre-built :class:`BlinkTable` yields the same frame as records."""
+        expected = self._extract(self.blinks)
+        result = self._extract(BlinkTable.from_records(self.blinks))
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_parallel_matches_sequential(self) -> None:
+        """Thread, process and user supplied executors match sequential output."""
+        expected = self._extract(self.blinks)
+        processed = self._extract(self.blinks, n_jobs=4)
+        pd.testing.assert_frame_equal(processed, expected)
+        threaded = self._extract(self.blinks, n_jobs=2, executor="thread")
+        pd.testing.assert_frame_equal(threaded, expected)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            pooled = self._extract(self.blinks, executor=pool)
+        pd.testing.assert_frame_equal(pooled, expected)
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            shared = self._extract(BlinkTable.from_records(self.blinks), executor=pool)
+        pd.testing.assert_frame_equal(shared, expected)
+        with self.assertRaisesRegex(ValueError, "n_jobs"):
+            self._extract(self.blinks, n_jobs=0)
+
+    def test_shared_table_task_uses_view(self) -> None:
+        """Workers compute on the shared block instead of a private copy."""
+        from multiprocessing import shared_memory
+
+        from pyear.kinematics import aggregate_kinematic_features
+        from pyear.pipeline import _shared_table_task
+
+        table = BlinkTable.from_records(self.blinks).group_by_epoch(self.n_epochs)
+        signals = table.epoch_signals
+        stripped = BlinkTable(
+            table.epoch_index,
+            table.refined_start_frame,
+            table.refined_peak_frame,
+            table.refined_end_frame,
+        )
+        seen = []
+
+        def probe(full, *args):
+            seen.append(full.epoch_signals.flags.writeable or full.epoch_signals.flags.owndata)
+            return aggregate_kinematic_features(full, *args)
+
+        shm = shared_memory.SharedMemory(create=True, size=signals.nbytes)
+        try:
+            np.ndarray(signals.shape, dtype=float, buffer=shm.buf)[:] = signals
+            result = _shared_table_task(
+                probe, shm.name, signals.shape, table.signal_lengths, stripped,
+                self.sfreq, self.n_epochs,
+            )
+        finally:
+            shm.close()
+            shm.unlink()
+        self.assertEqual(seen, [False])
+        expected = aggregate_kinematic_features(table, self.sfreq, self.n_epochs)
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_edge_consistent_forwarded(self) -> None:
+        """``edge_consistent=False`` reaches the derivative-based groups."""
+        from pyear.waveform_features import aggregate_waveform_features
+
+        groups = ["kinematics", "energy", "waveform"]
+        df = extract_features(
+            self.blinks, self.sfreq, self.epoch_len, self.n_epochs,
+            features=groups, edge_consistent=False,
+        )
+        table = BlinkTable.from_records(self.blinks)
+        expected = aggregate_waveform_features(
+            table, self.sfreq, self.n_epochs, edge_consistent=False
+        )
+        pd.testing.assert_frame_equal(df[expected.columns], expected)
+        default = extract_features(
+            self.blinks, self.sfreq, self.epoch_len, self.n_epochs, features=groups
+        )
+        self.assertFalse(default[expected.columns].equals(expected))
+
+    def test_feature_subset(self) -> None:
+        """Non-event groups can be selected without ``raw_segments``."""
+        df = extract_features(
+            self.blinks, self.sfreq, self.epoch_len, self.n_epochs,
+            features=["blink_count", "morphology"],
+        )
+        self.assertIn("blink_count", df.columns)
+        self.assertIn("blink_duration_mean", df.columns)
+        self.assertNotIn("blink_rate", df.columns)
+        self.assertNotIn("ibi_mean", df.columns)
+        with self.assertRaises(ValueError):
+            extract_features(
+                self.blinks, self.sfreq, self.epoch_len, self.n_epochs,
+                features=["unknown"],
+            )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    unittest.main()
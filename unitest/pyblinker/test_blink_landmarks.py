@@ -0,0 +1,142 @@
+"""Tests for the array landmark helpers behind :class:`FitBlinks`.
+
+Every array helper of :mod:`pyear.pyblinkers.blink_landmarks` is compared
+with its scalar counterpart in :mod:`pyear.pyblinkers.zero_crossing` on the
+``S1_candidate_signal.npy`` recording and the blink positions stored in
+``file_test_blink_position.pkl``. The comparison is repeated with a tiny long
+window threshold so that both the batched and the per-window code paths run.
+"""
+
+import os
+import unittest
+import warnings
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+import pyear.pyblinkers.blink_landmarks as landmarks
+from pyear.pyblinkers.base_left_right import create_left_right_base
+from pyear.pyblinkers.fit_blink import FitBlinks
+from pyear.pyblinkers.zero_crossing import (
+    compute_fit_range,
+    get_half_height,
+    get_left_base,
+    get_right_base,
+    max_pos_vel_frame,
+)
+
+DATA_DIR = os.path.dirname(__file__)
+
+
+class TestBlinkLandmarks(unittest.TestCase):
+    """Compare array landmarks with the per-blink helpers."""
+
+    def setUp(self) -> None:
+        self.signal = np.load(os.path.join(DATA_DIR, "S1_candidate_signal.npy"))
+        positions = pd.read_pickle(os.path.join(DATA_DIR, "file_test_blink_position.pkl"))
+        blinks = positions["output"].rename(
+            columns={"startBlinks": "start_blink", "endBlinks": "end_blink"}
+        )
+        fitter = FitBlinks(self.signal, blinks.astype(int), {"base_fraction": 0.5})
+        fitter.dprocess(run_fit=False)
+        self.df = fitter.df
+
+    def _check_against_scalar(self) -> None:
+        signal = self.signal
+        velocity = np.diff(signal)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            frames = create_left_right_base(signal, self.df)
+
+        for _, row in frames.iterrows():
+            pos, neg = max_pos_vel_frame(
+                velocity, row["max_blink"], row["left_zero"], row["right_zero"]
+            )
+            self.assertEqual(row["max_pos_vel_frame"], pos)
+            self.assertEqual(row["max_neg_vel_frame"], neg)
+            self.assertEqual(
+                row["left_base"],
+                get_left_base(velocity, row["outer_start"], row["max_pos_vel_frame"]),
+            )
+            self.assertEqual(
+                row["right_base"],
+                get_right_base(signal, velocity, row["outer_end"], row["max_neg_vel_frame"]),
+            )
+
+        half_heights = landmarks.half_height_frames(
+            signal,
+            frames["max_blink"].to_numpy(),
+            frames["left_zero"].to_numpy(),
+            frames["right_zero"].to_numpy(),
+            frames["left_base"].to_numpy(),
+            frames["outer_end"].to_numpy(),
+        )
+        fit_ranges = landmarks.fit_range_frames(
+            signal,
+            frames["max_blink"].to_numpy(),
+            frames["left_zero"].to_numpy(),
+            frames["right_zero"].to_numpy(),
+            0.5,
+            frames.index,
+        )
+        for i, (idx, row) in enumerate(frames.iterrows()):
+            expected = get_half_height(
+                signal,
+                row["max_blink"],
+                row["left_zero"],
+                row["right_zero"],
+                row["left_base"],
+                row["outer_end"],
+            )
+            self.assertEqual(tuple(values[i] for values in half_heights), expected)
+
+            expected = compute_fit_range(
+                signal, row["max_blink"], row["left_zero"], row["right_zero"], 0.5, top_bottom=True
+            )
+            np.testing.assert_array_equal(fit_ranges["x_left"][idx], expected[0])
+            np.testing.assert_array_equal(fit_ranges["x_right"][idx], expected[1])
+            self.assertEqual(fit_ranges["left_range"][idx], list(expected[2]))
+            self.assertEqual(fit_ranges["right_range"][idx], list(expected[3]))
+            self.assertEqual(fit_ranges["blink_top_point_l_x"][idx], expected[7])
+            self.assertEqual(fit_ranges["blink_bottom_point_r_x"][idx], expected[8])
+
+    def test_matches_scalar_helpers(self) -> None:
+        """Batched windows give the scalar results."""
+        self.assertGreater(len(self.df), 50)
+        self._check_against_scalar()
+
+    def test_matches_scalar_helpers_long_windows(self) -> None:
+        """Windows reduced one slice at a time give the scalar results too."""
+        with mock.patch.object(landmarks, "_LONG_WINDOW", 4), mock.patch.object(
+            landmarks, "_BATCH_SAMPLES", 64
+        ):
+            self._check_against_scalar()
+
+    def test_empty_window_raises(self) -> None:
+        """An end before the start names the failing blink window."""
+        with self.assertRaisesRegex(ValueError, r"Blink 1: empty window \[10, 5\]"):
+            landmarks.max_blink_frames(self.signal, np.array([0, 10]), np.array([3, 5]))
+        with self.assertRaisesRegex(ValueError, r"Blink 0: empty left base search window \[8, 4\]"):
+            landmarks.left_base_frames(np.diff(self.signal), np.array([8]), np.array([4]))
+
+    def test_out_of_bounds_window_raises(self) -> None:
+        """A window past the signal reports the blink and the signal length."""
+        n_samples = self.signal.size
+        pattern = rf"Blink 0: window out of bounds .* {n_samples} samples"
+        with self.assertRaisesRegex(ValueError, pattern):
+            landmarks.max_vel_frames(
+                self.signal, np.array([n_samples + 2]), np.array([0]), np.array([n_samples + 5])
+            )
+        # blink 0 has no down-stroke, so only blink 1 reaches the down-stroke search
+        with self.assertRaisesRegex(ValueError, r"Blink 1: window out of bounds \[20, "):
+            landmarks.max_vel_frames(
+                np.diff(self.signal),
+                np.array([20, 20]),
+                np.array([10, 10]),
+                np.array([5, n_samples + 5]),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""Tests for the array shut-duration engine of :class:`BlinkProperties`.
+
+:meth:`BlinkProperties.shut_durations` is compared with the row-wise static
+helpers :meth:`BlinkProperties.compute_time_shut` and
+:meth:`BlinkProperties.compute_time_shut_tent` on random windows of the
+``S1_candidate_signal.npy`` recording. The comparison is repeated with a tiny
+long window threshold so that both the batched and the per-window code paths
+run.
+"""
+
+import os
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+import pyear.pyblinkers.blink_landmarks as landmarks
+from pyear.pyblinkers.extract_blink_properties import BlinkProperties
+
+DATA_DIR = os.path.dirname(__file__)
+SRATE = 100.0
+
+
+class TestShutDurations(unittest.TestCase):
+    """Compare vectorised shut durations with the row-wise helpers."""
+
+    def setUp(self) -> None:
+        self.signal = np.load(os.path.join(DATA_DIR, "S1_candidate_signal.npy"))
+        rng = np.random.default_rng(0)
+        n_blinks = 300
+        left = rng.integers(0, self.signal.size - 200, n_blinks)
+        right = left + rng.integers(0, 150, n_blinks)
+        peaks = np.array(
+            [self.signal[lo : hi + 1].max() for lo, hi in zip(left, right)]
+        )
+        self.df = pd.DataFrame(
+            {
+                "left_base": left,
+                "right_base": right,
+                "left_x_intercept": left + rng.random(n_blinks),
+                "right_x_intercept": right + rng.random(n_blinks),
+                # some thresholds above every sample of the window
+                "max_value": peaks * rng.uniform(0.8, 1.3, n_blinks),
+            }
+        )
+
+    def _properties(self, shut_amp_fraction: float) -> BlinkProperties:
+        props = BlinkProperties.__new__(BlinkProperties)
+        props.candidate_signal = self.signal
+        props.df = self.df
+        props.srate = SRATE
+        props.shut_amp_fraction = shut_amp_fraction
+        return props
+
+    def _check_against_rows(self) -> None:
+        for fraction in (0.5, 0.9):
+            props = self._properties(fraction)
+            expected_base = self.df.apply(
+                BlinkProperties.compute_time_shut,
+                axis=1,
+                args=(self.signal, SRATE, fraction, "Base", 0),
+            ).to_numpy()
+            expected_tent = self.df.apply(
+                BlinkProperties.compute_time_shut_tent,
+                axis=1,
+                args=(self.signal, SRATE, fraction),
+            ).to_numpy()
+            np.testing.assert_array_equal(
+                props.shut_durations("left_base", "right_base"), expected_base
+            )
+            np.testing.assert_array_equal(
+                props.shut_durations("left_x_intercept", "right_x_intercept", tent=True),
+                expected_tent,
+            )
+
+    def test_matches_row_helpers(self) -> None:
+        """Batched windows give the row-wise durations."""
+        self._check_against_rows()
+
+    def test_matches_row_helpers_long_windows(self) -> None:
+        """Windows reduced one slice at a time give the row-wise durations too."""
+        with mock.patch.object(landmarks, "_LONG_WINDOW", 4), mock.patch.object(
+            landmarks, "_BATCH_SAMPLES", 64
+        ):
+            self._check_against_rows()
+
+    def test_never_shut_column_is_integer(self) -> None:
+        """Like ``DataFrame.apply``, no blink above threshold yields integers."""
+        self.df["max_value"] = self.signal.max() + 1.0
+        durations = self._properties(1.0).shut_durations("left_base", "right_base")
+        self.assertEqual(durations.dtype.kind, "i")
+        self.assertFalse(durations.any())
+
+    def test_non_finite_landmark_raises(self) -> None:
+        """Missing landmarks cannot be cast to sample indices."""
+        self.df.loc[3, "right_base"] = np.nan
+        with self.assertRaises(ValueError):
+            self._properties(0.9).shut_durations("left_base", "right_base")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+"""Tests for the batched tent fit :func:`lines_intersection_batch`.
+
+The closed-form fits are compared with the MATLAB-ported
+:func:`lines_intersection_matlabx` on random fit ranges of
+``S1_candidate_signal.npy`` and on the blinks that survive
+:meth:`FitBlinks.fit`.
+"""
+
+import os
+import unittest
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from pyear.matlab_fork.line_intersection_matlab import (
+    lines_intersection_batch,
+    lines_intersection_matlabx,
+)
+from pyear.pyblinkers.fit_blink import FitBlinks
+
+DATA_DIR = os.path.dirname(__file__)
+
+
+class TestLinesIntersectionBatch(unittest.TestCase):
+    """Compare batched tent fits with the per-blink implementation."""
+
+    def setUp(self) -> None:
+        self.signal = np.load(os.path.join(DATA_DIR, "S1_candidate_signal.npy"))
+        positions = pd.read_pickle(os.path.join(DATA_DIR, "file_test_blink_position.pkl"))
+        blinks = positions["output"].rename(
+            columns={"startBlinks": "start_blink", "endBlinks": "end_blink"}
+        )
+        self.fitter = FitBlinks(self.signal, blinks.astype(int), {"base_fraction": 0.5})
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            self.fitter.dprocess(run_fit=True)
+
+    def test_random_ranges_match_matlab_port(self) -> None:
+        """Closed-form fits match the per-blink fit on arbitrary ranges."""
+        rng = np.random.default_rng(0)
+        n_fits = 200
+        left_start = rng.integers(0, self.signal.size - 100, n_fits)
+        left_stop = left_start + rng.integers(1, 40, n_fits)
+        right_start = left_stop + rng.integers(0, 10, n_fits)
+        right_stop = right_start + rng.integers(1, 40, n_fits)
+        fits = lines_intersection_batch(
+            self.signal, left_start, left_stop, right_start, right_stop
+        )
+        names = list(fits)
+        for i in range(n_fits):
+            expected = lines_intersection_matlabx(
+                signal=self.signal,
+                xRight=np.arange(right_start[i], right_stop[i] + 1),
+                xLeft=np.arange(left_start[i], left_stop[i] + 1),
+            )
+            result = [fits[name][i] for name in names]
+            np.testing.assert_allclose(result, np.asarray(expected, dtype=float), rtol=1e-9)
+
+    def test_fit_blinks_matches_matlab_port(self) -> None:
+        """Tent columns written by :meth:`FitBlinks.fit` match the per-blink fit."""
+        frames = self.fitter.frame_blinks
+        self.assertGreater(len(frames), 0)
+        cols = self.fitter.cols_lines_intesection
+        for _, row in frames.iterrows():
+            expected = lines_intersection_matlabx(
+                signal=self.signal, xRight=row["x_right"], xLeft=row["x_left"]
+            )
+            np.testing.assert_allclose(
+                row[cols].to_numpy(dtype=float), np.asarray(expected, dtype=float), rtol=1e-9
+            )
+
+    def test_degenerate_ranges(self) -> None:
+        """Flat and single-sample ranges give ``NaN`` like the scalar fit."""
+        signal = np.array([1.0, 1.0, 1.0, 2.0, 3.0, 4.0, 3.0, 2.0])
+        fits = lines_intersection_batch(
+            signal, np.array([0, 3]), np.array([2, 3]), np.array([5, 5]), np.array([7, 7])
+        )
+        # a flat left line has no x-intercept and no correlation
+        self.assertTrue(np.isnan(fits["left_x_intercept"][0]))
+        self.assertTrue(np.isnan(fits["left_r2"][0]))
+        # a single sample has no spread
+        self.assertTrue(np.isnan(fits["aver_left_velocity"][1]))
+        self.assertAlmostEqual(fits["right_r2"][0], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+"""Tests for the index-based zero-crossing lookup."""
+
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from pyear.pyblinkers.zero_crossing import (
+    left_right_zero_crossing,
+    left_right_zero_crossings,
+    negative_sample_index,
+)
+
+DATA_DIR = Path(__file__).resolve().parent
+
+
+class TestLeftRightZeroCrossings(unittest.TestCase):
+    """Compare :func:`left_right_zero_crossings` with the per-blink search."""
+
+    def setUp(self) -> None:
+        self.signal = np.load(DATA_DIR / "S1_candidate_signal.npy").ravel()
+
+    def test_matches_scalar_search(self) -> None:
+        """Every peak gets the same zeros as the windowed scalar search."""
+        neg_idx = negative_sample_index(self.signal)
+        # peaks strictly after the first negative sample, so a left zero exists
+        rng = np.random.default_rng(0)
+        peaks = np.sort(
+            rng.choice(np.arange(neg_idx[0] + 1, self.signal.size), 200, replace=False)
+        )
+        outer_start = np.r_[0, peaks[:-1]]
+        outer_end = np.r_[peaks[1:], self.signal.size]
+
+        left, right = left_right_zero_crossings(self.signal, peaks, negative_index=neg_idx)
+        for i, peak in enumerate(peaks):
+            exp_left, exp_right = left_right_zero_crossing(
+                self.signal, peak, outer_start[i], outer_end[i]
+            )
+            self.assertEqual(left[i], exp_left)
+            self.assertEqual(right[i], -1 if exp_right is None else exp_right)
+
+    def test_missing_sides_marked(self) -> None:
+        """Peaks without negative samples on one side get ``-1``."""
+        signal = np.array([1.0, -1.0, 2.0, 3.0, -0.5, 4.0, 5.0])
+        left, right = left_right_zero_crossings(signal, np.array([0, 3, 5]))
+        self.assertEqual(left.tolist(), [-1, 1, 4])
+        self.assertEqual(right.tolist(), [1, 4, -1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -59,6 +59,7 @@ Run extraction and sanity-check resulting columns.
 """
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
 import logging
 from pathlib import Path
 import unittest
@@ -69,6 +70,7 @@ import pandas as pd
 
 from pyear.utils.epochs import slice_raw_into_epochs
 from pyear.blink_events import generate_blink_dataframe
+from pyear.pyblinkers.extract_blink_properties import TENT_COLUMNS
 from pyear.pyblinkers.segment_blink_properties import compute_segment_blink_properties
 
 logger = logging.getLogger(__name__)
@@ -190,6 +192,69 @@ class TestSegmentBlinkProperties(unittest.TestCase):
         self.assertIsInstance(df, pd.DataFrame)
         self.assertFalse(df.empty)
 
+    def test_requested_columns_match_full_run(self) -> None:
+        """Requesting a subset of columns yields the same values and blinks.
+
+        No tent column is requested, so the line intersection stage of the fit
+        is skipped while the fit ranges still select the same blinks.
+        """
+        raw_columns = ["duration_base", "pos_amp_vel_ratio_zero", "time_shut_base"]
+        fit_columns = raw_columns + ["duration_half_base", "inter_blink_max_vel_base"]
+        for run_fit, columns in ((False, raw_columns), (True, fit_columns)):
+            with self.subTest(run_fit=run_fit):
+                full = compute_segment_blink_properties(
+                    self.segments, self.blink_df, self.params, run_fit=run_fit
+                )
+                subset = compute_segment_blink_properties(
+                    self.segments,
+                    self.blink_df,
+                    self.params,
+                    run_fit=run_fit,
+                    columns=columns,
+                )
+                pd.testing.assert_frame_equal(subset[columns], full[columns])
+                pd.testing.assert_series_equal(subset["seg_id"], full["seg_id"])
+                self.assertFalse(TENT_COLUMNS & set(subset.columns))
+                self.assertNotIn("x_intersect", subset.columns)
+                self.assertNotIn("neg_amp_vel_ratio_base", subset.columns)
+
+    def test_fit_columns_require_fit(self) -> None:
+        """Tent columns cannot be requested without ``run_fit``."""
+        with self.assertRaises(ValueError):
+            compute_segment_blink_properties(
+                self.segments,
+                self.blink_df,
+                self.params,
+                columns=["duration_tent"],
+            )
+        with self.assertRaises(ValueError):
+            compute_segment_blink_properties(
+                self.segments, self.blink_df, self.params, columns=["no_such_column"]
+            )
+
+    def test_process_pool_matches_serial(self) -> None:
+        """Segments fitted in worker processes are merged in segment order."""
+        serial = compute_segment_blink_properties(
+            self.segments, self.blink_df, self.params
+        )
+        parallel = compute_segment_blink_properties(
+            self.segments, self.blink_df, self.params, n_jobs=2
+        )
+        pd.testing.assert_frame_equal(parallel, serial)
+
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            pooled = compute_segment_blink_properties(
+                self.segments, self.blink_df, self.params, executor=pool
+            )
+        pd.testing.assert_frame_equal(pooled, serial)
+
+    def test_zero_jobs_rejected(self) -> None:
+        """``n_jobs=0`` raises instead of creating an empty pool."""
+        with self.assertRaisesRegex(ValueError, "n_jobs"):
+            compute_segment_blink_properties(
+                self.segments, self.blink_df, self.params, n_jobs=0
+            )
+
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
@@ -0,0 +1,68 @@
+"""Unit tests for ``assign_annotations_to_epochs``."""
+import logging
+import unittest
+
+import numpy as np
+
+from pyear.utils.epochs import assign_annotations_to_epochs
+
+logger = logging.getLogger(__name__)
+
+
+def _naive_assignment(onsets, durations, starts, stops):
+    """Reference implementation scanning all annotations for every epoch."""
+    n_epochs = len(starts)
+    counts = [0] * n_epochs
+    pairs = []
+    for i, (start, stop) in enumerate(zip(starts, stops)):
+        in_epoch = (onsets >= start) & (onsets < stop)
+        counts[i] = int(np.sum(in_epoch))
+        spans = in_epoch & ((onsets + durations) > stop)
+        for _ in np.where(spans)[0]:
+            if i + 1 < n_epochs:
+                pairs.append((i, i + 1))
+    return counts, pairs
+
+
+class TestAssignAnnotationsToEpochs(unittest.TestCase):
+    """Compare the vectorised assignment with a per-epoch scan."""
+
+    def test_matches_naive_scan(self) -> None:
+        rng = np.random.default_rng(42)
+        total_time = 1798.22
+        epoch_len = 30.0
+        n_epochs = int(np.ceil(total_time / epoch_len))
+        starts = np.arange(n_epochs) * epoch_len
+        stops = np.minimum(starts + epoch_len, total_time)
+        onsets = np.sort(
+            np.concatenate(
+                [rng.uniform(-5.0, total_time + 5.0, 2000), starts[1:] - 0.1, starts[1:]]
+            )
+        )
+        durations = rng.uniform(0.0, 0.5, onsets.size)
+
+        counts, epoch_ids, pairs = assign_annotations_to_epochs(
+            onsets, durations, starts, stops
+        )
+        expected_counts, expected_pairs = _naive_assignment(onsets, durations, starts, stops)
+        self.assertEqual(counts.tolist(), expected_counts)
+        self.assertEqual(pairs, expected_pairs)
+
+        outside = (onsets < 0) | (onsets >= total_time)
+        self.assertTrue(np.all(epoch_ids[outside] == -1))
+        self.assertTrue(np.all(epoch_ids[~outside] == (onsets[~outside] // epoch_len)))
+
+    def test_no_annotations(self) -> None:
+        starts = np.array([0.0, 10.0])
+        stops = np.array([10.0, 15.0])
+        counts, epoch_ids, pairs = assign_annotations_to_epochs(
+            np.array([]), np.array([]), starts, stops
+        )
+        self.assertEqual(counts.tolist(), [0, 0])
+        self.assertEqual(epoch_ids.size, 0)
+        self.assertEqual(pairs, [])
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    unittest.main()
@@ -0,0 +1,88 @@
+"""Unit tests for the columnar blink table."""
+
+import unittest
+import logging
+
+import numpy as np
+import pandas as pd
+
+from pyear.utils.blink_table import BlinkTable, as_blink_table, group_blinks_by_epoch
+from pyear.blink_events.event_features.aggregate import aggregate_blink_event_features
+from pyear.blink_events.classification import aggregate_classification_features
+from pyear.morphology import aggregate_morphology_features
+from pyear.kinematics import aggregate_kinematic_features
+from pyear.energy_complexity import aggregate_energy_complexity_features
+from pyear.open_eye import aggregate_open_eye_features
+from pyear.ear_metrics import aggregate_ear_features
+from pyear.waveform_features import aggregate_waveform_features
+from pyear.frequency_domain import aggregate_frequency_domain_features
+from unitest.fixtures.mock_ear_generation import _generate_refined_ear
+
+logger = logging.getLogger(__name__)
+
+
+class TestBlinkTable(unittest.TestCase):
+    """Verify conversion and feature parity of :class:`BlinkTable`."""
+
+    def setUp(self) -> None:
+        blinks, sfreq, epoch_len, n_epochs = _generate_refined_ear()
+        self.blinks = blinks
+        self.sfreq = sfreq
+        self.epoch_len = epoch_len
+        self.n_epochs = n_epochs
+        self.table = BlinkTable.from_records(blinks)
+
+    def test_round_trip(self) -> None:
+        """Records converted to a table and back keep their values."""
+        self.assertEqual(len(self.table), len(self.blinks))
+        records = self.table.to_records()
+        for original, restored in zip(self.blinks, records):
+            for key in ("epoch_index", "refined_start_frame", "refined_peak_frame", "refined_end_frame"):
+                self.assertEqual(original[key], restored[key])
+            np.testing.assert_allclose(original["epoch_signal"], restored["epoch_signal"])
+
+    def test_epoch_without_blinks_has_no_signal(self) -> None:
+        """Epoch 3 of the mock data has no blinks and therefore no signal."""
+        self.assertEqual(len(self.table.epoch(3)), 0)
+        self.assertIsNone(self.table.epoch_signal(3))
+        self.assertIs(as_blink_table(self.table), self.table)
+
+    def test_grouping_offsets(self) -> None:
+        """The epoch grouping matches a naive per-epoch bucketing."""
+        table = group_blinks_by_epoch(iter(self.blinks), self.n_epochs)
+        grouping = table.grouping
+        self.assertEqual(grouping.offsets.size, self.n_epochs + 1)
+        for epoch_idx in range(self.n_epochs):
+            expected = [i for i, b in enumerate(self.blinks) if b["epoch_index"] == epoch_idx]
+            self.assertEqual(grouping.indices(epoch_idx).tolist(), expected)
+        self.assertEqual(int(grouping.counts().sum()), len(self.blinks))
+        self.assertIs(group_blinks_by_epoch(table, self.n_epochs).grouping, grouping)
+
+    def test_length_mismatch_raises(self) -> None:
+        """Frame columns must match the number of blinks."""
+        with self.assertRaises(ValueError):
+            BlinkTable([0, 0], [1, 2], [3], [4, 5])
+
+    def test_aggregator_parity(self) -> None:
+        """Every aggregator returns the same frame for records and tables."""
+        sfreq, n_epochs, epoch_len = self.sfreq, self.n_epochs, self.epoch_len
+        calls = [
+            lambda b: aggregate_blink_event_features(b, sfreq, epoch_len, n_epochs),
+            lambda b: aggregate_classification_features(b, sfreq, epoch_len, n_epochs),
+            lambda b: aggregate_morphology_features(b, sfreq, n_epochs),
+            lambda b: aggregate_kinematic_features(b, sfreq, n_epochs),
+            lambda b: aggregate_energy_complexity_features(b, sfreq, n_epochs),
+            lambda b: aggregate_open_eye_features(b, sfreq, n_epochs),
+            lambda b: aggregate_ear_features(b, sfreq, n_epochs),
+            lambda b: aggregate_waveform_features(b, sfreq, n_epochs),
+            lambda b: aggregate_frequency_domain_features(b, sfreq, n_epochs),
+        ]
+        for call in calls:
+            expected = call(self.blinks)
+            result = call(self.table)
+            pd.testing.assert_frame_equal(result, expected)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    unittest.main()
@@ -0,0 +1,71 @@
+"""Tests for the recording-wide derivative cache."""
+
+import pickle
+import unittest
+
+import numpy as np
+
+from pyear.kinematics import aggregate_kinematic_features
+from pyear.utils.blink_table import BlinkTable, iter_blink_derivatives
+from pyear.utils.derivatives import DerivativeCache, segment_gradients
+from unitest.fixtures.mock_ear_generation import _generate_refined_ear
+
+SFREQ = 100.0
+
+
+class TestDerivativeCache(unittest.TestCase):
+    """Compare cached slices with per-segment ``np.gradient`` chains."""
+
+    def setUp(self) -> None:
+        rng = np.random.default_rng(5)
+        self.signals = rng.standard_normal((3, 400)).cumsum(axis=1)
+        self.lengths = np.array([400, 400, 250])
+        self.cache = DerivativeCache(self.signals, SFREQ, signal_lengths=self.lengths)
+
+    def test_edge_consistent_matches_segments(self) -> None:
+        """Patched slices equal differentiating the segment on its own."""
+        for row, length in enumerate(self.lengths):
+            signal = self.signals[row, :length]
+            spans = [(0, length - 1), (0, 1), (3, 8), (length - 9, length - 1)]
+            spans += [(s, s + w) for s, w in zip(range(0, length - 60, 37), range(2, 60, 4))]
+            for start, end in spans:
+                expected = segment_gradients(signal[start : end + 1], SFREQ)
+                result = self.cache.segment(row, start, end)
+                for got, want in zip(result, expected):
+                    np.testing.assert_array_equal(got, want)
+
+    def test_continuous_slices(self) -> None:
+        """Without edge correction the slices come from the whole row."""
+        velocity, acceleration, jerk = segment_gradients(self.signals[2, :250], SFREQ)
+        result = self.cache.segment(2, 40, 90, edge_consistent=False)
+        np.testing.assert_array_equal(result[0], velocity[40:91])
+        np.testing.assert_array_equal(result[1], acceleration[40:91])
+        np.testing.assert_array_equal(result[2], jerk[40:91])
+        self.assertTrue(np.isnan(self.cache.velocity[2, 250:]).all())
+
+    def test_table_shares_cache(self) -> None:
+        """Epoch views of a table reuse the parent's cache."""
+        blinks, sfreq, _, n_epochs = _generate_refined_ear()
+        table = BlinkTable.from_records(blinks).group_by_epoch(n_epochs)
+        self.assertIs(table.epoch(1).derivatives(sfreq), table.derivatives(sfreq))
+        restored = pickle.loads(pickle.dumps(table.derivatives(sfreq)))
+        np.testing.assert_array_equal(restored.velocity, table.derivatives(sfreq).velocity)
+
+        from_records = list(iter_blink_derivatives(blinks, sfreq, order=2))
+        from_table = list(iter_blink_derivatives(table, sfreq, order=2))
+        for (*_, want), (*_, got) in zip(from_records, from_table):
+            for a, b in zip(got, want):
+                np.testing.assert_array_equal(a, b)
+
+    def test_continuous_option_runs(self) -> None:
+        """Kinematics can use the continuous derivatives instead."""
+        blinks, sfreq, _, n_epochs = _generate_refined_ear()
+        table = BlinkTable.from_records(blinks)
+        edge = aggregate_kinematic_features(table, sfreq, n_epochs)
+        smooth = aggregate_kinematic_features(table, sfreq, n_epochs, edge_consistent=False)
+        self.assertEqual(edge.shape, smooth.shape)
+        self.assertTrue(edge.isna().equals(smooth.isna()))
+
+
+if __name__ == "__main__":
+    unittest.main()
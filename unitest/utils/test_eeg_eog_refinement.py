@@ -7,7 +7,12 @@ import unittest
 import mne
 
 from pyear.utils import prepare_refined_segments
-from pyear.utils.refinement import refine_blinks_from_epochs, plot_refined_blinks
+from pyear.utils.blink_table import BlinkTable
+from pyear.utils.refinement import (
+    plot_refined_blinks,
+    refine_blinks_from_epochs,
+    refine_local_maximum_stub,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +60,21 @@ class TestEEGEOGRefinement(unittest.TestCase):
         """Run refinement on EOG channel."""
         self._run_channel("EOG-EEG-eog_vert_left")
 
+    def test_batched_matches_per_blink(self) -> None:
+        """The batched default agrees with the per-blink fallback."""
+        channel = "EOG-EEG-eog_vert_left"
+        batched = refine_blinks_from_epochs(self.segments, channel, as_table=True)
+        per_blink = refine_blinks_from_epochs(
+            self.segments,
+            channel,
+            refine_func=lambda sig, s, e, p: refine_local_maximum_stub(sig, s, e, p),
+            as_table=True,
+        )
+        self.assertIsInstance(batched, BlinkTable)
+        self.assertEqual(len(batched), self.total_ann)
+        for name in ("epoch_index", "refined_start_frame", "refined_peak_frame", "refined_end_frame"):
+            self.assertEqual(getattr(batched, name).tolist(), getattr(per_blink, name).tolist())
+
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
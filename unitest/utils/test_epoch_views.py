@@ -0,0 +1,97 @@
+"""Unit tests for lightweight epoch views.
+
+Views returned by ``slice_raw_into_epochs(..., as_views=True)`` must expose the
+same data and annotations as the cropped segments of the default mode.
+"""
+import logging
+from pathlib import Path
+import unittest
+
+import mne
+import numpy as np
+
+from pyear.utils.epoch_views import load_channels
+from pyear.utils.epochs import slice_raw_into_epochs
+from pyear.utils.segments import slice_raw_to_segments
+from pyear.utils.refinement import refine_blinks_from_epochs
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+CHANNEL = "EAR-avg_ear"
+
+
+class TestEpochViews(unittest.TestCase):
+    """Compare epoch views with cropped raw segments of ``ear_eog.fif``."""
+
+    def setUp(self) -> None:
+        raw_path = PROJECT_ROOT / "unitest" / "ear_eog.fif"
+        self.raw = mne.io.read_raw_fif(raw_path, preload=False, verbose=False)
+
+    def _assert_same_annotations(self, seg, view) -> None:
+        self.assertEqual(len(seg.annotations), len(view.annotations))
+        np.testing.assert_allclose(seg.annotations.onset, view.annotations.onset, atol=1e-6)
+        np.testing.assert_allclose(seg.annotations.duration, view.annotations.duration, atol=1e-6)
+        self.assertEqual(list(seg.annotations.description), list(view.annotations.description))
+
+    def test_views_match_segments(self) -> None:
+        """Data, timing and annotations match the cropped segments."""
+        segments, df, pairs, times = slice_raw_into_epochs(self.raw, epoch_len=30.0)
+        views, df_views, pairs_views, times_views = slice_raw_into_epochs(
+            self.raw, epoch_len=30.0, as_views=True, picks=CHANNEL
+        )
+        self.assertEqual(len(segments), len(views))
+        self.assertTrue(df.equals(df_views))
+        self.assertEqual(pairs, pairs_views)
+        self.assertEqual(times, times_views)
+        for seg, view in zip(segments, views):
+            self.assertEqual(seg.first_time, view.first_time)
+            self.assertEqual(seg.n_times, view.n_times)
+            np.testing.assert_array_equal(seg.get_data(picks=CHANNEL), view.get_data(picks=CHANNEL))
+            self._assert_same_annotations(seg, view)
+
+    def test_views_share_memory(self) -> None:
+        """Views slice one array instead of copying the recording."""
+        views, _, _, _ = slice_raw_into_epochs(
+            self.raw, epoch_len=30.0, as_views=True, picks=CHANNEL
+        )
+        self.assertIs(views[0].get_data().base, views[1].get_data().base)
+        self.assertEqual(views[0].ch_names, [CHANNEL])
+        with self.assertRaises(ValueError):
+            views[0].get_data(picks="EEG-E8")
+
+    def test_refinement_on_views(self) -> None:
+        """Blink refinement produces the same frames on views and segments."""
+        segments, _, _, _ = slice_raw_into_epochs(self.raw, epoch_len=30.0)
+        views, _, _, _ = slice_raw_into_epochs(
+            self.raw, epoch_len=30.0, as_views=True, picks=CHANNEL
+        )
+        expected = refine_blinks_from_epochs(segments, CHANNEL)
+        result = refine_blinks_from_epochs(views, CHANNEL)
+        keys = ("epoch_index", "refined_start_frame", "refined_peak_frame", "refined_end_frame")
+        self.assertEqual(
+            [tuple(b[k] for k in keys) for b in expected],
+            [tuple(b[k] for k in keys) for b in result],
+        )
+
+    def test_segment_views_and_to_raw(self) -> None:
+        """``slice_raw_to_segments`` views materialise to identical raws."""
+        segments = slice_raw_to_segments(self.raw, epoch_len=30.0)
+        views = slice_raw_to_segments(self.raw, epoch_len=30.0, as_views=True)
+        self.assertEqual(len(segments), len(views))
+        for seg, view in zip(segments[:3], views[:3]):
+            self._assert_same_annotations(seg, view)
+            mini = view.to_raw()
+            self.assertIsInstance(mini, mne.io.BaseRaw)
+            np.testing.assert_array_equal(mini.get_data(), seg.get_data())
+
+    def test_chunked_channel_loading(self) -> None:
+        """Chunked reads of one channel equal a single ``get_data`` call."""
+        data = load_channels(self.raw, CHANNEL, chunk_duration=7.3)
+        self.assertEqual(data.shape, (1, self.raw.n_times))
+        np.testing.assert_array_equal(data, self.raw.get_data(picks=CHANNEL))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    unittest.main()
@@ -3,6 +3,7 @@ import logging
 from pathlib import Path
 import unittest
 
+import numpy as np
 import pandas as pd
 
 from pyear.utils import prepare_refined_segments
@@ -41,6 +42,21 @@ class TestPrepareRefinedSegments(unittest.TestCase):
         self.assertEqual(len(segments), expected_len)
         self.assertIn("epoch_signal", refined[0])
 
+    def test_channels_only_matches_default(self) -> None:
+        """Channel-only loading yields the same refinement and annotations."""
+        channel = "EOG-EEG-eog_vert_left"
+        segments, refined = prepare_refined_segments(self.raw_path, channel)
+        views, refined_views = prepare_refined_segments(
+            self.raw_path, channel, channels_only=True
+        )
+        self.assertEqual(refined, refined_views)
+        self.assertEqual(len(segments), len(views))
+        for seg, view in zip(segments, views):
+            self.assertEqual(view.ch_names, [channel])
+            np.testing.assert_array_equal(seg.get_data(picks=channel), view.get_data(picks=channel))
+            np.testing.assert_allclose(seg.annotations.onset, view.annotations.onset, atol=1e-6)
+            np.testing.assert_allclose(seg.annotations.duration, view.annotations.duration, atol=1e-6)
+
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
@@ -0,0 +1,96 @@
+"""Unit tests for the EAR trough and shoulder refinement."""
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from pyear.utils import refinement
+from pyear.utils.refinement import (
+    refine_ear_extrema_and_threshold,
+    refine_ear_extrema_batch,
+)
+from unitest.fixtures.mock_ear_generation import _generate_signal_with_blinks
+
+
+class TestRefineEarExtrema(unittest.TestCase):
+    """Validate trough detection and the walk to the shoulders."""
+
+    def setUp(self) -> None:
+        self.sfreq = 100.0
+        self.signal, self.annotations = _generate_signal_with_blinks(self.sfreq, 10.0, 5)
+
+    def test_mock_blinks(self) -> None:
+        """The trough and the adjacent shoulder samples are recovered."""
+        for ann in self.annotations:
+            start, trough, end = refine_ear_extrema_and_threshold(
+                self.signal,
+                ann["start"] - 3,
+                ann["end"] + 3,
+                None,
+                local_max_prominence=0.015,
+                search_expansion_frames=10,
+                value_threshold=0.23,
+            )
+            self.assertEqual(trough, ann["trough"])
+            self.assertEqual(start, ann["trough"] - 1)
+            self.assertEqual(end, ann["trough"] + 1)
+
+    def test_prominence_without_threshold(self) -> None:
+        """Small bumps below the prominence are walked past."""
+        signal = np.array([0.30, 0.25, 0.26, 0.20, 0.10, 0.21, 0.22, 0.31, 0.30])
+        start, trough, end = refine_ear_extrema_and_threshold(
+            signal, 3, 5, None, local_max_prominence=0.2, search_expansion_frames=4
+        )
+        self.assertEqual((start, trough, end), (0, 4, 7))
+
+    def test_flank_bump_is_not_prominent(self) -> None:
+        """A bump high above the trough but with a shallow dip is walked past."""
+        signal = np.array([0.30, 0.20, 0.10, 0.18, 0.17, 0.25, 0.31, 0.30])
+        start, trough, end = refine_ear_extrema_and_threshold(
+            signal, 2, 2, None, local_max_prominence=0.05, search_expansion_frames=6
+        )
+        self.assertEqual((start, trough, end), (0, 2, 6))
+
+    def test_window_edges_and_cvat(self) -> None:
+        """Monotonic flanks end at the window edge; a valid CVAT trough is kept."""
+        signal = np.array([0.5, 0.4, 0.3, 0.2, 0.3, 0.4, 0.5])
+        start, trough, end = refine_ear_extrema_and_threshold(
+            signal, 2, 4, 2, local_max_prominence=0.5, search_expansion_frames=1
+        )
+        self.assertEqual((start, trough, end), (1, 2, 5))
+        self.assertEqual(refine_ear_extrema_and_threshold(np.array([]), 0, 5), (0, 0, 0))
+
+    def test_batch_matches_single(self) -> None:
+        """The batched refiner equals per-blink calls on random windows."""
+        rng = np.random.default_rng(3)
+        lengths = np.array([300, 0, 250])
+        signals = np.full((3, 300), np.nan)
+        for row, n in enumerate(lengths):
+            signals[row, :n] = 0.3 + 0.05 * np.sin(np.arange(n) / 4.0) + rng.normal(0, 0.01, n)
+        epoch_index = rng.integers(0, 3, 100)
+        starts = rng.integers(-10, 310, 100)
+        ends = starts + rng.integers(-3, 30, 100)
+        params = dict(local_max_prominence=0.02, search_expansion_frames=6, value_threshold=0.34)
+        batch = refine_ear_extrema_batch(
+            signals, epoch_index, starts, ends, signal_lengths=lengths, **params
+        )
+        for i in range(epoch_index.size):
+            row = epoch_index[i]
+            single = refine_ear_extrema_and_threshold(
+                signals[row, : lengths[row]], int(starts[i]), int(ends[i]), None, **params
+            )
+            self.assertEqual(tuple(int(b[i]) for b in batch), single)
+            self.assertLessEqual(single[0], single[1])
+            self.assertLessEqual(single[1], single[2])
+
+        # small chunks of blinks sorted by window length give the same frames
+        with mock.patch.object(refinement, "_BATCH_SAMPLES", 64):
+            chunked = refine_ear_extrema_batch(
+                signals, epoch_index, starts, ends, signal_lengths=lengths, **params
+            )
+        for got, want in zip(chunked, batch):
+            np.testing.assert_array_equal(got, want)
+
+
+if __name__ == "__main__":
+    unittest.main()
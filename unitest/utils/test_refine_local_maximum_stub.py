@@ -4,7 +4,10 @@ import unittest
 
 import numpy as np
 
-from pyear.utils.refinement import refine_local_maximum_stub
+from pyear.utils.refinement import (
+    refine_local_maximum_batch,
+    refine_local_maximum_stub,
+)
 
 
 class TestRefineLocalMaximumStub(unittest.TestCase):
@@ -64,5 +67,32 @@ class TestRefineLocalMaximumStub(unittest.TestCase):
         # max is -0.5 at index 1
         self.assertEqual((rs, peak, re), (0, 1, 3))
 
+
+class TestRefineLocalMaximumBatch(unittest.TestCase):
+    """The batched refiner must agree with the per-blink stub."""
+
+    def test_matches_per_blink_stub(self):
+        """Random windows, including out-of-range and reversed bounds."""
+        rng = np.random.default_rng(7)
+        lengths = np.array([40, 0, 25, 40])
+        signals = np.full((4, 40), np.nan)
+        for row, n in enumerate(lengths):
+            signals[row, :n] = rng.integers(0, 5, n)
+        signals[3, 10] = np.nan
+        epoch_index = rng.integers(0, 4, 200)
+        starts = rng.integers(-5, 45, 200)
+        ends = rng.integers(-5, 45, 200)
+
+        rs, peaks, re = refine_local_maximum_batch(
+            signals, epoch_index, starts, ends, signal_lengths=lengths
+        )
+        for i in range(epoch_index.size):
+            row = epoch_index[i]
+            expected = refine_local_maximum_stub(
+                signals[row, : lengths[row]], int(starts[i]), int(ends[i])
+            )
+            self.assertEqual((rs[i], peaks[i], re[i]), expected)
+
+
 if __name__ == '__main__':
     unittest.main()